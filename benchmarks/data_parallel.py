@@ -0,0 +1,134 @@
+"""
+Throughput of data-parallel TD3 on localhost, per number of learner processes
+
+Every process steps its own `SyntheticEnv` into its own experience replay and
+updates once per step, so that an update learns from world_size * batch_size
+transitions. After training, the processes check that their replicas, target
+networks included, are still identical.
+
+Usage:
+    python benchmarks/data_parallel.py --world-sizes 1 2 4 --num-steps 2000 --output data_parallel.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+from functools import partial
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+)
+
+import torch
+import torch.distributed as dist
+import torch.optim as optim
+from synthetic_env import SyntheticEnv
+
+from deeprl.actor_critic_methods import TD3, DataParallel
+from deeprl.actor_critic_methods.data_parallel import launch_localhost
+from deeprl.actor_critic_methods.experience_replay import UER
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import Gaussian
+
+OBSERVATION_DIM, ACTION_DIM = 17, 6
+
+
+def train(rank: int, world_size: int, args: argparse.Namespace, results: Any) -> None:
+    torch.set_num_threads(args.num_threads)
+    # Replicas start apart, so that the initial broadcast matters
+    torch.manual_seed(rank)
+    hidden_dims = [args.hidden_size] * 2
+    agent = DataParallel(
+        TD3(
+            torch.device("cpu"),
+            OBSERVATION_DIM,
+            ACTION_DIM,
+            partial(mlp.Policy, hidden_dims=hidden_dims),
+            partial(mlp.ActionValue, hidden_dims=hidden_dims),
+            partial(optim.Adam, lr=1e-3),
+            partial(optim.Adam, lr=1e-3),
+            UER(args.num_steps),
+            args.batch_size,
+            0.99,
+            0.005,
+            Gaussian(0.1),
+            0.2,
+            0.5,
+        ),
+        sync_interval=args.num_steps,  # Only the gradient averaging keeps the replicas together
+    )
+
+    env = SyntheticEnv(OBSERVATION_DIM, ACTION_DIM, seed=rank)
+    state = torch.as_tensor(env.reset(seed=rank)[0])
+    start = time.perf_counter()
+    for _ in range(args.num_steps):
+        action = agent.compute_action(state)
+        next_state, reward, terminated, truncated, _ = env.step(action.numpy())
+        next_state = torch.as_tensor(next_state)
+        agent.step(
+            state,
+            action,
+            torch.tensor([reward], dtype=torch.float32),
+            next_state,
+            torch.tensor([terminated]),
+        )
+        state = (
+            torch.as_tensor(env.reset()[0]) if terminated or truncated else next_state
+        )
+    elapsed = time.perf_counter() - start
+
+    # The largest deviation of any parameter from rank 0's
+    modules = [
+        agent._policy,
+        agent._target_policy,
+        *agent._critics,
+        *agent._target_critics,
+    ]
+    flat = torch.cat(
+        [param.reshape(-1) for module in modules for param in module.parameters()]
+    )
+    reference = flat.clone()
+    dist.broadcast(reference, src=0)
+    deviation = (flat - reference).abs().max()
+    dist.all_reduce(deviation, op=dist.ReduceOp.MAX)
+    if rank == 0:
+        results["updates_per_s"] = agent.num_updates / elapsed
+        results["transitions_per_s"] = (
+            agent.num_updates * world_size * args.batch_size / elapsed
+        )
+        results["max_deviation"] = deviation.item()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--world-sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--num-steps", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--hidden-size", type=int, default=256)
+    parser.add_argument("--num-threads", type=int, default=1)
+    parser.add_argument("--output", default="data_parallel.json")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "batch_size": args.batch_size,
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+    with multiprocessing.get_context("spawn").Manager() as manager:
+        for world_size in args.world_sizes:
+            shared = manager.dict()
+            launch_localhost(partial(train, args=args, results=shared), world_size)
+            results[f"world_size_{world_size}"] = dict(shared)
+            print(
+                f"{world_size:>3} processes: {shared['updates_per_s']:8.1f} updates/s, {shared['transitions_per_s']:10.0f} transitions/s, max deviation {shared['max_deviation']:.1e}",
+                flush=True,
+            )
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
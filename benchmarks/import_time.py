@@ -0,0 +1,89 @@
+"""
+Import time of deeprl's entry points, each measured in fresh interpreters
+
+Reports the median wall time of the import statement over `--repeats` cold
+processes, and which heavy third-party modules the import pulled in.
+
+Usage:
+    python benchmarks/import_time.py --repeats 10 --output import_time.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# from collections.abc import Sequence
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+    List,
+)
+
+STATEMENTS = [
+    "import deeprl",
+    "import deeprl.actor_critic_methods",
+    "import deeprl.actor_critic_methods.neural_network.mlp",
+    "import deeprl.actor_critic_methods.experience_replay",
+    "from deeprl.actor_critic_methods.experience_replay import UER",
+    "from deeprl.actor_critic_methods import TD3",
+    "from deeprl.actor_critic_methods import DDPG, PPO, SAC, TD3",
+    "import deeprl.inference",
+]
+HEAVY_MODULES = ["torch", "torch.distributions", "numpy", "cytoolz", "attrs"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy_modules!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, repeats: int) -> Dict[str, Any]:
+    probe = _PROBE.format(statement=statement, heavy_modules=HEAVY_MODULES)
+    samples: List[float] = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output)
+        samples.append(result["elapsed"])
+    return {
+        "statement": statement,
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "loaded": result["loaded"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default="import_time.json")
+    args = parser.parse_args()
+
+    results = []
+    for statement in STATEMENTS:
+        result = measure(statement, args.repeats)
+        results.append(result)
+        print(
+            f"{result['median'] * 1e3:8.1f} ms  {statement}  ({', '.join(result['loaded'])})",
+            flush=True,
+        )
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {"python": sys.version, "repeats": args.repeats, "results": results},
+            file,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
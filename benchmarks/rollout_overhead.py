@@ -0,0 +1,133 @@
+"""
+Per-step overhead of the environment loop: the demos' loop versus `RolloutRunner`
+
+Both loops drive the same agent in `SyntheticEnv`, whose step costs next to
+nothing. The agent's batch size exceeds the number of steps, so that no update
+takes place and what is timed is the loop itself: action computation, tensor
+conversions, replay pushes and episode bookkeeping.
+
+Usage:
+    python benchmarks/rollout_overhead.py --num-steps 50000 --device cpu
+"""
+
+import argparse
+import json
+import time
+from functools import partial
+
+# from collections.abc import Callable
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+)
+
+import torch
+import torch.optim as optim
+from synthetic_env import SyntheticEnv
+
+from deeprl.actor_critic_methods import TD3
+from deeprl.actor_critic_methods.experience_replay import UER
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import Gaussian
+from deeprl.rollout import RolloutRunner
+
+
+def make_agent(
+    device: torch.device, observation_dim: int, action_dim: int, num_steps: int
+) -> TD3:
+    return TD3(
+        device,
+        observation_dim,
+        action_dim,
+        partial(mlp.Policy, hidden_dims=[64, 64]),
+        partial(mlp.ActionValue, hidden_dims=[64, 64]),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        UER(num_steps),
+        num_steps + 1,  # Never enough transitions for an update
+        0.99,
+        0.005,
+        Gaussian(0.1),
+        0.2,
+        0.5,
+    )
+
+
+def demo_loop(
+    env: SyntheticEnv, agent: TD3, device: torch.device, num_steps: int
+) -> None:
+    """The loop of demo/train_td3.py"""
+    step = 0
+    while step < num_steps:
+        state, _ = env.reset()
+        state = torch.tensor(state, device=device, dtype=torch.float32)
+        episodic_return = torch.zeros(1, device=device)
+        while step < num_steps:
+            action = agent.compute_action(state)
+            next_state, reward, terminated, truncated, _ = env.step(
+                action.cpu().numpy()
+            )
+            next_state = torch.tensor(next_state, device=device, dtype=torch.float32)
+            reward = torch.tensor([reward], device=device, dtype=torch.float32)
+            terminated = torch.tensor([terminated], device=device, dtype=torch.bool)
+            episodic_return += reward
+            agent.step(state, action, reward, next_state, terminated)
+            step += 1
+            if terminated or truncated:
+                break
+            state = next_state
+
+
+def runner_loop(
+    env: SyntheticEnv, agent: TD3, device: torch.device, num_steps: int
+) -> None:
+    RolloutRunner(env, agent, device).run(num_steps)
+
+
+def measure(
+    loop: Callable[..., None], device: torch.device, args: argparse.Namespace
+) -> float:
+    torch.manual_seed(0)
+    env = SyntheticEnv(args.observation_dim, args.action_dim, seed=0)
+    agent = make_agent(device, args.observation_dim, args.action_dim, args.num_steps)
+    start = time.perf_counter()
+    loop(env, agent, device, args.num_steps)
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--num-steps", type=int, default=20_000)
+    parser.add_argument("--observation-dim", type=int, default=17)
+    parser.add_argument("--action-dim", type=int, default=6)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--output", default="rollout_overhead.json")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    device = torch.device(args.device)
+    results: Dict[str, Any] = {"num_steps": args.num_steps, "device": args.device}
+    for name, loop in (("demo_loop", demo_loop), ("rollout_runner", runner_loop)):
+        elapsed = measure(loop, device, args)
+        results[name] = {
+            "elapsed": elapsed,
+            "us_per_step": elapsed / args.num_steps * 1e6,
+        }
+        print(f"{name:>15}: {elapsed / args.num_steps * 1e6:7.1f} µs/step", flush=True)
+    results["speedup"] = (
+        results["demo_loop"]["elapsed"] / results["rollout_runner"]["elapsed"]
+    )
+    print(f"{'speedup':>15}: {results['speedup']:.2f}×")
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Environments whose step costs (next to) nothing, to benchmark the library alone
+
+`SyntheticEnv` follows the gymnasium `Env` API and `SyntheticParallelEnv` the
+PettingZoo `ParallelEnv` API. Observations and rewards are drawn once, at
+construction, from a fixed-size pool which a step merely indexes; nothing is
+learnable, and episodes end by truncation only.
+"""
+
+# from collections.abc import Sequence
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+import numpy as np
+
+try:
+    from gymnasium.spaces import Box
+except ImportError:  # gymnasium is a dev dependency; the benchmarks only need shapes
+
+    class Box:  # type: ignore[no-redef]
+        def __init__(
+            self, low: float, high: float, shape: Tuple[int, ...], dtype: Any
+        ) -> None:
+            self.low = np.full(shape, low, dtype=dtype)
+            self.high = np.full(shape, high, dtype=dtype)
+            self.shape = shape
+            self.dtype = np.dtype(dtype)
+            self._rng = np.random.default_rng()
+
+        def sample(self) -> np.ndarray:
+            return self._rng.uniform(self.low, self.high).astype(self.dtype)
+
+
+AgentID = str
+_POOL_SIZE = 4096
+
+
+class SyntheticEnv:
+    metadata: Dict[str, Any] = {"render_modes": []}
+
+    def __init__(
+        self,
+        observation_dim: int,
+        action_dim: int,
+        max_episode_steps: int = 1000,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.observation_space = Box(-np.inf, np.inf, (observation_dim,), np.float32)
+        self.action_space = Box(-1.0, 1.0, (action_dim,), np.float32)
+        self._max_episode_steps = max_episode_steps
+
+        rng = np.random.default_rng(seed)
+        self._observations = rng.standard_normal(
+            (_POOL_SIZE, observation_dim), dtype=np.float32
+        )
+        self._rewards = rng.standard_normal(_POOL_SIZE).tolist()
+        self._cursor = 0
+        self._elapsed_steps = 0
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if seed is not None:
+            self._cursor = seed % _POOL_SIZE
+        self._elapsed_steps = 0
+        return self._observations[self._cursor], {}
+
+    def step(
+        self, action: np.ndarray
+    ) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        self._cursor = (self._cursor + 1) % _POOL_SIZE
+        self._elapsed_steps += 1
+        truncated = self._elapsed_steps >= self._max_episode_steps
+        return (
+            self._observations[self._cursor],
+            self._rewards[self._cursor],
+            False,
+            truncated,
+            {},
+        )
+
+    def close(self) -> None:
+        ...
+
+
+class SyntheticParallelEnv:
+    metadata: Dict[str, Any] = {"render_modes": [], "name": "synthetic_parallel"}
+
+    def __init__(
+        self,
+        num_agents: int,
+        observation_dim: int,
+        action_dim: int,
+        max_episode_steps: int = 25,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.possible_agents: List[AgentID] = [f"agent_{i}" for i in range(num_agents)]
+        self.agents: List[AgentID] = []
+        self._envs = {
+            agent_id: SyntheticEnv(
+                observation_dim,
+                action_dim,
+                max_episode_steps,
+                None if seed is None else seed + i,
+            )
+            for i, agent_id in enumerate(self.possible_agents)
+        }
+
+    def observation_space(self, agent_id: AgentID) -> Box:
+        return self._envs[agent_id].observation_space
+
+    def action_space(self, agent_id: AgentID) -> Box:
+        return self._envs[agent_id].action_space
+
+    def reset(
+        self, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[AgentID, np.ndarray], Dict[AgentID, Dict[str, Any]]]:
+        self.agents = list(self.possible_agents)
+        observations = {
+            agent_id: self._envs[agent_id].reset(seed=seed)[0]
+            for agent_id in self.agents
+        }
+        return observations, {agent_id: {} for agent_id in self.agents}
+
+    def step(
+        self, actions: Dict[AgentID, np.ndarray]
+    ) -> Tuple[Dict[AgentID, Any], ...]:
+        transitions = {
+            agent_id: self._envs[agent_id].step(actions[agent_id])
+            for agent_id in self.agents
+        }
+        observations, rewards, terminations, truncations, infos = (
+            {agent_id: transition[i] for agent_id, transition in transitions.items()}
+            for i in range(5)
+        )
+        if any(terminations.values()) or any(truncations.values()):
+            self.agents = []
+        return observations, rewards, terminations, truncations, infos
+
+    def close(self) -> None:
+        ...
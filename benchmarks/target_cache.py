@@ -0,0 +1,113 @@
+"""
+Time of the "target" phase of TD3 updates with and without a `TargetCache`, per
+bound on the staleness of cached targets, and the cache's hit rate
+
+Reuse needs a slot to be sampled again within `max_staleness` versions of the
+target networks, so the hit rate grows with batch_size * max_staleness / capacity.
+The buffer is filled with random transitions before timing.
+
+Usage:
+    python benchmarks/target_cache.py --capacity 2000 --batch-size 256 --staleness 0 16 64 --output target_cache.json
+"""
+
+import argparse
+import json
+from functools import partial
+
+# from collections.abc import Callable
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+)
+
+import torch
+import torch.optim as optim
+
+from deeprl.actor_critic_methods import TD3
+from deeprl.actor_critic_methods.experience_replay import UER, TargetCache
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import Gaussian
+from deeprl.profiling import Profiler
+
+OBSERVATION_DIM, ACTION_DIM = 17, 6
+
+
+def run(args: argparse.Namespace, max_staleness: Optional[int]) -> Dict[str, Any]:
+    torch.manual_seed(0)
+    replay: Any = UER(args.capacity)
+    if max_staleness is not None:
+        replay = TargetCache(replay, max_staleness)
+    hidden_dims = [args.hidden_size] * 2
+    agent = TD3(
+        torch.device("cpu"),
+        OBSERVATION_DIM,
+        ACTION_DIM,
+        partial(mlp.Policy, hidden_dims=hidden_dims),
+        partial(mlp.ActionValue, hidden_dims=hidden_dims),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        replay,
+        args.batch_size,
+        0.99,
+        0.005,
+        Gaussian(0.1),
+        0.2,
+        0.5,
+    )
+    for _ in range(args.capacity):
+        replay.push(
+            torch.randn(OBSERVATION_DIM),
+            torch.rand(ACTION_DIM) * 2 - 1,
+            torch.randn(1),
+            torch.randn(OBSERVATION_DIM),
+            torch.tensor([False]),
+        )
+
+    profiler = Profiler()
+    with profiler:
+        for _ in range(args.num_updates):
+            agent._update_parameters()
+    metrics = profiler.as_dict()
+    hits = metrics.get("count/target_cache_hits", 0)
+    misses = metrics.get("count/target_cache_misses", 0)
+    return {
+        "target_s": metrics["time/target"],
+        "update_s": metrics["time/sample"]
+        + metrics["time/target"]
+        + metrics["time/critic_backward"],
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--capacity", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--hidden-size", type=int, default=256)
+    parser.add_argument("--num-updates", type=int, default=500)
+    parser.add_argument("--staleness", type=int, nargs="+", default=[0, 16, 64])
+    parser.add_argument("--output", default="target_cache.json")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"capacity": args.capacity, "batch_size": args.batch_size}
+    results["uncached"] = run(args, None)
+    print(
+        f"{'uncached':>14}: target {results['uncached']['target_s']:7.3f} s", flush=True
+    )
+    for max_staleness in args.staleness:
+        name = f"staleness_{max_staleness}"
+        results[name] = run(args, max_staleness)
+        print(
+            f"{name:>14}: target {results[name]['target_s']:7.3f} s, hit rate {results[name]['hit_rate']:.2f}",
+            flush=True,
+        )
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
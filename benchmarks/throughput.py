@@ -0,0 +1,395 @@
+"""
+End-to-end training throughput of DDPG, TD3, SAC and MADDPG on a synthetic environment
+
+"shared_batch_maddpg" is MADDPG updating all agents on one batch per step, and
+"batched_maddpg" additionally stacks the agents' networks (`BatchedMADDPG`).
+
+Every configuration of the grid runs in a fresh (spawned) process, so that the
+peak RSS and the intra-op thread count belong to that configuration alone. The
+first `--warmup-steps` steps (at least a batch, so that updates take place) are
+not timed. "updates" are critic gradient steps, counted per agent for MADDPG.
+
+Usage:
+    python benchmarks/throughput.py --algorithms td3 sac --batch-sizes 256 \
+        --hidden-sizes 256 --replays uer per --threads 1 4 --output throughput.json
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+
+# from collections.abc import Callable
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+import numpy as np
+import torch
+import torch.optim as optim
+from synthetic_env import SyntheticEnv, SyntheticParallelEnv
+
+from deeprl.actor_critic_methods import DDPG, SAC, TD3
+from deeprl.actor_critic_methods.experience_replay import PER, UER
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import Gaussian
+from deeprl.multi_agent.maddpg import er as multi_agent_er
+from deeprl.multi_agent.maddpg import nn as multi_agent_nn
+from deeprl.multi_agent.maddpg.algo import MADDPG, Agent
+from deeprl.multi_agent.maddpg.batched import BatchedMADDPG
+from deeprl.profiling import Profiler
+
+
+@dataclass(frozen=True)
+class Config:
+    algorithm: str
+    batch_size: int
+    hidden_size: int
+    replay: str
+    num_threads: int
+
+
+@dataclass(frozen=True)
+class Settings:
+    num_steps: int
+    warmup_steps: int
+    observation_dim: int
+    action_dim: int
+    num_agents: int
+    memory_capacity: int
+    device: str
+    maddpg_workers: Optional[int]
+
+
+def _make_replay(config: Config, settings: Settings) -> Any:
+    if config.replay == "uer":
+        return UER(settings.memory_capacity)
+    if config.replay == "per":
+        return PER(settings.memory_capacity, α=0.6)
+    raise ValueError(f"Unknown experience replay {config.replay!r}.")
+
+
+def _make_agent(config: Config, settings: Settings) -> Any:
+    device = torch.device(settings.device)
+    S, A = settings.observation_dim, settings.action_dim
+    hidden_dims = [config.hidden_size] * 2
+    lr = 1e-3
+    if config.algorithm == "ddpg":
+        return DDPG(
+            mlp.Policy(S, A, hidden_dims).to(device),
+            mlp.ActionValue(S, A, hidden_dims).to(device),
+            partial(optim.Adam, lr=lr),
+            partial(optim.Adam, lr=lr),
+            _make_replay(config, settings),
+            config.batch_size,
+            0.99,
+            0.995,
+            Gaussian(0.1),
+        )
+    if config.algorithm == "td3":
+        return TD3(
+            device,
+            S,
+            A,
+            partial(mlp.Policy, hidden_dims=hidden_dims),
+            partial(mlp.ActionValue, hidden_dims=hidden_dims),
+            partial(optim.Adam, lr=lr),
+            partial(optim.Adam, lr=lr),
+            _make_replay(config, settings),
+            config.batch_size,
+            0.99,
+            0.005,
+            Gaussian(0.1),
+            0.2,
+            0.5,
+        )
+    if config.algorithm == "sac":
+        return SAC(
+            device,
+            S,
+            A,
+            partial(mlp.GaussianPolicy, hidden_dims=hidden_dims),
+            partial(mlp.ActionValue, hidden_dims=hidden_dims),
+            partial(optim.Adam, lr=lr),
+            partial(optim.Adam, lr=lr),
+            partial(optim.Adam, lr=lr),
+            _make_replay(config, settings),
+            config.batch_size,
+            0.99,
+            0.005,
+        )
+    if config.algorithm in ("maddpg", "shared_batch_maddpg"):
+        N = settings.num_agents
+        agents = {
+            f"agent_{i}": Agent(
+                multi_agent_nn.Actor(S, A, hidden_dims, "relu", "tanh").to(device),
+                multi_agent_nn.Critic(N * S, N * A, hidden_dims, "relu").to(device),
+                partial(optim.Adam, lr=lr),
+                partial(optim.Adam, lr=lr),
+                0.95,
+                0.99,
+            )
+            for i in range(N)
+        }
+        return MADDPG(
+            agents,
+            multi_agent_er.UER(settings.memory_capacity),
+            config.batch_size,
+            shared_batch=config.algorithm == "shared_batch_maddpg",
+            num_workers=settings.maddpg_workers,
+            num_threads_per_worker=None
+            if settings.maddpg_workers is None
+            else max(1, config.num_threads // settings.maddpg_workers),
+        )
+    if config.algorithm == "batched_maddpg":
+        N = settings.num_agents
+        agent_ids = [f"agent_{i}" for i in range(N)]
+        return BatchedMADDPG(
+            {
+                id: multi_agent_nn.Actor(S, A, hidden_dims, "relu", "tanh").to(device)
+                for id in agent_ids
+            },
+            {
+                id: multi_agent_nn.Critic(N * S, N * A, hidden_dims, "relu").to(device)
+                for id in agent_ids
+            },
+            partial(optim.Adam, lr=lr),
+            partial(optim.Adam, lr=lr),
+            multi_agent_er.UER(settings.memory_capacity),
+            config.batch_size,
+            0.95,
+            0.99,
+        )
+    raise ValueError(f"Unknown algorithm {config.algorithm!r}.")
+
+
+def _single_agent_loop(agent: Any, settings: Settings) -> Callable[[int], None]:
+    device = torch.device(settings.device)
+    env = SyntheticEnv(settings.observation_dim, settings.action_dim, seed=0)
+    observation, _ = env.reset()
+    state = torch.as_tensor(observation, device=device)
+
+    def run(num_steps: int) -> None:
+        nonlocal state
+        for _ in range(num_steps):
+            action = agent.compute_action(state)
+            observation, reward, terminated, truncated, _ = env.step(
+                action.cpu().numpy()
+            )
+            next_state = torch.as_tensor(observation, device=device)
+            agent.step(
+                state,
+                action,
+                torch.tensor([reward], device=device, dtype=torch.float32),
+                next_state,
+                torch.tensor([terminated], device=device),
+            )
+            if terminated or truncated:
+                observation, _ = env.reset()
+                next_state = torch.as_tensor(observation, device=device)
+            state = next_state
+
+    return run
+
+
+def _multi_agent_loop(agent: Any, settings: Settings) -> Callable[[int], None]:
+    device = torch.device(settings.device)
+    env = SyntheticParallelEnv(
+        settings.num_agents, settings.observation_dim, settings.action_dim, seed=0
+    )
+    observations, _ = env.reset()
+    observation = {
+        id: torch.as_tensor(obs, device=device) for id, obs in observations.items()
+    }
+
+    def run(num_steps: int) -> None:
+        nonlocal observation
+        for _ in range(num_steps):
+            if isinstance(agent, BatchedMADDPG):
+                action = agent.compute_actions(observation)
+            else:
+                action = {
+                    id: agent.compute_action(id, obs) for id, obs in observation.items()
+                }
+            next_observations, rewards, terminations, _, _ = env.step(
+                {id: a.cpu().numpy() for id, a in action.items()}
+            )
+            next_observation = {
+                id: torch.as_tensor(obs, device=device)
+                for id, obs in next_observations.items()
+            }
+            agent.step(
+                observation,
+                action,
+                {
+                    id: torch.tensor([r], device=device, dtype=torch.float32)
+                    for id, r in rewards.items()
+                },
+                next_observation,
+                {
+                    id: torch.tensor([t], device=device)
+                    for id, t in terminations.items()
+                },
+            )
+            if not env.agents:
+                next_observations, _ = env.reset()
+                next_observation = {
+                    id: torch.as_tensor(obs, device=device)
+                    for id, obs in next_observations.items()
+                }
+            observation = next_observation
+
+    return run
+
+
+def _peak_rss_bytes() -> int:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kibibytes on Linux but bytes on macOS
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def run(config: Config, settings: Settings) -> Dict[str, Any]:
+    """Benchmarks one configuration in the calling process"""
+    torch.set_num_threads(config.num_threads)
+    torch.manual_seed(0)
+    np.random.seed(0)
+
+    agent = _make_agent(config, settings)
+    loop = (
+        _multi_agent_loop if config.algorithm.endswith("maddpg") else _single_agent_loop
+    )(agent, settings)
+    loop(max(settings.warmup_steps, config.batch_size))
+
+    with Profiler(synchronise_cuda=settings.device.startswith("cuda")) as profiler:
+        start = time.perf_counter()
+        loop(settings.num_steps)
+        elapsed = time.perf_counter() - start
+
+    phases = profiler.as_dict()
+    num_updates = phases.get("calls/critic_backward", 0)
+    if config.algorithm == "batched_maddpg":
+        num_updates *= settings.num_agents  # one batched update covers all agents
+    return {
+        **asdict(config),
+        "elapsed": elapsed,
+        "env_steps_per_second": settings.num_steps / elapsed,
+        "updates_per_second": num_updates / elapsed,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "phases": phases,
+    }
+
+
+def _run_isolated(config: Config, settings: Settings) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(run, config, settings).result()
+        except Exception as error:  # e.g. an unsupported combination; the rest of the grid still runs
+            return {**asdict(config), "error": f"{type(error).__name__}: {error}"}
+
+
+def _grid(args: argparse.Namespace) -> List[Config]:
+    configs = []
+    for algorithm, batch_size, hidden_size, replay, num_threads in itertools.product(
+        args.algorithms, args.batch_sizes, args.hidden_sizes, args.replays, args.threads
+    ):
+        if algorithm.endswith("maddpg") and replay != "uer":
+            continue  # MADDPG only has a uniform experience replay
+        configs.append(Config(algorithm, batch_size, hidden_size, replay, num_threads))
+    return configs
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "cuda": torch.cuda.get_device_name() if torch.cuda.is_available() else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=["ddpg", "td3", "sac", "maddpg"],
+        choices=[
+            "ddpg",
+            "td3",
+            "sac",
+            "maddpg",
+            "shared_batch_maddpg",
+            "batched_maddpg",
+        ],
+    )
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[256])
+    parser.add_argument("--hidden-sizes", nargs="+", type=int, default=[256])
+    parser.add_argument("--replays", nargs="+", default=["uer"], choices=["uer", "per"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1])
+    parser.add_argument("--steps", type=int, default=2_000)
+    parser.add_argument("--warmup-steps", type=int, default=1_000)
+    parser.add_argument("--observation-dim", type=int, default=17)
+    parser.add_argument("--action-dim", type=int, default=6)
+    parser.add_argument("--num-agents", type=int, default=3)
+    parser.add_argument("--memory-capacity", type=int, default=1_000_000)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument(
+        "--maddpg-workers",
+        type=int,
+        help="updates MADDPG agents on a thread pool sharing the intra-op threads",
+    )
+    parser.add_argument("--output", default="throughput.json")
+    args = parser.parse_args()
+
+    settings = Settings(
+        args.steps,
+        args.warmup_steps,
+        args.observation_dim,
+        args.action_dim,
+        args.num_agents,
+        args.memory_capacity,
+        args.device,
+        args.maddpg_workers,
+    )
+    results = []
+    for config in _grid(args):
+        result = _run_isolated(config, settings)
+        results.append(result)
+        if "error" in result:
+            print(f"{config}: {result['error']}", flush=True)
+        else:
+            print(
+                f"{config}: {result['env_steps_per_second']:8.1f} env-steps/s"
+                f" {result['updates_per_second']:8.1f} updates/s"
+                f" {result['peak_rss_bytes'] / 2**20:8.1f} MiB peak RSS",
+                flush=True,
+            )
+
+    report = {
+        "environment": _environment(),
+        "settings": asdict(settings),
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
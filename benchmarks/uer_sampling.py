@@ -0,0 +1,111 @@
+"""
+Time of `UER.sample` at full capacity per sampler, against the legacy
+`np.random.choice(size, batch_size, replace=False)`, which permutes all indices
+
+"indices" times the drawing of slot indices alone; "sample" additionally gathers
+and stacks the batch, which is the same for every sampler. The buffer is filled
+with one shared transition, so that a capacity of 1e6 fits in memory.
+
+Usage:
+    python benchmarks/uer_sampling.py --capacity 1000000 --batch-size 256 --output uer_sampling.json
+"""
+
+import argparse
+import json
+import time
+from functools import partial
+
+# from collections.abc import Callable
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+)
+
+import numpy as np
+import torch
+
+from deeprl.actor_critic_methods.experience_replay import (
+    ERE,
+    UER,
+    WithoutReplacement,
+    WithReplacement,
+)
+from deeprl.actor_critic_methods.experience_replay.samplers import Sampler
+
+
+class LegacyChoice(Sampler):
+    """`np.random.choice` (RandomState): permutes all indices"""
+
+    def __call__(
+        self,
+        rng: np.random.Generator,
+        size: int,
+        next_idx: int,
+        capacity: int,
+        batch_size: int,
+    ) -> np.ndarray:
+        return np.random.choice(size, batch_size, replace=False)
+
+
+SAMPLERS: Dict[str, Callable[[], Sampler]] = {
+    "legacy_choice": LegacyChoice,
+    "without_replacement": WithoutReplacement,
+    "with_replacement": WithReplacement,
+    "ere": ERE,
+}
+
+
+def time_per_call(fn: Callable[[], Any], repeats: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--output", default="uer_sampling.json")
+    args = parser.parse_args()
+
+    replay = UER(args.capacity)
+    transition = (
+        torch.zeros(17),
+        torch.zeros(6),
+        torch.zeros(1),
+        torch.zeros(17),
+        torch.zeros(1, dtype=torch.bool),
+    )
+    for _ in range(args.capacity):
+        replay.push(*transition)
+
+    rng = np.random.default_rng(0)
+    results: Dict[str, Any] = {"capacity": args.capacity, "batch_size": args.batch_size}
+    for name, sampler_fn in SAMPLERS.items():
+        sampler = sampler_fn()
+        replay._sampler = sampler
+        draw = partial(sampler, rng, args.capacity, 0, args.capacity, args.batch_size)
+        results[name] = {
+            "indices_us": time_per_call(draw, args.repeats) * 1e6,
+            "sample_us": time_per_call(
+                lambda: replay.sample(args.batch_size), args.repeats
+            )
+            * 1e6,
+        }
+        print(
+            f"{name:>20}: indices {results[name]['indices_us']:9.1f} µs, sample {results[name]['sample_us']:9.1f} µs",
+            flush=True,
+        )
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
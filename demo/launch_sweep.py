@@ -0,0 +1,77 @@
+import math
+from functools import partial
+
+import gymnasium as gym
+import torch
+import torch.optim as optim
+
+from deeprl.actor_critic_methods import SAC, TD3
+from deeprl.actor_critic_methods.experience_replay import UER
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import Gaussian
+from deeprl.checkpointing import CheckpointManager
+from deeprl.launcher import RunContext, launch
+from deeprl.rollout import RolloutRunner
+
+ENV_NAME = 'Pendulum-v1'
+CHECKPOINT_INTERVAL = 10_000
+
+
+def make_agent(config: dict, env: gym.Env):
+    state_dim = math.prod(env.observation_space.shape)
+    action_dim = math.prod(env.action_space.shape)
+    hidden_dims = config['hidden_dims']
+    if config['algorithm'] == 'td3':
+        return TD3(
+            torch.device('cpu'), state_dim, action_dim,
+            partial(mlp.Policy, hidden_dims=hidden_dims),
+            partial(mlp.ActionValue, hidden_dims=hidden_dims),
+            partial(optim.Adam, lr=config['lr']),
+            partial(optim.Adam, lr=config['lr']),
+            UER(config['num_steps']), config['batch_size'], 0.99, 0.005,
+            Gaussian(0.1), 0.2, 0.5,
+        )
+    return SAC(
+        torch.device('cpu'), state_dim, action_dim,
+        partial(mlp.GaussianPolicy, hidden_dims=hidden_dims),
+        partial(mlp.ActionValue, hidden_dims=hidden_dims),
+        partial(optim.Adam, lr=config['lr']),
+        partial(optim.Adam, lr=config['lr']),
+        partial(optim.Adam, lr=config['lr']),
+        UER(config['num_steps']), config['batch_size'], 0.99, 0.005,
+    )
+
+
+def train(context: RunContext) -> dict:
+    config = context.config
+    env = gym.make(ENV_NAME)
+    agent = make_agent(config, env)
+
+    # Resumes an interrupted run from its latest checkpoint (the experience replay starts empty)
+    with CheckpointManager(context.directory / 'checkpoints', max_to_keep=1) as checkpoints:
+        step = checkpoints.restore(agent) or 0
+        runner = RolloutRunner(env, agent, torch.device('cpu'), seed=context.seed + step)
+        episodic_returns = []
+        while step < config['num_steps']:
+            num_steps = min(CHECKPOINT_INTERVAL - step % CHECKPOINT_INTERVAL, config['num_steps'] - step)
+            episodic_returns += [episode.episodic_return for episode in runner.run(num_steps)]
+            step += num_steps
+            if step % CHECKPOINT_INTERVAL == 0:
+                checkpoints.save(agent, step)
+
+    return {
+        'num_steps': config['num_steps'],
+        'final_return': sum(episodic_returns[-10:]) / max(len(episodic_returns[-10:]), 1),
+    }
+
+
+if __name__ == '__main__':
+    configs = {
+        f'{algorithm}-lr{lr}': dict(algorithm=algorithm, lr=lr, hidden_dims=[256, 256], batch_size=256, num_steps=50_000)
+        for algorithm in ('td3', 'sac')
+        for lr in (3e-4, 1e-3)
+    }
+    summary = launch(train, configs, seeds=range(5), directory='.logs/sweep', num_threads_per_run=2)
+    for name, result in summary['configs'].items():
+        print(name, result['metrics'].get('final_return'))
+    print(f"{summary['steps_per_second']:.0f} env-steps/s in total")
@@ -62,6 +62,7 @@ def train(cfg: DictConfig) -> None:
             agent.step(state, action, reward, next_state, terminated)
 
             if terminated or truncated:
+                agent.reset_noise()
                 break
             # Move to the next state
             state = next_state
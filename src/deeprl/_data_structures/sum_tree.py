@@ -50,5 +50,21 @@ class SumTree(Sized, Generic[_T]):
                 break
             node = (node - 1) // 2  # moves to the parent node
 
+    def update_priorities(self, leaves: np.ndarray, priorities: np.ndarray) -> None:
+        """
+        Batched `update_priority`: sets the leaves, then recomputes their ancestors
+        level by level, every ancestor once per level rather than once per leaf.
+        A node's sum is recomputed from its children, so no rounding error accumulates.
+        """
+        leaves = np.asarray(leaves, dtype=np.int64)
+        self._weights[leaves] = priorities
+        nodes = np.unique((leaves - 1) // 2)
+        while nodes.size:
+            nodes = nodes[nodes >= 0]
+            self._weights[nodes] = (
+                self._weights[2 * nodes + 1] + self._weights[2 * nodes + 2]
+            )
+            nodes = np.unique((nodes[nodes > 0] - 1) // 2)
+
     def __len__(self) -> int:
         return len(self._leaves)
@@ -0,0 +1,44 @@
+"""
+Lazy attributes of a package (PEP 562)
+
+A package's `__init__` declares where its exports live instead of importing them:
+
+    __getattr__, __dir__ = attach(__name__, {"DDPG": ".ddpg", ...})
+
+The defining submodule is imported at the first access to an export, which is
+then cached in the package's namespace so that `__getattr__` is called once.
+"""
+
+import importlib
+import sys
+
+# from collections.abc import Callable, Mapping
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    List,
+    Mapping,
+    Tuple,
+)
+
+
+def attach(
+    package: str, exports: Mapping[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """`exports` maps an attribute to the (relative) name of the module defining it"""
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module = exports[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            ) from None
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
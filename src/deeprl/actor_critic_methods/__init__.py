@@ -1,11 +1,45 @@
-from .ddpg import DDPG
-from .ppo import PPO
-from .sac import SAC
-from .td3 import TD3
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+# Algorithms are imported at first access, so that e.g. a process which only needs
+# a policy network does not pay for importing all of them
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "PPO": ".ppo",
+        "DDPG": ".ddpg",
+        "TD3": ".td3",
+        "SAC": ".sac",
+        "PixelSAC": ".pixel_sac",
+        "PopulationTD3": ".population",
+        "PopulationSAC": ".population",
+        "AsyncLearner": ".asynchronous",
+        "PrioritySweep": ".priority_sweep",
+        "DataParallel": ".data_parallel",
+    },
+)
+
+if TYPE_CHECKING:
+    from .asynchronous import AsyncLearner
+    from .data_parallel import DataParallel
+    from .ddpg import DDPG
+    from .pixel_sac import PixelSAC
+    from .population import PopulationSAC, PopulationTD3
+    from .ppo import PPO
+    from .priority_sweep import PrioritySweep
+    from .sac import SAC
+    from .td3 import TD3
 
 __all__ = (
-    PPO.__name__,
-    DDPG.__name__,
-    TD3.__name__,
-    SAC.__name__,
+    "PPO",
+    "DDPG",
+    "TD3",
+    "SAC",
+    "PixelSAC",
+    "PopulationTD3",
+    "PopulationSAC",
+    "AsyncLearner",
+    "PrioritySweep",
+    "DataParallel",
 )
@@ -0,0 +1,140 @@
+import time
+from copy import deepcopy
+from threading import Event, Lock, Thread
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Optional
+
+import torch
+from torch import Tensor
+
+from .experience_replay import RateLimiter, Synchronised
+from .sac import SAC
+from .td3 import TD3
+
+
+class AsyncLearner:
+    """
+    Overlaps acting and learning within one process
+
+    A background thread calls the agent's `_update_parameters` back to back while the
+    main thread keeps stepping the environment; most torch CPU kernels release the
+    GIL, so both sides make progress concurrently.
+    The agent acts with one of two snapshots of its policy (double buffering): every
+    `refresh_interval` updates the idle snapshot is overwritten with the latest
+    weights and then swapped in, so an action is never computed from half-updated
+    weights.
+
+    Usage:
+        with AsyncLearner(agent, refresh_interval=10) as learner:
+            action = learner.compute_action(state)
+            learner.step(state, action, reward, next_state, terminated)
+    """
+
+    def __init__(
+        self,
+        agent: Union[TD3, SAC],
+        refresh_interval: int,
+        idle_sleep: float = 1e-3,  # seconds to back off while the experience replay is too small to sample
+        # Seconds to wait for the learner thread to finish its update
+        stop_timeout: Optional[float] = 60.0,
+    ) -> None:
+        if refresh_interval < 1:
+            raise ValueError("refresh_interval must be at least 1.")
+
+        self._agent = agent
+        self._refresh_interval = refresh_interval
+        self._idle_sleep = idle_sleep
+        self._stop_timeout = stop_timeout
+
+        if not isinstance(agent._experience_replay, (Synchronised, RateLimiter)):
+            agent._experience_replay = Synchronised(agent._experience_replay)
+
+        self._snapshots = [
+            deepcopy(agent._policy).requires_grad_(False) for _ in range(2)
+        ]
+        self._front = 0
+        agent._behaviour_policy = self._snapshots[self._front]
+        self._swap_lock = Lock()
+
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+        self._exception: Optional[BaseException] = None
+        self.num_updates = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("The learner thread has already been started.")
+        self._stop_event.clear()
+        if isinstance(self._agent._experience_replay, RateLimiter):
+            self._agent._experience_replay.resume()
+        self._thread = Thread(target=self._run, name="learner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Joins the learner thread and re-raises any exception it died with"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        if isinstance(self._agent._experience_replay, RateLimiter):
+            # Wakes the learner thread if blocked in `sample`, e.g. with `timeout=None`
+            self._agent._experience_replay.cancel()
+        self._thread.join(self._stop_timeout)
+        if self._thread.is_alive():
+            raise RuntimeError(
+                f"The learner thread did not stop within {self._stop_timeout} seconds."
+            )
+        self._thread = None
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
+
+    def __enter__(self) -> "AsyncLearner":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        """Stores a transition; the learner thread performs the optimisation"""
+        if self._exception is not None:
+            self.stop()
+        self._agent._experience_replay.push(
+            state, action, reward, next_state, terminated
+        )
+
+    def compute_action(self, state: Tensor) -> Tensor:
+        # Holding the lock keeps the front snapshot from being swapped out mid-forward
+        with self._swap_lock:
+            return self._agent.compute_action(state)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop_event.is_set():
+                if not self._agent._update_parameters():
+                    time.sleep(self._idle_sleep)
+                    continue
+                self.num_updates += 1
+                if self.num_updates % self._refresh_interval == 0:
+                    self._refresh()
+        except BaseException as exception:
+            self._exception = exception
+
+    @torch.no_grad()
+    def _refresh(self) -> None:
+        back = self._snapshots[1 - self._front]
+        # The back snapshot is never read by the actor, so it can be written without the lock
+        for θ_back, θ in zip(back.parameters(), self._agent._policy.parameters()):
+            θ_back.copy_(θ)
+        for b_back, b in zip(back.buffers(), self._agent._policy.buffers()):
+            b_back.copy_(b)
+        with self._swap_lock:
+            self._front = 1 - self._front
+            self._agent._behaviour_policy = back
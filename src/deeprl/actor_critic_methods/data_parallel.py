@@ -0,0 +1,217 @@
+"""
+Data-parallel training of `TD3`/`SAC` across processes with `torch.distributed`
+
+Each of K learner processes steps its own environment into its own experience
+replay (a shard of the experience) and samples its own batch, so that an update
+learns from K * batch_size transitions. Before every optimiser step the gradients
+are averaged across processes by bucketed all-reduces, hence every process applies
+the same update and the networks, target networks included, stay identical.
+
+Usage, on a single host:
+    def train(rank: int, world_size: int) -> None:
+        agent = DataParallel(TD3(...))
+        ...  # agent.compute_action / agent.step as usual
+
+    launch_localhost(train, world_size=4)
+
+On several hosts, initialise the default process group, e.g. with `torchrun`, and
+wrap the agent likewise.
+"""
+
+import os
+
+# from collections.abc import Callable, Iterable
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Iterable,
+    List,
+)
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch import Tensor
+from torch.optim import Optimizer
+
+from ..profiling import phase
+from .experience_replay import Batch
+from .sac import SAC
+from .td3 import TD3
+
+
+def _buckets(tensors: Iterable[Tensor], bucket_size: int) -> List[List[Tensor]]:
+    """Consecutive tensors of one dtype, up to `bucket_size` bytes per bucket"""
+    buckets: List[List[Tensor]] = []
+    num_bytes = 0
+    for tensor in tensors:
+        size = tensor.numel() * tensor.element_size()
+        if (
+            not buckets
+            or num_bytes + size > bucket_size
+            or buckets[-1][0].dtype != tensor.dtype
+        ):
+            buckets.append([])
+            num_bytes = 0
+        buckets[-1].append(tensor)
+        num_bytes += size
+    return buckets
+
+
+def _unflatten_(bucket: List[Tensor], flat: Tensor) -> None:
+    for tensor, values in zip(bucket, flat.split([t.numel() for t in bucket])):
+        tensor.copy_(values.view_as(tensor))
+
+
+class DataParallel:
+    """
+    Wraps an agent whose process group members each wrap a replica of it
+
+    The parameters of the replica on rank 0, target networks included, are
+    broadcast at construction, and again every `sync_interval` updates to undo any
+    floating-point drift (e.g. from non-deterministic kernels). Every process samples
+    a batch first and an update only takes place if all of them did, so that the
+    collectives match even when some replay refuses to sample (the others then drop
+    their batch); hence every process must call `step` (or `_update_parameters`)
+    equally often.
+    """
+
+    def __init__(
+        self,
+        agent: Union[TD3, SAC],
+        bucket_size: int = 25 * 2**20,  # bytes of gradients per all-reduce
+        sync_interval: int = 1000,  # updates
+        # Defaults to the default process group
+        group: Optional[dist.ProcessGroup] = None,
+    ) -> None:
+        if not dist.is_initialized():
+            raise RuntimeError(
+                "The default process group is not initialised, see `launch_localhost`."
+            )
+        if sync_interval < 1:
+            raise ValueError("sync_interval must be at least 1.")
+
+        self._agent = agent
+        self._bucket_size = bucket_size
+        self._sync_interval = sync_interval
+        self._group = group
+        self._world_size = dist.get_world_size(group)
+        self.num_updates = 0
+
+        optimisers = [agent._policy_optimiser, *agent._critic_optimisers]
+        if isinstance(agent, SAC):
+            optimisers.append(agent._temperature_optimiser)
+        for optimiser in optimisers:
+            self._average_gradients_before_step(optimiser)
+        self._broadcast_parameters()
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        self._agent._experience_replay.push(
+            state, action, reward, next_state, terminated
+        )
+        self._update_parameters()
+
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place, which all processes agree on"""
+        agent = self._agent
+        batch: Optional[Batch] = None
+        try:
+            with phase("sample"):
+                batch = agent._experience_replay.sample(agent._batch_size)
+        except ValueError:  # e.g. too few transitions yet, or a `RateLimiter` timed out
+            pass
+        with phase("all_reduce"):
+            sampled = torch.tensor([batch is not None], dtype=torch.int32)
+            dist.all_reduce(sampled, op=dist.ReduceOp.MIN, group=self._group)
+        if batch is None or not sampled.item():  # Every process drops its batch
+            return False
+        agent._learn(batch)
+        self.num_updates += 1
+        if self.num_updates % self._sync_interval == 0:
+            self._broadcast_parameters()
+        return True
+
+    def _average_gradients_before_step(self, optimiser: Optimizer) -> None:
+        params = [
+            param for group in optimiser.param_groups for param in group["params"]
+        ]
+        step = optimiser.step
+
+        def averaged_step(*args: Any, **kwargs: Any) -> Any:
+            with phase("all_reduce"):
+                for param in params:
+                    if param.grad is None:  # e.g. a parameter unused by this loss
+                        param.grad = torch.zeros_like(param)
+                self._all_reduce_mean_([param.grad for param in params])
+            return step(*args, **kwargs)
+
+        optimiser.step = averaged_step  # type: ignore
+
+    def _all_reduce_mean_(self, tensors: List[Tensor]) -> None:
+        # Launches every bucket before waiting for any, so that they overlap
+        buckets = _buckets(tensors, self._bucket_size)
+        flats = [
+            torch.cat([tensor.reshape(-1) for tensor in bucket]) for bucket in buckets
+        ]
+        works = [
+            dist.all_reduce(flat, group=self._group, async_op=True) for flat in flats
+        ]
+        for bucket, flat, work in zip(buckets, flats, works):
+            work.wait()
+            _unflatten_(bucket, flat.div_(self._world_size))
+
+    @torch.no_grad()
+    def _broadcast_parameters(self) -> None:
+        agent = self._agent
+        modules = [agent._policy, *agent._critics, *agent._target_critics]
+        if isinstance(agent, TD3):
+            modules.append(agent._target_policy)
+        tensors = [
+            tensor
+            for module in modules
+            for tensor in (*module.parameters(), *module.buffers())
+        ]
+        if isinstance(agent, SAC):
+            tensors.append(agent._log_temperature)
+        with phase("broadcast"):
+            src = dist.get_global_rank(self._group, 0) if self._group is not None else 0
+            for bucket in _buckets(tensors, self._bucket_size):
+                flat = torch.cat([tensor.reshape(-1) for tensor in bucket])
+                dist.broadcast(flat, src=src, group=self._group)
+                _unflatten_(bucket, flat)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegates e.g. `compute_action` and `state_dict` to the wrapped agent"""
+        if name == "_agent":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self._agent, name)
+
+
+def _run(rank: int, fn: Callable[[int, int], None], world_size: int, port: int) -> None:
+    dist.init_process_group(
+        "gloo", init_method=f"tcp://127.0.0.1:{port}", rank=rank, world_size=world_size
+    )
+    try:
+        fn(rank, world_size)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch_localhost(
+    fn: Callable[[int, int], None],  # Called as fn(rank, world_size); must be picklable
+    world_size: int,
+    port: Optional[int] = None,  # Defaults to $MASTER_PORT, else 29500
+) -> None:
+    """Runs `fn` in `world_size` spawned processes joined by a gloo process group"""
+    if port is None:
+        port = int(os.environ.get("MASTER_PORT", 29500))
+    mp.spawn(_run, args=(fn, world_size, port), nprocs=world_size)
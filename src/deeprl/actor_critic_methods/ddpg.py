@@ -2,7 +2,9 @@ from copy import deepcopy
 
 # from collections.abc import Callable, Iterator
 from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
     Callable,
+    Dict,
     Iterator,
     Union,
 )
@@ -13,7 +15,8 @@ from torch import Tensor
 from torch.nn.parameter import Parameter
 from torch.optim import Optimizer
 
-from .experience_replay import PER, ExperienceReplay
+from ..profiling import phase
+from .experience_replay import Batch, ExperienceReplay
 from .neural_network import ActionCritic, DeterministicActor
 from .noise_injection.action_space import ActionNoise
 from .noise_injection.parameter_space import AdaptiveParameterNoise
@@ -62,13 +65,73 @@ class DDPG:
         self._experience_replay.push(state, action, reward, next_state, terminated)
         self._update_parameters()
 
-    def _update_parameters(self) -> None:
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
 
         try:
-            batch = self._experience_replay.sample(self._batch_size)
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
         except ValueError:
-            return
+            return False
+
+        with phase("target"):
+            TD_targets = (
+                batch.rewards
+                + ~batch.terminateds
+                * self._discount_factor
+                * self._target_critic(
+                    batch.next_states, self._target_policy(batch.next_states)
+                )
+            )
+
+        with phase("critic_backward"):
+            action_values = self._critic(batch.states, batch.actions)
+            critic_loss = F.mse_loss(TD_targets, action_values)
+            self._critic_optimiser.zero_grad()
+            critic_loss.backward()
+            self._critic_optimiser.step()
+
+        # Learn a deterministic policy which gives the action that maximizes Q by gradient ascent
+        with phase("policy_backward"):
+            policy_loss: Tensor = -self._critic(
+                batch.states, self._policy(batch.states)
+            ).mean()
+            self._policy_optimiser.zero_grad()
+            policy_loss.backward()
+            self._policy_optimiser.step()
+
+        # Update frozen target networks by Polyak averaging
+        with torch.no_grad():  # stops target param from requesting grad after calc because original param require grad are involved in the calc
+            with phase("polyak"):
+                for ϕ, ϕ_targ in zip(
+                    self._critic.parameters(), self._target_critic.parameters()
+                ):
+                    ϕ_targ.mul_(self._polyak)
+                    ϕ_targ.add_((1.0 - self._polyak) * ϕ)
+                for θ, θ_targ in zip(
+                    self._policy.parameters(), self._target_policy.parameters()
+                ):
+                    θ_targ.mul_(self._polyak)
+                    θ_targ.add_((1.0 - self._polyak) * θ)
+
+            if isinstance(self._policy_noise, AdaptiveParameterNoise):
+                # Adapts the scale of parameter noise on states from the experience replay
+                with phase("noise_adaptation"):
+                    self._policy_noise.adapt(self._policy, batch.states)
+
+            # PER, possibly wrapped e.g. by a RateLimiter
+            if hasattr(self._experience_replay, "update_priorities"):
+                with phase("priority_update"):
+                    TD_errors = TD_targets - action_values
+                    priorities = torch.abs(TD_errors).cpu().numpy()
+                    setattr(batch, "priorities", priorities)
+                    self._experience_replay.update_priorities(batch)
+
+        return True
 
+    @torch.no_grad()
+    def _td_errors(self, batch: Batch) -> Tensor:
+        """TD errors of a batch under the current networks, e.g. to refresh PER priorities"""
         TD_targets = (
             batch.rewards
             + ~batch.terminateds
@@ -77,54 +140,47 @@ class DDPG:
                 batch.next_states, self._target_policy(batch.next_states)
             )
         )
-        action_values = self._critic(batch.states, batch.actions)
-
-        critic_loss = F.mse_loss(TD_targets, action_values)
-        self._critic_optimiser.zero_grad()
-        critic_loss.backward()
-        self._critic_optimiser.step()
-
-        # Learn a deterministic policy which gives the action that maximizes Q by gradient ascent
-        policy_loss: Tensor = -self._critic(
-            batch.states, self._policy(batch.states)
-        ).mean()
-        self._policy_optimiser.zero_grad()
-        policy_loss.backward()
-        self._policy_optimiser.step()
-
-        # Update frozen target networks by Polyak averaging
-        with torch.no_grad():  # stops target param from requesting grad after calc because original param require grad are involved in the calc
-            for ϕ, ϕ_targ in zip(
-                self._critic.parameters(), self._target_critic.parameters()
-            ):
-                ϕ_targ.mul_(self._polyak)
-                ϕ_targ.add_((1.0 - self._polyak) * ϕ)
-            for θ, θ_targ in zip(
-                self._policy.parameters(), self._target_policy.parameters()
-            ):
-                θ_targ.mul_(self._polyak)
-                θ_targ.add_((1.0 - self._polyak) * θ)
-
-            if isinstance(self._experience_replay, PER):
-                TD_errors = TD_targets - action_values
-                priorities = torch.abs(TD_errors).cpu().numpy()
-                setattr(batch, "priorities", priorities)
-                self._experience_replay.update_priorities(batch)
+        return TD_targets - self._critic(batch.states, batch.actions)
 
     @torch.no_grad()
     def compute_action(self, state: Tensor) -> Tensor:
-        action: Tensor = self._policy(state)
         # TODO: Avaliable since version 3.10. See PEP 634
         # match self._policy_noise:
         #     case ActionNoise():
         #     case AdaptiveParameterNoise():
         #     case _:
+        if isinstance(self._policy_noise, AdaptiveParameterNoise):
+            return self._policy_noise.perturb(self._policy)(state)
+        action: Tensor = self._policy(state)
         if isinstance(self._policy_noise, ActionNoise):
             action += self._policy_noise(action.size(), action.device)
             action.clamp_(-1, 1)  # Output layer of policy network is tanh activated
-        if isinstance(self._policy_noise, AdaptiveParameterNoise):
-            perturbed_policy = self._policy_noise.perturb(self._policy)
-            perturbed_action = perturbed_policy(state)
-            self._policy_noise.adapt(action, perturbed_action)
-            action = perturbed_action
         return action
+
+    def reset_noise(self) -> None:
+        """Meant to be called at the end of every episode"""
+        if self._policy_noise is not None:
+            self._policy_noise.reset()
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self._policy.state_dict(),
+            "critic": self._critic.state_dict(),
+            "target_policy": self._target_policy.state_dict(),
+            "target_critic": self._target_critic.state_dict(),
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimiser": self._critic_optimiser.state_dict(),
+            "policy_noise": self._policy_noise.state_dict()
+            if self._policy_noise is not None
+            else None,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._policy.load_state_dict(state_dict["policy"])
+        self._critic.load_state_dict(state_dict["critic"])
+        self._target_policy.load_state_dict(state_dict["target_policy"])
+        self._target_critic.load_state_dict(state_dict["target_critic"])
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        self._critic_optimiser.load_state_dict(state_dict["critic_optimiser"])
+        if self._policy_noise is not None and state_dict["policy_noise"] is not None:
+            self._policy_noise.load_state_dict(state_dict["policy_noise"])
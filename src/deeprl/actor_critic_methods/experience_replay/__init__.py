@@ -1,13 +1,60 @@
-from ._base import Batch, Experience, ExperienceReplay
-from .her import HER
-from .per import PER
-from .uer import UER
+from typing import TYPE_CHECKING
+
+from ..._lazy import attach
+
+# Experience replays are imported at first access, see `deeprl._lazy`
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "Experience": "._base",
+        "Batch": "._base",
+        "ExperienceReplay": "._base",
+        "UER": ".uer",
+        "Sampler": ".samplers",
+        "WithReplacement": ".samplers",
+        "WithoutReplacement": ".samplers",
+        "ERE": ".samplers",
+        "PER": ".per",
+        "HER": ".her",
+        "ColumnarUER": ".columnar",
+        "PopulationUER": ".population",
+        "Recorded": ".recorded",
+        "RateLimiter": ".rate_limiter",
+        "RateLimiterStats": ".rate_limiter",
+        "Synchronised": ".synchronised",
+        "TargetCache": ".target_cache",
+    },
+)
+
+if TYPE_CHECKING:
+    from ._base import Batch, Experience, ExperienceReplay
+    from .columnar import ColumnarUER
+    from .her import HER
+    from .per import PER
+    from .population import PopulationUER
+    from .rate_limiter import RateLimiter, RateLimiterStats
+    from .recorded import Recorded
+    from .samplers import ERE, Sampler, WithoutReplacement, WithReplacement
+    from .synchronised import Synchronised
+    from .target_cache import TargetCache
+    from .uer import UER
 
 __all__ = (
-    Experience.__name__,
-    Batch.__name__,
-    ExperienceReplay.__name__,
-    UER.__name__,
-    PER.__name__,
-    HER.__name__,
+    "Experience",
+    "Batch",
+    "ExperienceReplay",
+    "UER",
+    "Sampler",
+    "WithReplacement",
+    "WithoutReplacement",
+    "ERE",
+    "PER",
+    "HER",
+    "ColumnarUER",
+    "PopulationUER",
+    "Recorded",
+    "RateLimiter",
+    "RateLimiterStats",
+    "Synchronised",
+    "TargetCache",
 )
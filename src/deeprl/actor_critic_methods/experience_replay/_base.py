@@ -9,6 +9,8 @@ import torch
 from attrs import define, field
 from torch import Tensor
 
+from ...profiling import phase
+
 
 @dataclass
 class Experience:
@@ -32,8 +34,28 @@ class Batch:
     terminateds: Tensor = field(init=False)
 
     def __attrs_post_init__(self) -> None:
-        for field, unstacked in zip(fields(Experience), zip(*self.experiences)):
-            setattr(self, field.name + "s", torch.stack(unstacked))
+        with phase("stack"):
+            for field, unstacked in zip(fields(Experience), zip(*self.experiences)):
+                setattr(self, field.name + "s", torch.stack(unstacked))
+
+    @classmethod
+    def from_columns(
+        cls,
+        states: Tensor,
+        actions: Tensor,
+        rewards: Tensor,
+        next_states: Tensor,
+        terminateds: Tensor,
+    ) -> "Batch":
+        """A batch of already stacked tensors, e.g. gathered from a columnar storage"""
+        batch = cls.__new__(cls)
+        batch.experiences = []
+        batch.states = states
+        batch.actions = actions
+        batch.rewards = rewards
+        batch.next_states = next_states
+        batch.terminateds = terminateds
+        return batch
 
 
 class ExperienceReplay(ABC):
@@ -0,0 +1,235 @@
+import json
+import os
+from pathlib import Path
+
+# from collections.abc import Sequence
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import torch
+from torch import Tensor
+
+from ...profiling import count, phase
+from ._base import Batch, ExperienceReplay
+
+_META_FILE = "meta.json"
+
+
+class ColumnarUER(ExperienceReplay):
+    """
+    Uniformly sampled, with every field stored in one preallocated column of size
+    (capacity, ...) rather than as one `Experience` per transition
+
+    Columns live on `device`, or, given a `directory`, in memory-mapped files on
+    disk, so that a replay larger than memory only occupies the pages which are
+    touched; batches are then gathered on the host and moved to `device`. A memory-
+    mapped replay is reopened by `ColumnarUER.open` once `flush`ed.
+
+    `extend` stores many transitions at once, e.g. logged datasets (see
+    `deeprl.offline`). A sample draws indices with replacement, which costs
+    O(batch_size) whatever the capacity.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        state_shape: Union[int, Sequence[int]],
+        action_shape: Union[int, Sequence[int]],
+        device: torch.device = torch.device("cpu"),
+        directory: Union[str, "os.PathLike[str]", None] = None,
+        state_dtype: torch.dtype = torch.float32,  # e.g. torch.uint8 for pixel observations
+        *,
+        _mode: str = "w+",
+    ) -> None:
+        state_shape = (
+            (state_shape,) if isinstance(state_shape, int) else tuple(state_shape)
+        )
+        action_shape = (
+            (action_shape,) if isinstance(action_shape, int) else tuple(action_shape)
+        )
+        self.shapes: Dict[str, Tuple[int, ...]] = {
+            "states": state_shape,
+            "actions": action_shape,
+            "rewards": (1,),
+            "next_states": state_shape,
+            "terminateds": (1,),
+        }
+        self.dtypes = {
+            "states": state_dtype,
+            "actions": torch.float32,
+            "rewards": torch.float32,
+            "next_states": state_dtype,
+            "terminateds": torch.bool,
+        }
+        self._capacity = capacity
+        self._device = device
+        self._directory = Path(directory) if directory is not None else None
+
+        self.columns: Dict[str, Tensor] = {}
+        self._memmaps: List[np.memmap] = []
+        for name, shape in self.shapes.items():
+            if self._directory is None:
+                self.columns[name] = torch.empty(
+                    (capacity, *shape), dtype=self.dtypes[name], device=device
+                )
+            else:
+                self._directory.mkdir(parents=True, exist_ok=True)
+                dtype = torch.empty(0, dtype=self.dtypes[name]).numpy().dtype
+                array = np.memmap(
+                    self._directory / f"{name}.bin",
+                    dtype=dtype,
+                    mode=_mode,
+                    shape=(capacity, *shape),
+                )
+                self._memmaps.append(array)
+                self.columns[name] = torch.from_numpy(array)
+        self._storage_device = self.columns["states"].device
+
+        self._rng = torch.Generator(device=self._storage_device)
+        self._rng.seed()
+        self._next_idx = 0
+        self._size = 0
+
+    @classmethod
+    def open(
+        cls,
+        directory: Union[str, "os.PathLike[str]"],
+        device: torch.device = torch.device("cpu"),
+    ) -> "ColumnarUER":
+        """Reopens a memory-mapped replay, as of its latest `flush`"""
+        meta = json.loads((Path(directory) / _META_FILE).read_text())
+        state_dtype = getattr(torch, meta.get("state_dtype", "float32"))
+        replay = cls(
+            meta["capacity"],
+            meta["state_shape"],
+            meta["action_shape"],
+            device,
+            directory,
+            state_dtype,
+            _mode="r+",
+        )
+        replay._next_idx = meta["next_idx"]
+        replay._size = meta["size"]
+        return replay
+
+    def flush(self) -> None:
+        """Writes a memory-mapped replay's columns and bookkeeping to disk"""
+        if self._directory is None:
+            return
+        for array in self._memmaps:
+            array.flush()
+        meta = {
+            "capacity": self._capacity,
+            "state_shape": list(self.shapes["states"]),
+            "action_shape": list(self.shapes["actions"]),
+            "state_dtype": str(self.dtypes["states"]).replace("torch.", ""),
+            "next_idx": self._next_idx,
+            "size": self._size,
+        }
+        temporary = self._directory / (_META_FILE + ".tmp")
+        temporary.write_text(json.dumps(meta))
+        os.replace(temporary, self._directory / _META_FILE)
+
+    def push(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        count("push")
+        i = self._next_idx
+        for name, value in zip(
+            self.shapes, (state, action, reward, next_state, terminated)
+        ):
+            self.columns[name][i] = value.view(self.shapes[name])
+        self._next_idx = (i + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def extend(
+        self,
+        states: Union[Tensor, np.ndarray],
+        actions: Union[Tensor, np.ndarray],
+        rewards: Union[Tensor, np.ndarray],
+        next_states: Union[Tensor, np.ndarray],
+        terminateds: Union[Tensor, np.ndarray],
+    ) -> None:
+        """
+        Stores n transitions given as columns of size (n, ...); rewards and
+        terminateds may be of size (n,). Overwrites the oldest transitions once full.
+        """
+        columns = dict(
+            zip(self.shapes, (states, actions, rewards, next_states, terminateds))
+        )
+        n = len(states)
+        for name, column in columns.items():
+            shape = (n, *self.shapes[name])
+            accepted = {shape, shape[:-1]} if self.shapes[name] == (1,) else {shape}
+            if tuple(column.shape) not in accepted:
+                raise ValueError(
+                    f"Expected {name} of size {shape}, got {tuple(column.shape)}."
+                )
+        count("push", n)
+
+        with phase("extend"):
+            # Keeps only the latest `capacity` transitions
+            start = max(n - self._capacity, 0)
+            i = self._next_idx
+            while start < n:
+                length = min(n - start, self._capacity - i)
+                for name, column in columns.items():
+                    values = torch.as_tensor(column[start : start + length])
+                    self.columns[name][i : i + length] = values.view(
+                        length, *self.shapes[name]
+                    )
+                start += length
+                i = (i + length) % self._capacity
+                self._size = min(self._size + length, self._capacity)
+            self._next_idx = i
+
+    def sample(self, batch_size: int) -> Batch:
+        if batch_size > self._size:
+            raise ValueError
+        with phase("gather"):
+            indices = torch.randint(
+                self._size,
+                (batch_size,),
+                generator=self._rng,
+                device=self._storage_device,
+            )
+            if self._directory is not None:
+                # Ascending indices read the memory-mapped files sequentially
+                indices = indices.sort().values
+            columns = (
+                column[indices].to(self._device, non_blocking=True)
+                for column in self.columns.values()
+            )
+            batch = Batch.from_columns(*columns)
+        setattr(batch, "indices", indices)
+        return batch
+
+    def __len__(self) -> int:
+        return self._size
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        See `deeprl.profiling.replay_memory_footprint`. The columns are counted whole,
+        as they are preallocated (or memory-mapped, in which case they are bytes on
+        disk rather than in memory).
+        """
+        footprint = {"total_bytes": 0}
+        for name, column in self.columns.items():
+            num_bytes = column.element_size() * column.nelement()
+            footprint[f"{name[:-1]}_bytes"] = num_bytes  # "states" -> "state"
+            footprint["total_bytes"] += num_bytes
+        footprint["num_tensors"] = len(self.columns)
+        footprint["num_experiences"] = len(self)
+        footprint["sum_tree_bytes"] = 0
+        return footprint
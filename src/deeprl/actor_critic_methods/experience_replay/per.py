@@ -4,6 +4,7 @@ import numpy as np
 from torch import Tensor
 
 from ..._data_structures import SumTree
+from ...profiling import count, phase
 from ._base import Batch, Experience, ExperienceReplay
 
 
@@ -15,6 +16,7 @@ class PER(ExperienceReplay):
         self._α = α
         self._ϵ = ϵ
         self._maximal_priority = ϵ
+        self._sweep_cursor = 0  # Next slot to refresh, see `sweep_batch`
 
     def push(
         self,
@@ -24,6 +26,7 @@ class PER(ExperienceReplay):
         next_observation: Tensor,
         terminated: Tensor,
     ) -> None:
+        count("push")
         self._buffer.store(
             Experience(observation, action, reward, next_observation, terminated),
             self._maximal_priority,
@@ -38,10 +41,29 @@ class PER(ExperienceReplay):
         setattr(batch, "indices", indices)
         return batch
 
+    def __len__(self) -> int:
+        return len(self._buffer)
+
     def update_priorities(self, batch: Batch) -> None:
         if not hasattr(batch, "indices") or not hasattr(batch, "priorities"):
             raise ValueError('Missing attribute "indices" or "priorities".')
-        for idx, priority in zip( getattr(batch, 'indices'), getattr(batch, 'priorities') ):  # fmt: skip
-            p = (priority + self._ϵ) ** self._α
-            self._buffer.update_priority(idx, p)
-            self._maximal_priority = max(self._maximal_priority, p)
+        with phase("sum_tree_update"):
+            # Priorities may come as a column of size (batch, 1)
+            p = (np.ravel(getattr(batch, "priorities")) + self._ϵ) ** self._α
+            self._buffer.update_priorities(np.asarray(getattr(batch, "indices")), p)
+            self._maximal_priority = max(self._maximal_priority, float(p.max()))
+
+    def sweep_batch(self, chunk_size: int) -> Batch:
+        """
+        The next `chunk_size` stored transitions in slot order, wrapping around, with
+        their indices, so that their priorities can be refreshed by `update_priorities`
+        """
+        size = len(self._buffer)
+        if size == 0:
+            raise ValueError
+        slots = (self._sweep_cursor + np.arange(min(chunk_size, size))) % size
+        self._sweep_cursor = int(slots[-1] + 1) % size
+        leaves = self._buffer._leaves
+        batch = Batch([leaves[slot] for slot in slots.tolist()])
+        setattr(batch, "indices", slots + self._buffer._bias)
+        return batch
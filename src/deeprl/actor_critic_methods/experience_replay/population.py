@@ -0,0 +1,78 @@
+import torch
+from torch import Tensor
+
+from ...profiling import count, phase
+from ._base import Batch, ExperienceReplay
+
+
+class PopulationUER(ExperienceReplay):
+    """
+    Uniformly sampled experience replays of a population of N members in one
+    columnar storage of size (N, capacity, ...)
+
+    Members interact with their environments in lockstep, hence a push stores one
+    transition per member, i.e. tensors of size (N, ...), and every replay holds as
+    many transitions. A sample draws `batch_size` indices per member, independently
+    and with replacement, which costs O(N * batch_size) whatever the capacity; the
+    batch gathers tensors of size (N, batch_size, ...).
+    """
+
+    def __init__(
+        self,
+        num_members: int,
+        capacity: int,
+        state_dim: int,
+        action_dim: int,
+        device: torch.device = torch.device("cpu"),
+    ) -> None:
+        N = num_members
+        self.states = torch.empty((N, capacity, state_dim), device=device)
+        self.actions = torch.empty((N, capacity, action_dim), device=device)
+        self.rewards = torch.empty((N, capacity, 1), device=device)
+        self.next_states = torch.empty((N, capacity, state_dim), device=device)
+        self.terminateds = torch.empty(
+            (N, capacity, 1), dtype=torch.bool, device=device
+        )
+
+        self._members = torch.arange(N, device=device)[:, None]
+        self._capacity = capacity
+        self._next_idx = 0
+        self._size = 0
+
+    def push(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        count("push")
+        i = self._next_idx
+        self.states[:, i] = state
+        self.actions[:, i] = action
+        self.rewards[:, i] = reward.view(-1, 1)
+        self.next_states[:, i] = next_state
+        self.terminateds[:, i] = terminated.view(-1, 1)
+        self._next_idx = (self._next_idx + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def sample(self, batch_size: int) -> Batch:
+        if batch_size > self._size:
+            raise ValueError
+        with phase("gather"):
+            indices = torch.randint(
+                self._size,
+                (len(self._members), batch_size),
+                device=self._members.device,
+            )
+            return Batch.from_columns(
+                self.states[self._members, indices],
+                self.actions[self._members, indices],
+                self.rewards[self._members, indices],
+                self.next_states[self._members, indices],
+                self.terminateds[self._members, indices],
+            )
+
+    def __len__(self) -> int:
+        return self._size
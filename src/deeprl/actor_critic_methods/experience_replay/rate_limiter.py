@@ -0,0 +1,172 @@
+import time
+from threading import Condition
+from typing import Any, Callable, Optional
+
+from attrs import define
+from torch import Tensor
+
+from ._base import Batch, ExperienceReplay
+
+
+@define
+class RateLimiterStats:
+    num_calls: int = 0
+    num_blocked: int = 0
+    blocked_time: float = 0.0  # seconds
+
+
+class RateLimiter(ExperienceReplay):
+    """
+    Samples-per-insert rate limiter
+
+    Keeps the number of sampled transitions per inserted transition close to
+    `samples_per_insert` by blocking whichever side (acting or learning) runs ahead.
+    A `sample(batch_size)` call counts as `batch_size` samples, e.g. one gradient
+    update per environment step is `samples_per_insert = batch_size`.
+    Sampling is refused until `min_size_to_sample` transitions have been inserted,
+    and the samples/inserts difference is allowed to drift by `error_buffer` around
+    `min_size_to_sample * samples_per_insert`. A batch and an insert must fit in that
+    window, i.e. `batch_size + samples_per_insert <= 2 * error_buffer`, otherwise both
+    sides would block each other; `sample` raises `RuntimeError` if not.
+
+    With `timeout=None` the faster side waits indefinitely (two threads or processes);
+    with a finite timeout a blocked `sample` raises `ValueError`, which makes the
+    algorithms skip the update, and a blocked `push` raises `TimeoutError`. `cancel`
+    fails blocked and blocking calls likewise, `push` raising `RuntimeError`.
+
+    All access to the wrapped experience replay is serialised, so a rate-limited
+    experience replay is also safe to share between an actor and a learner thread.
+
+    https://github.com/deepmind/reverb/blob/master/reverb/rate_limiters.py
+    """
+
+    def __init__(
+        self,
+        experience_replay: ExperienceReplay,
+        samples_per_insert: float,
+        min_size_to_sample: int,
+        error_buffer: float,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if samples_per_insert <= 0:
+            raise ValueError("samples_per_insert must be positive.")
+        if min_size_to_sample < 1:
+            raise ValueError("min_size_to_sample must be at least 1.")
+        if error_buffer < samples_per_insert:
+            raise ValueError(
+                "error_buffer must be at least samples_per_insert, otherwise neither side can proceed."
+            )
+
+        self._experience_replay = experience_replay
+        self._samples_per_insert = samples_per_insert
+        self._min_size_to_sample = min_size_to_sample
+        self._error_buffer = error_buffer
+        offset = min_size_to_sample * samples_per_insert
+        self._min_diff = offset - error_buffer
+        self._max_diff = offset + error_buffer
+        self._timeout = timeout
+
+        self._condition = Condition()
+        self._num_inserts = 0
+        self._num_samples = 0
+        self._cancelled = False
+
+        self.insert_stats = RateLimiterStats()
+        self.sample_stats = RateLimiterStats()
+
+    def push(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        with self._condition:
+            if not self._wait_for(self._can_insert, self.insert_stats):
+                if self._cancelled:
+                    raise RuntimeError(
+                        "Cancelled while waiting for the learner to catch up."
+                    )
+                raise TimeoutError("Timed out waiting for the learner to catch up.")
+            self._experience_replay.push(state, action, reward, next_state, terminated)
+            self._num_inserts += 1
+            self._condition.notify_all()
+
+    def sample(self, batch_size: int) -> Batch:
+        # `push` blocks while diff > max_diff - samples_per_insert and `sample` while
+        # diff < min_diff + batch_size, so some diff blocks both unless the window fits
+        # a batch and an insert. Not a ValueError, which the algorithms take for "not yet"
+        if batch_size + self._samples_per_insert > 2 * self._error_buffer:
+            raise RuntimeError(
+                f"batch_size ({batch_size}) + samples_per_insert ({self._samples_per_insert}) "
+                f"exceeds 2 * error_buffer ({2 * self._error_buffer}), so that both sides would block forever."
+            )
+        with self._condition:
+            if not self._wait_for(
+                lambda: self._can_sample(batch_size), self.sample_stats
+            ):
+                raise ValueError(
+                    "Timed out or cancelled waiting for the actor to catch up."
+                )
+            batch = self._experience_replay.sample(batch_size)
+            self._num_samples += batch_size
+            self._condition.notify_all()
+        return batch
+
+    def cancel(self) -> None:
+        """
+        Wakes up the blocked side and fails every wait until `resume`, e.g. to stop a
+        learner thread blocked in `sample` with `timeout=None`
+        """
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+    def resume(self) -> None:
+        with self._condition:
+            self._cancelled = False
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._experience_replay)  # type: ignore
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegates e.g. `PER.update_priorities` to the wrapped experience replay"""
+        if name == "_experience_replay":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
+        attr = getattr(self._experience_replay, name)
+        if not callable(attr):
+            return attr
+
+        def serialised(*args: Any, **kwargs: Any) -> Any:
+            with self._condition:
+                return attr(*args, **kwargs)
+
+        return serialised
+
+    def _can_insert(self) -> bool:
+        num_inserts = self._num_inserts + 1
+        if num_inserts <= self._min_size_to_sample:
+            return True
+        diff = num_inserts * self._samples_per_insert - self._num_samples
+        return diff <= self._max_diff
+
+    def _can_sample(self, batch_size: int) -> bool:
+        if self._num_inserts < self._min_size_to_sample:
+            return False
+        diff = self._num_inserts * self._samples_per_insert - self._num_samples
+        return diff - batch_size >= self._min_diff
+
+    def _wait_for(self, predicate: Callable[[], bool], stats: RateLimiterStats) -> bool:
+        """Must be called with the condition's lock held."""
+        stats.num_calls += 1
+        if predicate():
+            return True
+        if self._cancelled:
+            return False
+        stats.num_blocked += 1
+        start = time.perf_counter()
+        self._condition.wait_for(lambda: self._cancelled or predicate(), self._timeout)
+        stats.blocked_time += time.perf_counter() - start
+        return not self._cancelled and predicate()
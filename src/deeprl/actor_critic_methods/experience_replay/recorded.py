@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING, Any
+
+from torch import Tensor
+
+from ._base import Batch, ExperienceReplay
+
+if TYPE_CHECKING:
+    from ...recording import TrajectoryWriter
+
+
+class Recorded(ExperienceReplay):
+    """Records every pushed transition with a `TrajectoryWriter`, e.g. to train offline later"""
+
+    def __init__(
+        self, experience_replay: ExperienceReplay, writer: "TrajectoryWriter"
+    ) -> None:
+        self._experience_replay = experience_replay
+        self._writer = writer
+
+    def push(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        self._writer.append(state, action, reward, next_state, terminated)
+        self._experience_replay.push(state, action, reward, next_state, terminated)
+
+    def sample(self, batch_size: int) -> Batch:
+        return self._experience_replay.sample(batch_size)
+
+    def __len__(self) -> int:
+        return len(self._experience_replay)  # type: ignore
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegates e.g. `PER.update_priorities` to the wrapped experience replay"""
+        if name == "_experience_replay":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self._experience_replay, name)
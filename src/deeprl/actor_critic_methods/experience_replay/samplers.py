@@ -0,0 +1,97 @@
+"""
+Strategies by which `UER` draws the slots of a batch from its ring buffer
+
+A sampler returns `batch_size` slot indices given the ring's state: its `size`
+(number of stored transitions), `next_idx` (the slot to be overwritten next, i.e.
+one past the newest transition) and `capacity`. Every strategy costs O(batch_size)
+whatever the size.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Sampler(ABC):
+    @abstractmethod
+    def __call__(
+        self,
+        rng: np.random.Generator,
+        size: int,
+        next_idx: int,
+        capacity: int,
+        batch_size: int,
+    ) -> np.ndarray:
+        ...
+
+
+class WithReplacement(Sampler):
+    """Uniform, independently per draw: a transition may appear more than once in a batch"""
+
+    def __call__(
+        self,
+        rng: np.random.Generator,
+        size: int,
+        next_idx: int,
+        capacity: int,
+        batch_size: int,
+    ) -> np.ndarray:
+        return rng.integers(size, size=batch_size)
+
+
+class WithoutReplacement(Sampler):
+    """
+    Uniform over subsets of `batch_size` distinct transitions
+
+    `Generator.choice` without replacement runs Floyd's algorithm, in O(batch_size),
+    once the population is large (https://doi.org/10.1145/30401.315746), whereas
+    the legacy `np.random.choice` permutes the whole population.
+    """
+
+    def __call__(
+        self,
+        rng: np.random.Generator,
+        size: int,
+        next_idx: int,
+        capacity: int,
+        batch_size: int,
+    ) -> np.ndarray:
+        return rng.choice(size, batch_size, replace=False)
+
+
+class ERE(Sampler):
+    """
+    Emphasising Recent Experience: uniform, with replacement, over the newest
+    c_k = max(size * η^(k * 1000 / K), c_min) transitions for the k-th of every K
+    updates, so that updates cycle from the whole buffer to its newest part
+    https://arxiv.org/abs/1906.04009
+
+    The paper resets k at the end of every episode, with K the episode's length;
+    here K is `updates_per_cycle`.
+    """
+
+    def __init__(
+        self,
+        η: float = 0.996,
+        c_min: int = 5000,
+        updates_per_cycle: int = 1000,
+    ) -> None:
+        self._η = η
+        self._c_min = c_min
+        self._updates_per_cycle = updates_per_cycle
+        self._k = 0
+
+    def __call__(
+        self,
+        rng: np.random.Generator,
+        size: int,
+        next_idx: int,
+        capacity: int,
+        batch_size: int,
+    ) -> np.ndarray:
+        c_k = int(size * self._η ** (self._k * 1000 / self._updates_per_cycle))
+        c_k = min(max(c_k, self._c_min), size)
+        self._k = (self._k + 1) % self._updates_per_cycle
+        # Ages: 0 is the newest transition
+        ages = rng.integers(c_k, size=batch_size)
+        return (next_idx - 1 - ages) % capacity
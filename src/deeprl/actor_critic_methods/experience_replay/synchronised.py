@@ -0,0 +1,47 @@
+from threading import Lock
+from typing import Any
+
+from torch import Tensor
+
+from ._base import Batch, ExperienceReplay
+
+
+class Synchronised(ExperienceReplay):
+    """Serialises `push`/`sample` so an actor and a learner thread can share the experience replay"""
+
+    def __init__(self, experience_replay: ExperienceReplay) -> None:
+        self._experience_replay = experience_replay
+        self._lock = Lock()
+
+    def push(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        with self._lock:
+            self._experience_replay.push(state, action, reward, next_state, terminated)
+
+    def sample(self, batch_size: int) -> Batch:
+        with self._lock:
+            return self._experience_replay.sample(batch_size)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._experience_replay)  # type: ignore
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegates e.g. `PER.update_priorities` to the wrapped experience replay"""
+        if name == "_experience_replay":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
+        attr = getattr(self._experience_replay, name)
+        if not callable(attr):
+            return attr
+
+        def serialised(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                return attr(*args, **kwargs)
+
+        return serialised
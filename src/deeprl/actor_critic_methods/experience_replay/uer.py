@@ -1,8 +1,12 @@
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+
 import numpy as np
 from torch import Tensor
 
 from ..._data_structures import RotatingList
+from ...profiling import count
 from ._base import Batch, Experience, ExperienceReplay
+from .samplers import Sampler, WithoutReplacement
 
 
 class UER(ExperienceReplay):
@@ -13,11 +17,15 @@ class UER(ExperienceReplay):
     probability of being chosen for the sample as any
     other subset of k individuals.
     https://en.wikipedia.org/wiki/Simple_random_sample
+
+    The `sampler` (see `.samplers`) may instead draw with replacement or emphasise
+    recent experience.
     """
 
-    def __init__(self, capacity: int) -> None:
+    def __init__(self, capacity: int, sampler: Optional[Sampler] = None) -> None:
         self._buffer = RotatingList[Experience](capacity)
         self._rng = np.random.default_rng()
+        self._sampler = sampler if sampler is not None else WithoutReplacement()
 
     def push(
         self,
@@ -27,6 +35,7 @@ class UER(ExperienceReplay):
         next_observation: Tensor,
         terminated: Tensor,
     ) -> None:
+        count("push")
         self._buffer.store(
             Experience(observation, action, reward, next_observation, terminated)
         )
@@ -37,6 +46,16 @@ class UER(ExperienceReplay):
         https://stackoverflow.com/a/62951059/20015297
         https://www.pythondoeswhat.com/2015/07/collectionsdeque-random-access-is-on.html
         """
-        indices = self._rng.choice(len(self._buffer), batch_size, replace=False)
-        experiences = [self._buffer[index] for index in indices]
-        return Batch(experiences)
+        buffer = self._buffer
+        if batch_size > len(buffer):
+            raise ValueError
+        indices = self._sampler(
+            self._rng, len(buffer), buffer._next_idx, buffer._capacity, batch_size
+        )
+        experiences = [buffer[index] for index in indices.tolist()]
+        batch = Batch(experiences)
+        setattr(batch, "indices", indices)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._buffer)
@@ -1,7 +1,8 @@
-from ._base import ActionCritic, DeterministicActor, StochasticActor
+from ._base import ActionCritic, DeterministicActor, StateCritic, StochasticActor
 
 __all__ = (
     ActionCritic.__name__,
     DeterministicActor.__name__,
     StochasticActor.__name__,
+    StateCritic.__name__,
 )
@@ -21,3 +21,9 @@ class ActionCritic(nn.Module, ABC):
     @abstractmethod
     def forward(self, state: Tensor, action: Tensor) -> Tensor:
         ...
+
+
+class StateCritic(nn.Module, ABC):
+    @abstractmethod
+    def forward(self, state: Tensor) -> Tensor:
+        ...
@@ -0,0 +1,93 @@
+# from collections.abc import Sequence
+# TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+from typing import Sequence
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import Tensor
+
+
+class Encoder(nn.Module):
+    """
+    Convolutional encoder of pixel observations of size (channels, height, width),
+    e.g. stacked frames, into features of size `feature_dim`
+
+    Observations may be uint8 frames in [0, 255]; they are scaled to [0, 1].
+    The architecture is that of SAC-AE and DrQ:
+    - https://arxiv.org/abs/1910.01741
+    - https://arxiv.org/abs/2004.13649
+    """
+
+    def __init__(
+        self,
+        observation_shape: Sequence[int],
+        feature_dim: int = 50,
+        num_filters: int = 32,
+        num_layers: int = 4,
+    ) -> None:
+        super(Encoder, self).__init__()
+
+        channels = observation_shape[0]
+        self._convs = nn.ModuleList(
+            [nn.Conv2d(channels, num_filters, 3, stride=2)]
+            + [
+                nn.Conv2d(num_filters, num_filters, 3, stride=1)
+                for _ in range(num_layers - 1)
+            ]
+        )
+        with torch.no_grad():
+            conv_dim = self._conv(torch.zeros(1, *observation_shape)).shape[1]
+        self._fc = nn.Linear(conv_dim, feature_dim)
+        self._norm = nn.LayerNorm(feature_dim)
+        self.feature_dim = feature_dim
+        self.apply(_init_weights)
+
+    def _conv(self, observation: Tensor) -> Tensor:
+        actv = observation.float() / 255
+        for conv in self._convs:
+            actv = F.relu(conv(actv))
+        return actv.flatten(start_dim=1)
+
+    def forward(self, observation: Tensor) -> Tensor:
+        return torch.tanh(self._norm(self._fc(self._conv(observation))))
+
+
+def random_shift(observations: Tensor, padding: int = 4) -> Tensor:
+    """
+    Shifts every observation of a batch of size (batch, channels, height, width) by
+    its own random integer offset of up to `padding` pixels in each direction,
+    replicating edge pixels, in a single `grid_sample` over the whole batch
+
+    https://arxiv.org/abs/2107.09645
+    """
+    n, _, h, w = observations.shape
+    padded = F.pad(observations.float(), (padding,) * 4, mode="replicate")
+    # Normalised coordinates of the top-left (unshifted) window's pixel centres
+    ys = _centres(h, padding, observations.device)
+    xs = _centres(w, padding, observations.device)
+    # (h, w, 2) of (x, y)
+    base_grid = torch.stack(torch.meshgrid(xs, ys, indexing="xy"), dim=-1)
+    shift = torch.randint(0, 2 * padding + 1, (n, 1, 1, 2), device=observations.device)
+    scale = torch.tensor(
+        [2 / (w + 2 * padding), 2 / (h + 2 * padding)], device=observations.device
+    )
+    grid = base_grid.unsqueeze(0) + shift * scale
+    return F.grid_sample(
+        padded, grid, mode="nearest", padding_mode="zeros", align_corners=False
+    )
+
+
+def _centres(size: int, padding: int, device: torch.device) -> Tensor:
+    padded_size = size + 2 * padding
+    eps = 1 / padded_size
+    return torch.linspace(-1 + eps, 1 - eps, padded_size, device=device)[:size]
+
+
+@torch.no_grad()
+def _init_weights(m: nn.Module) -> None:
+    if isinstance(m, nn.Linear):
+        nn.init.xavier_uniform_(m.weight)
+    elif isinstance(m, nn.Conv2d):
+        nn.init.orthogonal_(m.weight, nn.init.calculate_gain("relu"))
+        nn.init.zeros_(m.bias)
@@ -0,0 +1,85 @@
+from os import PathLike
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Callable,
+    Dict,
+    List,
+)
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import Tensor
+
+from ...inference.runtime import MAX_QUANTISED_INPUTS
+from .mlp import GaussianPolicy, Policy
+
+_ACTIVATION_NAMES: Dict[Callable[[Tensor], Tensor], str] = {
+    F.relu: "relu",
+    torch.relu: "relu",
+    torch.tanh: "tanh",
+    torch.sigmoid: "sigmoid",
+}
+
+
+def _activation_name(fn: Callable[[Tensor], Tensor]) -> str:
+    try:
+        return _ACTIVATION_NAMES[fn]
+    except (KeyError, TypeError):
+        raise ValueError(f"{fn} is not supported by the NumPy runtime.") from None
+
+
+def _quantise(weight: np.ndarray) -> Dict[str, np.ndarray]:
+    """Symmetric, per-output-channel int8 quantisation"""
+    scale = np.abs(weight).max(axis=1) / 127
+    scale[scale == 0] = 1
+    quantised = np.clip(np.rint(weight / scale[:, None]), -127, 127).astype(np.int8)
+    return {"weight": quantised, "scale": scale.astype(np.float32)}
+
+
+@torch.no_grad()
+def export_policy(
+    policy: Union[Policy, GaussianPolicy],
+    path: Union[str, "PathLike[str]"],
+    quantise: bool = False,
+) -> None:
+    """
+    Writes the policy to a single .npz file readable by `deeprl.inference.NumpyPolicy`
+
+    A Gaussian policy is exported as its deterministic counterpart, tanh(mean).
+    With `quantise`, the weights of every `nn.Linear` are stored as int8 and the
+    runtime quantises activations dynamically; every layer must then take at most
+    `MAX_QUANTISED_INPUTS` (1040) inputs, see `NumpyPolicy`.
+    """
+    lyrs: List[nn.Linear]
+    if isinstance(policy, GaussianPolicy):
+        lyrs = [*policy._lyrs, policy._mean_lyr]  # type: ignore
+        output_activation = "tanh"
+    elif isinstance(policy, Policy):
+        lyrs = list(policy._lyrs)  # type: ignore
+        output_activation = _activation_name(policy._out_fn)
+    else:
+        raise TypeError(f"Cannot export {type(policy).__name__}.")
+    if quantise and any(lyr.in_features > MAX_QUANTISED_INPUTS for lyr in lyrs):
+        raise ValueError(
+            f"Quantised layers take at most {MAX_QUANTISED_INPUTS} inputs."
+        )
+
+    arrays: Dict[str, np.ndarray] = {
+        "num_layers": np.array(len(lyrs)),
+        "activation": np.array(_activation_name(policy._actv_fn)),
+        "output_activation": np.array(output_activation),
+    }
+    for i, lyr in enumerate(lyrs):
+        weight = lyr.weight.detach().cpu().numpy().astype(np.float32)
+        if quantise:
+            quantised = _quantise(weight)
+            arrays[f"weight_{i}"] = quantised["weight"]
+            arrays[f"scale_{i}"] = quantised["scale"]
+        else:
+            arrays[f"weight_{i}"] = weight
+        arrays[f"bias_{i}"] = lyr.bias.detach().cpu().numpy().astype(np.float32)
+
+    with open(path, "wb") as f:  # np.savez would append ".npz" to a str path
+        np.savez(f, **arrays)
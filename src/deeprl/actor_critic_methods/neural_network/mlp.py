@@ -8,7 +8,7 @@ import torch.nn.functional as F
 from torch import Tensor
 from torch.distributions import Distribution, Normal
 
-from ._base import ActionCritic, DeterministicActor, StochasticActor
+from ._base import ActionCritic, DeterministicActor, StateCritic, StochasticActor
 
 
 class GaussianPolicy(StochasticActor):
@@ -136,6 +136,31 @@ class ActionValue(ActionCritic):
         return action_value
 
 
+class StateValue(StateCritic):
+    def __init__(
+        self,
+        state_dim: int,
+        hidden_dims: Iterable[int],
+        activation_fn: Callable[[Tensor], Tensor] = F.relu,
+    ) -> None:
+        super(StateValue, self).__init__()
+
+        dims = [state_dim] + list(hidden_dims) + [1]
+        self._lyrs = nn.ModuleList(
+            [ nn.Linear(in_dim, out_dim) for in_dim, out_dim in zip(dims, dims[1:]) ])  # fmt: skip
+        self.apply(_init_weights)
+
+        self._actv_fn = activation_fn
+
+    def forward(self, state: Tensor) -> Tensor:
+        actv = state
+        for lyr in self._lyrs[:-1]:
+            actv = self._actv_fn(lyr(actv))
+        state_value = self._lyrs[-1](actv)
+
+        return state_value
+
+
 @torch.no_grad()
 def _init_weights(m: nn.Module) -> None:
     if isinstance(m, nn.Linear):
@@ -1,42 +1,228 @@
+import math
 from abc import ABC, abstractmethod
-from itertools import count
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+    Tuple,
+)
 
-import numpy as np
 import torch
 from torch import Size, Tensor
 
 
 class ActionNoise(ABC):
-    """Random process for action exploration"""
+    """
+    Random process for action exploration
+
+    With vectorised environments `size` is (num_envs, action_dim) and every environment
+    gets its own realisation (and state, for processes that have one).
+    """
 
     @abstractmethod
     def __call__(self, size: Size, device: torch.device) -> Tensor:
         ...
 
+    def reset(self, mask: Optional[Tensor] = None) -> None:
+        """
+        Restarts the process for the environments whose episode has ended
+
+        `mask` is a boolean tensor of size (num_envs,); None restarts every environment.
+        """
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        ...
+
+
+class _BlockNoise(ActionNoise):
+    """Draws `block_size` steps of noise ahead, so a step is a slice rather than an RNG kernel"""
+
+    def __init__(self, block_size: int) -> None:
+        self.block_size = block_size
+        self._block: Optional[Tensor] = None  # (block_size, *size)
+        self._key: Optional[Tuple[Size, torch.device]] = None
+        self._cursor = 0
+        self._time = 0  # number of steps drawn so far
+
+    @abstractmethod
+    def _generate(self, size: Size, device: torch.device) -> Tensor:
+        """Returns the noise of the next `block_size` steps"""
+
+    def _next(self, size: Size, device: torch.device) -> Tensor:
+        key = (Size(size), device)
+        if self._block is None or key != self._key or self._cursor == self.block_size:
+            if key != self._key:
+                self._key = key
+                self._on_new_size(Size(size), device)
+            self._block = self._generate(Size(size), device)
+            self._cursor = 0
+        noise = self._block[self._cursor]
+        self._cursor += 1
+        self._time += 1
+        return noise
+
+    def _on_new_size(self, size: Size, device: torch.device) -> None:
+        """Hook for (re)allocating per-environment state"""
 
-class Gaussian(ActionNoise):
-    """https://en.wikipedia.org/wiki/Additive_white_Gaussian_noise"""
+    def state_dict(self) -> Dict[str, Any]:
+        # Pre-drawn noise is not saved; a fresh block is drawn after loading
+        return {"time": self._time}
 
-    def __init__(self, stddev: float, decay_constant: float = 0) -> None:
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._time = state_dict["time"]
+        self._block = None
+
+
+class Gaussian(_BlockNoise):
+    """
+    https://en.wikipedia.org/wiki/Additive_white_Gaussian_noise
+
+    The standard deviation decays as stddev * exp(-decay_constant * t), t counting
+    calls; the schedule is evaluated for a whole block at once.
+    """
+
+    def __init__(
+        self, stddev: float, decay_constant: float = 0, block_size: int = 1000
+    ) -> None:
+        super(Gaussian, self).__init__(block_size)
         self.stddev = stddev
         self.decay_constant = decay_constant
-        self._time = count(start=0, step=1)
 
     def __call__(self, size: Size, device: torch.device) -> Tensor:
-        self.stddev = self.stddev * np.exp(-self.decay_constant * next(self._time))
-        return self.stddev * torch.randn(size, device=device)
+        return self._next(size, device)
 
+    def _generate(self, size: Size, device: torch.device) -> Tensor:
+        block = torch.randn((self.block_size, *size), device=device)
+        if self.decay_constant:
+            time = torch.arange(self._time, self._time + self.block_size, device=device)
+            schedule = self.stddev * torch.exp(-self.decay_constant * time)
+            return block.mul_(schedule.view(-1, *[1] * len(size)))
+        return block.mul_(self.stddev)
 
-class OrnsteinUhlenbeck(ActionNoise):
+
+class OrnsteinUhlenbeck(_BlockNoise):
     """
     It stabilises zero-mean Gaussian Noise.
     It helps agent explore better in an inertial system.
     Don't abuse Ornstein-Uhlenbeck Process. It has too much hyperparameters and over fine-tuning make no sense.
+
+    Euler–Maruyama discretisation: x ← x + θ(μ - x)dt + σ√dt 𝒩(0, 1)
+    https://en.wikipedia.org/wiki/Ornstein%E2%80%93Uhlenbeck_process
     """
 
-    def __init__(self) -> None:
-        raise NotImplementedError
+    def __init__(
+        self,
+        stddev: float,
+        theta: float = 0.15,
+        mean: float = 0.0,
+        dt: float = 1e-2,
+        block_size: int = 1000,
+    ) -> None:
+        super(OrnsteinUhlenbeck, self).__init__(block_size)
+        self.stddev = stddev
+        self.theta = theta
+        self.mean = mean
+        self.dt = dt
+        self._state: Optional[Tensor] = None
 
     def __call__(self, size: Size, device: torch.device) -> Tensor:
         """Output noise generated by Ornstein-Uhlenbeck Process"""
-        raise NotImplementedError
+        diffusion = self._next(size, device)
+        assert self._state is not None
+        self._state.mul_(1 - self.theta * self.dt).add_(diffusion)
+        return self._state.clone()
+
+    def reset(self, mask: Optional[Tensor] = None) -> None:
+        if self._state is None:
+            return
+        if mask is None or self._state.dim() < 2:
+            self._state.fill_(self.mean)
+        else:
+            self._state[mask] = self.mean
+
+    def state_dict(self) -> Dict[str, Any]:
+        state = self._state.clone() if self._state is not None else None
+        return {**super(OrnsteinUhlenbeck, self).state_dict(), "state": state}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        super(OrnsteinUhlenbeck, self).load_state_dict(state_dict)
+        state = state_dict["state"]
+        # A copy, since the state is updated in place by every step
+        self._state = state.clone() if state is not None else None
+        if self._state is not None:
+            self._key = (self._state.size(), self._state.device)
+
+    def _on_new_size(self, size: Size, device: torch.device) -> None:
+        self._state = torch.full(size, self.mean, device=device)
+
+    def _generate(self, size: Size, device: torch.device) -> Tensor:
+        # The drift towards the mean, θμdt, is folded into the pre-drawn increments
+        block = torch.randn((self.block_size, *size), device=device)
+        return block.mul_(self.stddev * math.sqrt(self.dt)).add_(
+            self.theta * self.mean * self.dt
+        )
+
+
+class Colored(_BlockNoise):
+    """
+    Temporally correlated Gaussian noise whose power spectral density is ∝ 1/f^β
+
+    β = 0 is white noise, β = 1 pink noise and β = 2 red (Brownian) noise.
+    Each environment gets a unit-variance sequence of `block_size` steps generated by
+    the Fourier method; a sequence is redrawn when its environment is reset, so
+    `block_size` should be at least the episode length.
+    https://openreview.net/forum?id=hQ9V5QN27eS
+    https://github.com/felixpatzelt/colorednoise
+    """
+
+    def __init__(self, stddev: float, exponent: float, block_size: int = 1000) -> None:
+        super(Colored, self).__init__(block_size)
+        self.stddev = stddev
+        self.exponent = exponent
+
+    def __call__(self, size: Size, device: torch.device) -> Tensor:
+        return self._next(size, device)
+
+    def reset(self, mask: Optional[Tensor] = None) -> None:
+        if self._block is None or self._key is None:
+            return
+        size, device = self._key
+        remaining = self.block_size - self._cursor
+        if mask is None or len(size) < 2:
+            self._block[self._cursor :] = self._generate(size, device)[:remaining]
+        else:
+            num_resets = int(mask.sum())
+            sequences = self._generate(Size((num_resets, *size[1:])), device)
+            self._block[self._cursor :, mask] = sequences[:remaining]
+
+    def _generate(self, size: Size, device: torch.device) -> Tensor:
+        T = self.block_size
+        frequencies = torch.fft.rfftfreq(T, device=device)
+        frequencies[0] = 1 / T  # low-frequency cutoff
+        scales = frequencies.pow(-self.exponent / 2)
+        # Normalises the sequences to unit variance
+        weights = scales[1:].clone()
+        weights[-1] *= (1 + T % 2) / 2
+        sigma = 2 * weights.square().sum().sqrt() / T
+
+        real = torch.randn((*size, len(frequencies)), device=device) * scales
+        imaginary = torch.randn((*size, len(frequencies)), device=device) * scales
+        # The DC (and, for even T, Nyquist) components of a real signal are real
+        imaginary[..., 0] = 0
+        real[..., 0] *= math.sqrt(2)
+        if T % 2 == 0:
+            imaginary[..., -1] = 0
+            real[..., -1] *= math.sqrt(2)
+        sequences = torch.fft.irfft(torch.complex(real, imaginary), n=T) / sigma
+        # (*size, T) -> (T, *size)
+        return sequences.movedim(-1, 0).mul_(self.stddev).contiguous()
+
+
+class Pink(Colored):
+    """https://openreview.net/forum?id=hQ9V5QN27eS"""
+
+    def __init__(self, stddev: float, block_size: int = 1000) -> None:
+        super(Pink, self).__init__(stddev, 1.0, block_size)
@@ -1,4 +1,9 @@
 from copy import deepcopy
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+)
 
 import torch
 import torch.nn as nn
@@ -9,29 +14,99 @@ from ..neural_network import DeterministicActor
 
 
 class AdaptiveParameterNoise:
+    """
+    https://arxiv.org/abs/1706.01905
+
+    The perturbed policy is a persistent copy of the policy. Its weights are refreshed
+    in place (copy then add Gaussian noise) from the current policy every
+    `perturbation_interval` actions, or, when `perturbation_interval` is None, at the
+    first action after `reset`, i.e. once per episode, so that the perturbation is
+    consistent over an episode.
+
+    The noise scale is adapted every `adaptation_interval` updates by comparing the
+    actions of the policy and of a second copy, freshly perturbed from the current
+    policy with the current scale, on a batch of states from the experience replay.
+    """
+
     def __init__(
-        self, stddev: float, desired_stddev: float, adoption_coefficient: float
+        self,
+        stddev: float,
+        desired_stddev: float,
+        adoption_coefficient: float,
+        perturbation_interval: Optional[int] = None,
+        adaptation_interval: int = 50,
     ) -> None:
         self.stddev = stddev
         self.desired_stddev = desired_stddev
         self.adoption_coefficient = adoption_coefficient
+        self.perturbation_interval = perturbation_interval
+        self.adaptation_interval = adaptation_interval
+
+        self._perturbed_policy: Optional[DeterministicActor] = None
+        self._adaptation_policy: Optional[DeterministicActor] = None
+        self._is_stale = True
+        self._num_actions = 0
+        self._num_adaptation_calls = 0
+
+    def reset(self) -> None:
+        """Refreshes the perturbed policy at the next action, e.g. after an episode"""
+        self._is_stale = True
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "stddev": self.stddev,
+            "num_actions": self._num_actions,
+            "num_adaptation_calls": self._num_adaptation_calls,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self.stddev = state_dict["stddev"]
+        self._num_actions = state_dict["num_actions"]
+        self._num_adaptation_calls = state_dict["num_adaptation_calls"]
+        self._is_stale = True
 
     @torch.no_grad()
     def perturb(self, policy: DeterministicActor) -> DeterministicActor:
-        perturbed_policy = deepcopy(policy)
-        perturbed_policy.requires_grad_(False)
+        if self._perturbed_policy is None:
+            self._perturbed_policy = self._copy(policy)
+        if self.perturbation_interval is not None:
+            self._is_stale |= self._num_actions % self.perturbation_interval == 0
+        if self._is_stale:
+            self._refresh(self._perturbed_policy, policy)
+            self._is_stale = False
+        self._num_actions += 1
+        return self._perturbed_policy
+
+    @staticmethod
+    def _copy(policy: DeterministicActor) -> DeterministicActor:
+        copy = deepcopy(policy)
+        copy.requires_grad_(False)
+        return copy
+
+    @torch.no_grad()
+    def _refresh(
+        self, perturbed_policy: DeterministicActor, policy: DeterministicActor
+    ) -> None:
+        for θ_perturbed, θ in zip(perturbed_policy.parameters(), policy.parameters()):
+            θ_perturbed.copy_(θ)
         perturbed_policy.apply(self._add_gaussian_noise_to_weights)
-        return perturbed_policy
 
     @torch.no_grad()
     def _add_gaussian_noise_to_weights(self, m: nn.Module) -> None:
         if hasattr(m, "weight"):
-            m.weight.add_(  # FIXME: Type
-                torch.randn(m.weight.size(), device=m.weight.device) * self.stddev  # type: ignore
-            )
+            m.weight.add_(torch.randn_like(m.weight), alpha=self.stddev)  # type: ignore
 
     @torch.no_grad()
-    def adapt(self, action: Tensor, perturbed_action: Tensor) -> None:
+    def adapt(self, policy: DeterministicActor, states: Tensor) -> None:
+        """Meant to be called after every update of the policy"""
+        self._num_adaptation_calls += 1
+        if self._num_adaptation_calls % self.adaptation_interval != 0:
+            return
+        if self._adaptation_policy is None:
+            self._adaptation_policy = self._copy(policy)
+        self._refresh(self._adaptation_policy, policy)
+        action = policy(states)
+        perturbed_action = self._adaptation_policy(states)
         stddev = comp(torch.sqrt, torch.mean, torch.square)(action - perturbed_action)
         # TODO: Avaliable since version 3.10. See PEP 634
         # match stddev:
@@ -0,0 +1,239 @@
+import math
+from copy import deepcopy
+from functools import partial
+
+# from collections.abc import Callable, Iterator, Sequence
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Sequence,
+    Tuple,
+)
+
+import torch
+import torch.nn.functional as F
+from cytoolz import comp
+from cytoolz.curried import map, reduce
+from torch import Tensor, add, min
+from torch.distributions import Distribution
+from torch.nn.parameter import Parameter
+from torch.optim import Optimizer
+
+from ..profiling import phase
+from .experience_replay import ExperienceReplay
+from .neural_network import ActionCritic, StochasticActor
+from .neural_network.cnn import Encoder, random_shift
+
+
+def _squashed_sample(𝜇: Distribution) -> Tuple[Tensor, Tensor]:
+    """Reparameterised tanh-squashed sample and its log-likelihood, as in `SAC`"""
+    u = 𝜇.rsample()
+    log𝜋 = 𝜇.log_prob(u) - 2 * (math.log(2) - u - F.softplus(-2 * u))
+    return torch.tanh(u), log𝜋.sum(dim=1, keepdim=True)
+
+
+class PixelSAC:
+    """
+    Soft Actor-Critic from pixel observations, with image augmentation (DrQ)
+    https://arxiv.org/abs/2004.13649
+
+    The policy and the critics are heads on the features of one convolutional
+    encoder, trained by the critics' loss only (the policy sees detached features).
+    Every batch is encoded once: the states by the encoder, for all the critics and
+    the policy, and the next states by the target encoder, for the target policy
+    action and all the target critics. The states and next states of a batch are
+    randomly shifted together, in one vectorised op.
+
+    Observations are of size (channels, height, width), e.g. stacked uint8 frames,
+    which the experience replay may store as such (see `ColumnarUER`'s
+    `state_dtype`).
+    """
+
+    def __init__(
+        self,
+        device: torch.device,
+        observation_shape: Sequence[int],
+        action_dim: int,
+        encoder: Callable[[Sequence[int]], Encoder],
+        policy: Callable[[int, int], StochasticActor],
+        critic: Callable[[int, int], ActionCritic],
+        policy_optimiser: Callable[[Iterator[Parameter]], Optimizer],
+        # Also optimises the encoder
+        critic_optimiser: Callable[[Iterator[Parameter]], Optimizer],
+        temperature_optimiser: Callable[[Iterable[Tensor]], Optimizer],
+        experience_replay: ExperienceReplay,
+        batch_size: int,
+        discount_factor: float,
+        target_smoothing_factor: float,  # Exponential smoothing
+        # Defaults to target_smoothing_factor
+        encoder_smoothing_factor: Optional[float] = None,
+        augmentation_padding: int = 4,  # Pixels of random shift; 0 disables augmentation
+        num_critics: int = 2,
+    ) -> None:
+
+        self._encoder = encoder(observation_shape).to(device)
+        self._target_encoder = deepcopy(self._encoder).requires_grad_(False)
+        feature_dim = self._encoder.feature_dim
+
+        self._policy = policy(feature_dim, action_dim).to(device)
+        self._critics = [
+            deepcopy(critic(feature_dim, action_dim).to(device))
+            for _ in range(num_critics)
+        ]
+        self._target_critics = deepcopy(self._critics)
+        # Freeze target critics with respect to optimisers (only update via Polyak averaging)
+        [net.requires_grad_(False) for net in self._target_critics]
+
+        self._policy_optimiser = policy_optimiser(self._policy.parameters())
+        self._critic_optimisers = [
+            critic_optimiser(critic.parameters()) for critic in self._critics
+        ]
+        # The encoder is shared by the critics, hence stepped once per update by an optimiser of its own
+        self._encoder_optimiser = critic_optimiser(self._encoder.parameters())
+
+        self._experience_replay = experience_replay
+        self._batch_size = batch_size
+
+        self._discount_factor = discount_factor
+        self._target_smoothing_factor = target_smoothing_factor
+        self._encoder_smoothing_factor = (
+            encoder_smoothing_factor
+            if encoder_smoothing_factor is not None
+            else target_smoothing_factor
+        )
+        self._augmentation_padding = augmentation_padding
+
+        self._log_temperature = torch.zeros(1, requires_grad=True, device=device)
+        self._temperature_optimiser = temperature_optimiser([self._log_temperature])
+        self._target_entropy = -action_dim
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        self._experience_replay.push(state, action, reward, next_state, terminated)
+        self._update_parameters()
+
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
+
+        try:
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
+        except ValueError:
+            return False
+
+        with phase("augment"):
+            observations = torch.cat([batch.states, batch.next_states])
+            if self._augmentation_padding > 0:
+                observations = random_shift(observations, self._augmentation_padding)
+            observations, next_observations = observations.chunk(2)
+
+        # Abbreviating to mathematical italic unicode char for readability
+        𝘢 = batch.actions
+        𝑟 = batch.rewards
+        𝑑 = batch.terminateds
+        𝛾 = self._discount_factor
+        𝑄_ = self._critics
+        𝑄ʼ_ = self._target_critics
+        𝜏 = self._target_smoothing_factor
+        log𝛼 = self._log_temperature
+        𝛼 = log𝛼.exp().detach()
+        𝓗 = self._target_entropy
+
+        with phase("encode"):
+            # Features, shared by every critic and the policy
+            𝑠 = self._encoder(observations)
+            with torch.no_grad():
+                𝑠ʼ = self._target_encoder(next_observations)
+
+        with phase("target"), torch.no_grad():
+            𝘢ʼ, log𝜋ʼ = _squashed_sample(self._policy(𝑠ʼ))
+            # Computes learning target
+            𝑦 = 𝑟 + ~𝑑 * 𝛾 * (min(*[𝑄ʼ(𝑠ʼ, 𝘢ʼ) for 𝑄ʼ in 𝑄ʼ_]) - 𝛼 * log𝜋ʼ)
+
+        with phase("critic_backward"):
+            action_values = [𝑄(𝑠, 𝘢) for 𝑄 in 𝑄_]
+            critic_loss_fn = comp(reduce(add), map(partial(F.mse_loss, target=𝑦)))
+            critic_loss: Tensor = critic_loss_fn(action_values)
+            [critic_optimiser.zero_grad() for critic_optimiser in self._critic_optimisers]  # type: ignore
+            self._encoder_optimiser.zero_grad()
+            critic_loss.backward()
+            [critic_optimiser.step() for critic_optimiser in self._critic_optimisers]
+            self._encoder_optimiser.step()
+
+        with phase("policy_backward"):
+            𝑠 = 𝑠.detach()  # The encoder learns from the critics only
+            ã, log𝜋 = _squashed_sample(self._policy(𝑠))
+            policy_loss = (𝛼 * log𝜋 - min(*[𝑄(𝑠, ã) for 𝑄 in 𝑄_])).mean()
+            self._policy_optimiser.zero_grad()
+            policy_loss.backward()
+            self._policy_optimiser.step()
+
+        with phase("temperature_backward"):
+            temperature_loss = (-log𝛼 * (log𝜋.detach() + 𝓗)).mean()
+            self._temperature_optimiser.zero_grad()
+            temperature_loss.backward()
+            self._temperature_optimiser.step()
+
+        # Update frozen target networks by Polyak averaging (exponential smoothing)
+        with phase("polyak"), torch.no_grad():
+            for 𝑄, 𝑄ʼ in zip(𝑄_, 𝑄ʼ_):
+                for 𝜃, 𝜃ʼ in zip(𝑄.parameters(), 𝑄ʼ.parameters()):
+                    𝜃ʼ.lerp_(𝜃, 𝜏)
+            for 𝜃, 𝜃ʼ in zip(
+                self._encoder.parameters(), self._target_encoder.parameters()
+            ):
+                𝜃ʼ.lerp_(𝜃, self._encoder_smoothing_factor)
+
+        return True
+
+    @torch.no_grad()
+    def compute_action(self, state: Tensor) -> Tensor:
+        """Action for one observation of size (channels, height, width)"""
+        features = self._encoder(state.unsqueeze(0))
+        return torch.tanh(self._policy(features).rsample()).squeeze(0)
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "encoder": self._encoder.state_dict(),
+            "target_encoder": self._target_encoder.state_dict(),
+            "policy": self._policy.state_dict(),
+            "critics": [critic.state_dict() for critic in self._critics],
+            "target_critics": [critic.state_dict() for critic in self._target_critics],
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimisers": [
+                optimiser.state_dict() for optimiser in self._critic_optimisers
+            ],
+            "encoder_optimiser": self._encoder_optimiser.state_dict(),
+            "log_temperature": self._log_temperature.detach(),
+            "temperature_optimiser": self._temperature_optimiser.state_dict(),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._encoder.load_state_dict(state_dict["encoder"])
+        self._target_encoder.load_state_dict(state_dict["target_encoder"])
+        self._policy.load_state_dict(state_dict["policy"])
+        for critic, critic_state in zip(self._critics, state_dict["critics"]):
+            critic.load_state_dict(critic_state)
+        for critic, critic_state in zip(
+            self._target_critics, state_dict["target_critics"]
+        ):
+            critic.load_state_dict(critic_state)
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        for optimiser, optimiser_state in zip(
+            self._critic_optimisers, state_dict["critic_optimisers"]
+        ):
+            optimiser.load_state_dict(optimiser_state)
+        self._encoder_optimiser.load_state_dict(state_dict["encoder_optimiser"])
+        with torch.no_grad():
+            self._log_temperature.copy_(state_dict["log_temperature"])
+        self._temperature_optimiser.load_state_dict(state_dict["temperature_optimiser"])
@@ -0,0 +1,516 @@
+"""
+Populations of independent TD3/SAC agents trained in one process
+
+The N members' networks are stacked along a leading member dimension with
+`torch.func.stack_module_state` and evaluated with `vmap` over `functional_call`,
+so that a whole population takes one vectorised update step (requires torch>=2.0).
+Every member learns from its own replay (see `PopulationUER`) with its own
+hyperparameters: learning rates, discount factor and target smoothing factor may
+be given per member.
+
+Members' losses are summed; as members share no parameter, every member receives
+the gradient of its own loss. Learning rates per member rule out `torch.optim`,
+whose learning rates are per parameter tensor, hence members are optimised by
+`StackedAdam`.
+"""
+
+import math
+from copy import deepcopy
+
+# from collections.abc import Callable, Sequence
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+)
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import Tensor
+from torch.distributions import Normal
+from torch.func import functional_call, stack_module_state, vmap
+
+from ..profiling import phase
+from .experience_replay import ExperienceReplay
+from .neural_network import ActionCritic, DeterministicActor, StochasticActor
+from .noise_injection.action_space import ActionNoise
+
+PerMember = Union[float, Sequence[float]]
+
+
+def _per_member(value: PerMember, num_members: int, device: torch.device) -> Tensor:
+    values = torch.as_tensor(value, dtype=torch.float32, device=device)
+    if values.dim() == 0:
+        values = values.expand(num_members)
+    if values.shape != (num_members,):
+        raise ValueError(
+            f"Expected a scalar or {num_members} values, got {tuple(values.shape)}."
+        )
+    return values.clone()
+
+
+def _broadcastable(values: Tensor, like: Tensor) -> Tensor:
+    """Values of size (N,) viewed as (N, 1, ...) to broadcast against `like`"""
+    return values.view(-1, *[1] * (like.dim() - 1))
+
+
+class Ensemble:
+    """
+    Members of one architecture with stacked parameters, each of size (N, ...)
+
+    Calls take inputs of size (N, batch, ...) and return outputs of size
+    (N, batch, ...). A module returning a `Normal` distribution returns its
+    location and scale.
+    """
+
+    def __init__(self, modules: Sequence[nn.Module]) -> None:
+        params, buffers = stack_module_state(list(modules))  # type: ignore[arg-type]
+        self.params: Dict[str, Tensor] = {**params, **buffers}
+        self._base = deepcopy(modules[0]).to("meta")
+        self._vmapped = vmap(self._call)
+
+    def _call(self, params: Dict[str, Tensor], *args: Tensor) -> Any:
+        output = functional_call(self._base, params, args)
+        if isinstance(output, Normal):
+            return output.loc, output.scale
+        return output
+
+    def __call__(self, *args: Tensor) -> Any:
+        return self._vmapped(self.params, *args)
+
+    def parameters(self) -> List[Tensor]:
+        return list(self.params.values())
+
+    def frozen_copy(self) -> "Ensemble":
+        """A copy excluded from autograd, e.g. a target network"""
+        ensemble = deepcopy(self)
+        ensemble.params = {
+            name: param.detach().clone() for name, param in self.params.items()
+        }
+        return ensemble
+
+    @torch.no_grad()
+    def lerp_(self, source: "Ensemble", weight: Tensor) -> None:
+        """Polyak averaging towards `source` with a smoothing factor of size (N,) per member"""
+        for name, param in self.params.items():
+            param.lerp_(source.params[name], _broadcastable(weight, param))
+
+    def state_dict(self) -> Dict[str, Tensor]:
+        return dict(self.params)
+
+    @torch.no_grad()
+    def load_state_dict(self, state_dict: Dict[str, Tensor]) -> None:
+        for name, param in self.params.items():
+            param.copy_(state_dict[name])
+
+
+class StackedAdam:
+    """
+    Adam (https://arxiv.org/abs/1412.6980) over parameters stacked along a leading
+    member dimension, with a learning rate per member
+
+    Moments are elementwise, hence every member's state is its own slice; the
+    update of every member is that of `torch.optim.Adam` with its learning rate.
+    """
+
+    def __init__(
+        self,
+        params: Sequence[Tensor],
+        lr: Tensor,
+        betas: Tuple[float, float] = (0.9, 0.999),
+        eps: float = 1e-8,
+    ) -> None:
+        self.params = list(params)
+        self.lr = lr
+        self.betas = betas
+        self.eps = eps
+        self._step = 0
+        self._exp_avgs = [torch.zeros_like(param) for param in self.params]
+        self._exp_avg_sqs = [torch.zeros_like(param) for param in self.params]
+
+    def zero_grad(self) -> None:
+        for param in self.params:
+            param.grad = None
+
+    @torch.no_grad()
+    def step(self) -> None:
+        β1, β2 = self.betas
+        self._step += 1
+        bias_correction1 = 1 - β1**self._step
+        bias_correction2_sqrt = math.sqrt(1 - β2**self._step)
+        for param, exp_avg, exp_avg_sq in zip(
+            self.params, self._exp_avgs, self._exp_avg_sqs
+        ):
+            if param.grad is None:
+                continue
+            grad = param.grad
+            exp_avg.lerp_(grad, 1 - β1)
+            exp_avg_sq.mul_(β2).addcmul_(grad, grad, value=1 - β2)
+            denom = (exp_avg_sq.sqrt() / bias_correction2_sqrt).add_(self.eps)
+            step_size = _broadcastable(self.lr, param) / bias_correction1
+            param.sub_(step_size * exp_avg / denom)
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "lr": self.lr,
+            "step": self._step,
+            "exp_avgs": self._exp_avgs,
+            "exp_avg_sqs": self._exp_avg_sqs,
+        }
+
+    @torch.no_grad()
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self.lr.copy_(state_dict["lr"])
+        self._step = state_dict["step"]
+        for exp_avg, saved in zip(self._exp_avgs, state_dict["exp_avgs"]):
+            exp_avg.copy_(saved)
+        for exp_avg_sq, saved in zip(self._exp_avg_sqs, state_dict["exp_avg_sqs"]):
+            exp_avg_sq.copy_(saved)
+
+
+def _sum_of_means(losses: Tensor) -> Tensor:
+    """Sum over members of every member's mean loss, from a tensor of size (N, batch, ...)"""
+    return losses.flatten(1).mean(dim=1).sum()
+
+
+class PopulationTD3:
+    """
+    Twin-Delayed DDPG for N independent members in lockstep
+
+    `compute_action` and `step` take tensors of size (N, ...), one row per member.
+    """
+
+    def __init__(
+        self,
+        device: torch.device,
+        num_members: int,
+        state_dim: int,
+        action_dim: int,
+        policy: Callable[[int, int], DeterministicActor],
+        critic: Callable[[int, int], ActionCritic],
+        policy_lr: PerMember,
+        critic_lr: PerMember,
+        experience_replay: ExperienceReplay,
+        batch_size: int,
+        discount_factor: PerMember,
+        target_smoothing_factor: PerMember,
+        policy_noise: Union[ActionNoise, None],
+        smoothing_noise_stddev: float,
+        smoothing_noise_clip: float,  # Norm length to clip target policy smoothing noise
+        num_critics: int = 2,
+        policy_delay: int = 2,
+    ) -> None:
+
+        N = num_members
+        self._policy = Ensemble(
+            [policy(state_dim, action_dim).to(device) for _ in range(N)]
+        )
+        self._critics = [
+            Ensemble([critic(state_dim, action_dim).to(device) for _ in range(N)])
+            for _ in range(num_critics)
+        ]
+        # Frozen target networks (only updated via Polyak averaging)
+        self._target_policy = self._policy.frozen_copy()
+        self._target_critics = [critic.frozen_copy() for critic in self._critics]
+
+        self._policy_optimiser = StackedAdam(
+            self._policy.parameters(), _per_member(policy_lr, N, device)
+        )
+        self._critic_optimiser = StackedAdam(
+            [param for critic in self._critics for param in critic.parameters()],
+            _per_member(critic_lr, N, device),
+        )
+
+        self._experience_replay = experience_replay
+        self._batch_size = batch_size
+
+        self._discount_factor = _per_member(discount_factor, N, device)
+        self._target_smoothing_factor = _per_member(target_smoothing_factor, N, device)
+        self._policy_noise = policy_noise
+        self._smoothing_noise_clip = smoothing_noise_clip
+        self._smoothing_noise_stddev = smoothing_noise_stddev
+        self._policy_delay = policy_delay
+        self._num_critic_updates = 0
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+        truncated: Optional[Tensor] = None,
+    ) -> None:
+        self._experience_replay.push(state, action, reward, next_state, terminated)
+        done = terminated if truncated is None else terminated | truncated
+        if done.any():
+            self.reset_noise(done.view(-1))
+        self._update_parameters()
+
+    def reset_noise(self, mask: Optional[Tensor] = None) -> None:
+        """Restarts the noise of the members in `mask`, by default all of them"""
+        if self._policy_noise is not None:
+            self._policy_noise.reset(mask)
+
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
+
+        try:
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
+        except ValueError:
+            return False
+
+        # Abbreviating to mathematical italic unicode char for readability
+        𝑠 = batch.states
+        𝘢 = batch.actions
+        𝑟 = batch.rewards
+        𝑠ʼ = batch.next_states
+        𝑑 = batch.terminateds
+        𝛾 = _broadcastable(self._discount_factor, 𝑟)
+        𝜎 = self._smoothing_noise_stddev
+        𝑐 = self._smoothing_noise_clip
+        𝜇 = self._policy
+        𝜇ʼ = self._target_policy
+        𝑄_ = self._critics
+        𝑄ʼ_ = self._target_critics
+        𝜏 = self._target_smoothing_factor
+
+        with phase("target"), torch.no_grad():
+            # Target policy smoothing: add clipped noise to the target action
+            𝘢ʼ: Tensor = 𝜇ʼ(𝑠ʼ)
+            ã = 𝘢ʼ + 𝘢ʼ.clone().normal_(0, 𝜎).clamp_(-𝑐, 𝑐)
+            # Clipped to lie in valid action range FIXME: hard-code range
+            ã.clamp_(-1, 1)
+
+            # Clipped double-Q learning
+            𝑦 = 𝑟 + ~𝑑 * 𝛾 * torch.stack([𝑄ʼ(𝑠ʼ, ã) for 𝑄ʼ in 𝑄ʼ_]).min(dim=0).values
+
+        with phase("critic_backward"):
+            critic_loss = sum(
+                _sum_of_means(F.mse_loss(𝑄(𝑠, 𝘢), 𝑦, reduction="none")) for 𝑄 in 𝑄_
+            )
+            self._critic_optimiser.zero_grad()
+            critic_loss.backward()  # type: ignore[union-attr]
+            self._critic_optimiser.step()
+
+        # "Delayed" policy updates
+        is_policy_update = self._num_critic_updates % self._policy_delay == 0
+        self._num_critic_updates += 1
+        if is_policy_update:
+
+            with phase("policy_backward"):
+                policy_loss = -_sum_of_means(𝑄_[0](𝑠, 𝜇(𝑠)))
+                self._policy_optimiser.zero_grad()
+                policy_loss.backward()
+                self._policy_optimiser.step()
+
+            # Update frozen target networks by Polyak averaging (exponential smoothing)
+            with phase("polyak"):
+                for 𝑄, 𝑄ʼ in zip(𝑄_, 𝑄ʼ_):
+                    𝑄ʼ.lerp_(𝑄, 𝜏)
+                𝜇ʼ.lerp_(𝜇, 𝜏)
+
+        return True
+
+    @torch.no_grad()
+    def compute_action(self, state: Tensor) -> Tensor:
+        """Actions of size (N, ...) for states of size (N, ...)"""
+        action: Tensor = self._policy(state.unsqueeze(1)).squeeze(1)
+        if isinstance(self._policy_noise, ActionNoise):
+            action += self._policy_noise(action.size(), action.device)
+            action.clamp_(-1, 1)  # FIXME: hard-code action range
+        return action
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self._policy.state_dict(),
+            "critics": [critic.state_dict() for critic in self._critics],
+            "target_policy": self._target_policy.state_dict(),
+            "target_critics": [critic.state_dict() for critic in self._target_critics],
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimiser": self._critic_optimiser.state_dict(),
+            "num_critic_updates": self._num_critic_updates,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._policy.load_state_dict(state_dict["policy"])
+        for critic, critic_state in zip(self._critics, state_dict["critics"]):
+            critic.load_state_dict(critic_state)
+        self._target_policy.load_state_dict(state_dict["target_policy"])
+        for critic, critic_state in zip(
+            self._target_critics, state_dict["target_critics"]
+        ):
+            critic.load_state_dict(critic_state)
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        self._critic_optimiser.load_state_dict(state_dict["critic_optimiser"])
+        self._num_critic_updates = state_dict["num_critic_updates"]
+
+
+def _squashed_sample(loc: Tensor, scale: Tensor) -> Tuple[Tensor, Tensor]:
+    """Reparameterised tanh-squashed Gaussian sample and its log-likelihood, as in `SAC`"""
+    𝜇 = Normal(loc, scale)
+    u = 𝜇.rsample()
+    log𝜋 = 𝜇.log_prob(u) - 2 * (math.log(2) - u - F.softplus(-2 * u))
+    return torch.tanh(u), log𝜋.sum(dim=-1, keepdim=True)
+
+
+class PopulationSAC:
+    """
+    Soft Actor-Critic for N independent members in lockstep
+
+    `compute_action` and `step` take tensors of size (N, ...), one row per member.
+    """
+
+    def __init__(
+        self,
+        device: torch.device,
+        num_members: int,
+        state_dim: int,
+        action_dim: int,
+        policy: Callable[[int, int], StochasticActor],
+        critic: Callable[[int, int], ActionCritic],
+        policy_lr: PerMember,
+        critic_lr: PerMember,
+        temperature_lr: PerMember,
+        experience_replay: ExperienceReplay,
+        batch_size: int,
+        discount_factor: PerMember,
+        target_smoothing_factor: PerMember,  # Exponential smoothing
+        num_critics: int = 2,
+    ) -> None:
+
+        N = num_members
+        self._policy = Ensemble(
+            [policy(state_dim, action_dim).to(device) for _ in range(N)]
+        )
+        self._critics = [
+            Ensemble([critic(state_dim, action_dim).to(device) for _ in range(N)])
+            for _ in range(num_critics)
+        ]
+        self._target_critics = [critic.frozen_copy() for critic in self._critics]
+
+        self._policy_optimiser = StackedAdam(
+            self._policy.parameters(), _per_member(policy_lr, N, device)
+        )
+        self._critic_optimiser = StackedAdam(
+            [param for critic in self._critics for param in critic.parameters()],
+            _per_member(critic_lr, N, device),
+        )
+
+        self._experience_replay = experience_replay
+        self._batch_size = batch_size
+
+        self._discount_factor = _per_member(discount_factor, N, device)
+        self._target_smoothing_factor = _per_member(target_smoothing_factor, N, device)
+
+        self._log_temperature = torch.zeros(N, requires_grad=True, device=device)
+        self._temperature_optimiser = StackedAdam(
+            [self._log_temperature], _per_member(temperature_lr, N, device)
+        )
+        self._target_entropy = -action_dim
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        self._experience_replay.push(state, action, reward, next_state, terminated)
+        self._update_parameters()
+
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
+
+        try:
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
+        except ValueError:
+            return False
+
+        # Abbreviating to mathematical italic unicode char for readability
+        𝑠 = batch.states
+        𝘢 = batch.actions
+        𝑟 = batch.rewards
+        𝑠ʼ = batch.next_states
+        𝑑 = batch.terminateds
+        𝛾 = _broadcastable(self._discount_factor, 𝑟)
+        𝑄_ = self._critics
+        𝑄ʼ_ = self._target_critics
+        𝜏 = self._target_smoothing_factor
+        log𝛼 = _broadcastable(self._log_temperature, 𝑟)
+        𝛼 = log𝛼.exp().detach()
+        𝓗 = self._target_entropy
+
+        with phase("target"), torch.no_grad():
+            𝘢ʼ, log𝜋ʼ = _squashed_sample(*self._policy(𝑠ʼ))
+            𝑄ʼ_min = torch.stack([𝑄ʼ(𝑠ʼ, 𝘢ʼ) for 𝑄ʼ in 𝑄ʼ_]).min(dim=0).values
+            𝑦 = 𝑟 + ~𝑑 * 𝛾 * (𝑄ʼ_min - 𝛼 * log𝜋ʼ)  # computes learning target
+
+        with phase("critic_backward"):
+            critic_loss = sum(
+                _sum_of_means(F.mse_loss(𝑄(𝑠, 𝘢), 𝑦, reduction="none")) for 𝑄 in 𝑄_
+            )
+            self._critic_optimiser.zero_grad()
+            critic_loss.backward()  # type: ignore[union-attr]
+            self._critic_optimiser.step()
+
+        with phase("policy_backward"):
+            ã, log𝜋 = _squashed_sample(*self._policy(𝑠))
+            𝑄_min = torch.stack([𝑄(𝑠, ã) for 𝑄 in 𝑄_]).min(dim=0).values
+            policy_loss = _sum_of_means(𝛼 * log𝜋 - 𝑄_min)
+            self._policy_optimiser.zero_grad()
+            policy_loss.backward()
+            self._policy_optimiser.step()
+
+        with phase("temperature_backward"):
+            temperature_loss = _sum_of_means(-log𝛼 * (log𝜋.detach() + 𝓗))
+            self._temperature_optimiser.zero_grad()
+            temperature_loss.backward()
+            self._temperature_optimiser.step()
+
+        # Update frozen target critics by Polyak averaging (exponential smoothing)
+        with phase("polyak"):
+            for 𝑄, 𝑄ʼ in zip(𝑄_, 𝑄ʼ_):
+                𝑄ʼ.lerp_(𝑄, 𝜏)
+
+        return True
+
+    @torch.no_grad()
+    def compute_action(self, state: Tensor) -> Tensor:
+        """Actions of size (N, ...) for states of size (N, ...)"""
+        loc, scale = self._policy(state.unsqueeze(1))
+        return torch.tanh(Normal(loc, scale).sample()).squeeze(1)
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self._policy.state_dict(),
+            "critics": [critic.state_dict() for critic in self._critics],
+            "target_critics": [critic.state_dict() for critic in self._target_critics],
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimiser": self._critic_optimiser.state_dict(),
+            "log_temperature": self._log_temperature.detach(),
+            "temperature_optimiser": self._temperature_optimiser.state_dict(),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._policy.load_state_dict(state_dict["policy"])
+        for critic, critic_state in zip(self._critics, state_dict["critics"]):
+            critic.load_state_dict(critic_state)
+        for critic, critic_state in zip(
+            self._target_critics, state_dict["target_critics"]
+        ):
+            critic.load_state_dict(critic_state)
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        self._critic_optimiser.load_state_dict(state_dict["critic_optimiser"])
+        with torch.no_grad():
+            self._log_temperature.copy_(state_dict["log_temperature"])
+        self._temperature_optimiser.load_state_dict(state_dict["temperature_optimiser"])
@@ -1,3 +1,264 @@
+# from collections.abc import Callable, Iterator
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+)
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import Tensor
+from torch.distributions import Distribution
+from torch.nn.parameter import Parameter
+from torch.optim import Optimizer
+
+from ..profiling import phase
+from .neural_network import StateCritic, StochasticActor
+
+
+class RolloutBuffer:
+    """
+    Preallocated on-policy storage of size (rollout_length, num_envs, ...)
+
+    Actions are stored before tanh squashing: the squashing correction of the
+    log-likelihood cancels out in the probability ratio of PPO.
+    """
+
+    def __init__(
+        self,
+        rollout_length: int,
+        num_envs: int,
+        state_dim: int,
+        action_dim: int,
+        device: torch.device,
+    ) -> None:
+        T, N = rollout_length, num_envs
+        self.states = torch.empty((T, N, state_dim), device=device)
+        self.unsquashed_actions = torch.empty((T, N, action_dim), device=device)
+        self.log_probs = torch.empty((T, N), device=device)
+        self.values = torch.empty((T, N), device=device)
+        self.rewards = torch.empty((T, N), device=device)
+        self.next_states = torch.empty((T, N, state_dim), device=device)
+        self.terminateds = torch.empty((T, N), dtype=torch.bool, device=device)
+        self.truncateds = torch.zeros((T, N), dtype=torch.bool, device=device)
+
+        self._rollout_length = rollout_length
+        self._num_envs = num_envs
+        self._step = 0
+
+    def push(
+        self,
+        state: Tensor,
+        unsquashed_action: Tensor,
+        log_prob: Tensor,
+        value: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+        truncated: Optional[Tensor],
+    ) -> None:
+        t, N = self._step, self._num_envs
+        self.states[t] = state.view(N, -1)
+        self.unsquashed_actions[t] = unsquashed_action.view(N, -1)
+        self.log_probs[t] = log_prob.view(N)
+        self.values[t] = value.view(N)
+        self.rewards[t] = reward.view(N)
+        self.next_states[t] = next_state.view(N, -1)
+        self.terminateds[t] = terminated.view(N)
+        self.truncateds[t] = truncated.view(N) if truncated is not None else False
+        self._step += 1
+
+    def is_full(self) -> bool:
+        return self._step == self._rollout_length
+
+    def clear(self) -> None:
+        self._step = 0
+
+
 class PPO:
-    def __init__(self) -> None:
-        raise NotImplementedError("Proximal Policy Optimization")
+    """
+    Proximal Policy Optimization with the clipped surrogate objective
+    https://arxiv.org/abs/1707.06347
+
+    Transitions from `num_envs` vectorised environments are collected into a
+    `RolloutBuffer` for `rollout_length` steps; then advantages are estimated by GAE
+    in one reverse scan over time and the networks are trained for `num_epochs`
+    epochs of shuffled minibatches.
+    """
+
+    def __init__(
+        self,
+        device: torch.device,
+        state_dim: int,
+        action_dim: int,
+        num_envs: int,
+        policy: Callable[[int, int], StochasticActor],
+        critic: Callable[[int], StateCritic],
+        policy_optimiser: Callable[[Iterator[Parameter]], Optimizer],
+        critic_optimiser: Callable[[Iterator[Parameter]], Optimizer],
+        rollout_length: int,
+        num_epochs: int,
+        minibatch_size: int,
+        discount_factor: float,
+        gae_lambda: float,
+        clip_range: float,
+        entropy_coefficient: float = 0.0,
+        max_grad_norm: Optional[float] = 0.5,
+    ) -> None:
+
+        self._policy = policy(state_dim, action_dim).to(device)
+        self._critic = critic(state_dim).to(device)
+
+        self._policy_optimiser = policy_optimiser(self._policy.parameters())
+        self._critic_optimiser = critic_optimiser(self._critic.parameters())
+
+        self._rollout_buffer = RolloutBuffer(
+            rollout_length, num_envs, state_dim, action_dim, device
+        )
+        self._num_epochs = num_epochs
+        self._minibatch_size = minibatch_size
+
+        self._discount_factor = discount_factor
+        self._gae_lambda = gae_lambda
+        self._clip_range = clip_range
+        self._entropy_coefficient = entropy_coefficient
+        self._max_grad_norm = max_grad_norm
+
+        # Byproducts of the latest `compute_action`, stored by the following `step`
+        self._unsquashed_action: Optional[Tensor] = None
+        self._log_prob: Optional[Tensor] = None
+        self._value: Optional[Tensor] = None
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+        truncated: Optional[Tensor] = None,
+    ) -> None:
+        """`action` must be the output of the latest `compute_action(state)`"""
+        if (
+            self._unsquashed_action is None
+            or self._log_prob is None
+            or self._value is None
+        ):
+            raise RuntimeError("PPO.step must follow PPO.compute_action.")
+        self._rollout_buffer.push(
+            state,
+            self._unsquashed_action,
+            self._log_prob,
+            self._value,
+            reward,
+            next_state,
+            terminated,
+            truncated,
+        )
+        self._unsquashed_action = self._log_prob = self._value = None
+        if self._rollout_buffer.is_full():
+            self._update_parameters()
+            self._rollout_buffer.clear()
+
+    @torch.no_grad()
+    def _estimate_advantages(self) -> Tensor:
+        """Generalised advantage estimation https://arxiv.org/abs/1506.02438"""
+        buffer = self._rollout_buffer
+        T, N = buffer.rewards.shape
+        𝛾 = self._discount_factor
+        𝜆 = self._gae_lambda
+
+        # Bootstraps from every next state in one forward pass, which also handles truncation
+        next_values = self._critic(buffer.next_states.flatten(0, 1)).view(T, N)
+        𝛿 = buffer.rewards + ~buffer.terminateds * 𝛾 * next_values - buffer.values
+        # Traces are cut at the end of every episode, be it terminated or truncated
+        continues = ~(buffer.terminateds | buffer.truncateds) * (𝛾 * 𝜆)
+
+        advantages = torch.empty_like(𝛿)
+        advantage = torch.zeros(N, device=𝛿.device)
+        for t in reversed(range(T)):
+            advantage = 𝛿[t] + continues[t] * advantage
+            advantages[t] = advantage
+        return advantages
+
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
+
+        buffer = self._rollout_buffer
+        with phase("gae"):
+            advantages = self._estimate_advantages().flatten()
+        returns = advantages + buffer.values.flatten()
+        states = buffer.states.flatten(0, 1)
+        unsquashed_actions = buffer.unsquashed_actions.flatten(0, 1)
+        old_log_probs = buffer.log_probs.flatten()
+        𝜖 = self._clip_range
+
+        num_samples = len(advantages)
+        for _ in range(self._num_epochs):
+            permutation = torch.randperm(num_samples, device=advantages.device)
+            for start in range(0, num_samples, self._minibatch_size):
+                indices = permutation[start : start + self._minibatch_size]
+                𝑠 = states[indices]
+                u = unsquashed_actions[indices]
+                Â = advantages[indices]
+                if len(Â) > 1:  # The standard deviation of a single advantage is NaN
+                    Â = (Â - Â.mean()) / (Â.std() + 1e-8)
+
+                with phase("policy_backward"):
+                    𝜋: Distribution = self._policy(𝑠)
+                    log𝜋 = 𝜋.log_prob(u).sum(dim=-1)
+                    ratio = torch.exp(log𝜋 - old_log_probs[indices])
+                    surrogate = torch.min(ratio * Â, ratio.clamp(1 - 𝜖, 1 + 𝜖) * Â)
+                    entropy = 𝜋.entropy().sum(dim=-1)
+                    policy_loss = -(
+                        surrogate + self._entropy_coefficient * entropy
+                    ).mean()
+                    self._policy_optimiser.zero_grad()
+                    policy_loss.backward()
+                    if self._max_grad_norm is not None:
+                        nn.utils.clip_grad_norm_(
+                            self._policy.parameters(), self._max_grad_norm
+                        )
+                    self._policy_optimiser.step()
+
+                with phase("critic_backward"):
+                    critic_loss = F.mse_loss(
+                        self._critic(𝑠).squeeze(-1), returns[indices]
+                    )
+                    self._critic_optimiser.zero_grad()
+                    critic_loss.backward()
+                    if self._max_grad_norm is not None:
+                        nn.utils.clip_grad_norm_(
+                            self._critic.parameters(), self._max_grad_norm
+                        )
+                    self._critic_optimiser.step()
+
+        return True
+
+    @torch.no_grad()
+    def compute_action(self, state: Tensor) -> Tensor:
+        𝜋: Distribution = self._policy(state)
+        u = 𝜋.sample()
+        self._unsquashed_action = u
+        self._log_prob = 𝜋.log_prob(u).sum(dim=-1)
+        self._value = self._critic(state)
+        return torch.tanh(u)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """The partially filled rollout buffer is not included"""
+        return {
+            "policy": self._policy.state_dict(),
+            "critic": self._critic.state_dict(),
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimiser": self._critic_optimiser.state_dict(),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._policy.load_state_dict(state_dict["policy"])
+        self._critic.load_state_dict(state_dict["critic"])
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        self._critic_optimiser.load_state_dict(state_dict["critic_optimiser"])
+        self._rollout_buffer.clear()
@@ -0,0 +1,92 @@
+import time
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Any
+
+import torch
+from torch import Tensor
+
+from ..profiling import count, phase
+from .ddpg import DDPG
+from .sac import SAC
+from .td3 import TD3
+
+
+class PrioritySweep:
+    """
+    Refreshes the priorities of a `PER` by sweeping over it
+
+    `PER` only updates the priority of a transition when it happens to be sampled, so
+    that most of a large buffer carries stale TD errors. After every update of the
+    agent, its TD errors are recomputed with the current networks for the next
+    `chunk_size` stored transitions, in slot order and wrapping around, and written
+    back with one batched sum-tree update. Sweeping takes about `time_fraction` of
+    the time spent on updates, amortised: a chunk is swept whenever the time budget,
+    accrued by every update, is positive.
+
+    The sweep runs between updates on the learner's own thread, so the networks and
+    the sum tree are never read while being written.
+
+    Usage:
+        agent = PrioritySweep(TD3(..., experience_replay=PER(...), ...), chunk_size=4096)
+        action = agent.compute_action(state)
+        agent.step(state, action, reward, next_state, terminated)
+    """
+
+    def __init__(
+        self,
+        agent: Union[DDPG, TD3, SAC],
+        chunk_size: int = 4096,
+        time_fraction: float = 0.1,
+    ) -> None:
+        if not hasattr(agent._experience_replay, "sweep_batch"):
+            raise ValueError("The experience replay must support sweeping, e.g. PER.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        if time_fraction < 0:
+            raise ValueError("time_fraction must be non-negative.")
+
+        self._agent = agent
+        self._chunk_size = chunk_size
+        self._time_fraction = time_fraction
+        self._budget = 0.0  # seconds
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        self._agent._experience_replay.push(
+            state, action, reward, next_state, terminated
+        )
+        self._update_parameters()
+
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
+        start = time.perf_counter()
+        if not self._agent._update_parameters():
+            return False
+        self._budget += (time.perf_counter() - start) * self._time_fraction
+        while self._budget > 0:
+            start = time.perf_counter()
+            self._sweep()
+            self._budget -= time.perf_counter() - start
+        return True
+
+    @torch.no_grad()
+    def _sweep(self) -> None:
+        experience_replay = self._agent._experience_replay
+        with phase("priority_sweep"):
+            batch = experience_replay.sweep_batch(self._chunk_size)
+            priorities = torch.abs(self._agent._td_errors(batch)).cpu().numpy()
+            setattr(batch, "priorities", priorities)
+            experience_replay.update_priorities(batch)
+        count("swept_transitions", len(priorities))
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegates e.g. `compute_action` and `state_dict` to the wrapped agent"""
+        if name == "_agent":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self._agent, name)
@@ -4,7 +4,9 @@ from functools import partial
 
 # from collections.abc import Callable, Iterator
 from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
     Callable,
+    Dict,
     Iterable,
     Iterator,
 )
@@ -18,7 +20,8 @@ from torch.distributions import Distribution
 from torch.nn.parameter import Parameter
 from torch.optim import Optimizer
 
-from .experience_replay import ExperienceReplay
+from ..profiling import phase
+from .experience_replay import Batch, ExperienceReplay
 from .neural_network import ActionCritic, StochasticActor
 
 
@@ -43,6 +46,8 @@ class SAC:
     ) -> None:
 
         self._policy = policy(state_dim, action_dim).to(device)
+        # Policy that interacts with the environment; AsyncLearner swaps in a snapshot of the policy
+        self._behaviour_policy = self._policy
         self._critics = [
             deepcopy(critic(state_dim, action_dim).to(device))
             for _ in range(num_critics)
@@ -61,6 +66,13 @@ class SAC:
 
         self._discount_factor = discount_factor
         self._target_smoothing_factor = target_smoothing_factor
+        self._num_target_updates = 0  # Version of the target critics, see `TargetCache`
+        # A TargetCache, possibly wrapped, is looked up once rather than at every update
+        self._targets: Callable[[Batch], Tensor] = self._uncached_targets
+        if hasattr(experience_replay, "lookup_targets"):
+            from .experience_replay.target_cache import cached_targets
+
+            self._targets = partial(self._cached_targets, cached_targets)
 
         # Using log value of temperature in temperature loss are generally nicer TODO: Why?
         # https://github.com/toshikwa/soft-actor-critic.pytorch/issues/2
@@ -82,21 +94,24 @@ class SAC:
         self._experience_replay.push(state, action, reward, next_state, terminated)
         self._update_parameters()
 
-    def _update_parameters(self) -> None:
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
 
         try:
-            batch = self._experience_replay.sample(self._batch_size)
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
         except ValueError:
-            return
+            return False
+        self._learn(batch)
+        return True
+
+    def _learn(self, batch: Batch) -> None:
+        """One update from a sampled batch, which `DataParallel` samples itself"""
         # fmt: off
 
         # Abbreviating to mathematical italic unicode char for readability
         𝑠 = batch.states
         𝘢 = batch.actions
-        𝑟 = batch.rewards
-        𝑠ʼ = batch.next_states
-        𝑑 = batch.terminateds
-        𝛾 = self._discount_factor
         𝑄_ = self._critics
         𝑄ʼ_ = self._target_critics
         𝜏 = self._target_smoothing_factor
@@ -108,13 +123,68 @@ class SAC:
         𝜋 denotes the tanh squashed 𝜇
         """
 
+        with phase("target"):
+            𝑦 = self._targets(batch)
+
+        with phase("critic_backward"):
+            action_values = [𝑄(𝑠, 𝘢) for 𝑄 in 𝑄_]
+            critic_loss_fn = comp(reduce(add), map(partial(F.mse_loss, target=𝑦)))
+            critic_loss: Tensor = critic_loss_fn(action_values)
+            [critic_optimiser.zero_grad() for critic_optimiser in self._critic_optimisers]  # type: ignore
+            critic_loss.backward()
+            [critic_optimiser.step() for critic_optimiser in self._critic_optimisers]
+
+        with phase("policy_backward"):
+            # Compute action and its log-likelihood
+            𝜇: Distribution = self._policy(𝑠)
+            u = 𝜇.rsample()
+            # 𝐄𝐧𝐟𝐨𝐫𝐜𝐢𝐧𝐠 𝐀𝐜𝐭𝐢𝐨𝐧 𝐁𝐨𝐮𝐧𝐝𝐬
+            ã = torch.tanh(u)  # denotes the action sampled fresh from the policy (whereas 𝘢 denotes the action comes from the experience replay)
+            log𝜇 = 𝜇.log_prob(u)
+            log𝜋: Tensor = log𝜇 - 2 * (math.log(2) - u - F.softplus(-2 * u))
+            log𝜋 = log𝜋.sum(dim=1, keepdim=True)
+            # fmt: on
+
+            policy_loss = (𝛼 * logπ - min(*[𝑄(𝑠, ã) for 𝑄 in 𝑄_])).mean()
+            self._policy_optimiser.zero_grad()
+            policy_loss.backward()
+            self._policy_optimiser.step()
+
+        with phase("temperature_backward"):
+            temperature_loss = (-log𝛼 * (log𝜋.detach() + 𝓗)).mean()
+            self._temperature_optimiser.zero_grad()
+            temperature_loss.backward()
+            self._temperature_optimiser.step()
+
+        # Update frozen target critics by Polyak averaging (exponential smoothing)
+        with phase("polyak"), torch.no_grad():
+            for 𝑄, 𝑄ʼ in zip(𝑄_, 𝑄ʼ_):
+                for 𝜃, 𝜃ʼ in zip(𝑄.parameters(), 𝑄ʼ.parameters()):
+                    𝜃ʼ.mul_(1.0 - 𝜏)
+                    𝜃ʼ.add_(𝜏 * 𝜃)
+        self._num_target_updates += 1
+
+    def _uncached_targets(self, batch: Batch) -> Tensor:
+        return self._td_targets(batch.rewards, batch.next_states, batch.terminateds)
+
+    def _cached_targets(self, lookup: Callable[..., Tensor], batch: Batch) -> Tensor:
+        """Targets reused from a `TargetCache` by `lookup`, i.e. `cached_targets`"""
+        version = self._num_target_updates
+        return lookup(self._experience_replay, batch, version, self._td_targets)
+
+    def _td_targets(self, 𝑟: Tensor, 𝑠ʼ: Tensor, 𝑑: Tensor) -> Tensor:
+        𝛾 = self._discount_factor
+        𝛼 = self._log_temperature.exp().detach()
+
         # Compute target action and its log-likelihood
         𝜇ʼ: Distribution = self._policy(𝑠ʼ)
         uʼ = 𝜇ʼ.rsample()  # Reparameterised sample
         # 𝐄𝐧𝐟𝐨𝐫𝐜𝐢𝐧𝐠 𝐀𝐜𝐭𝐢𝐨𝐧 𝐁𝐨𝐮𝐧𝐝𝐬
-        𝘢ʼ = torch.tanh(uʼ)  # Apply an invertible squashing function (tanh) to the Gaussian sample to get bounded action
+        # Apply an invertible squashing function (tanh) to the Gaussian sample to get bounded action
+        𝘢ʼ = torch.tanh(uʼ)
         log𝜇ʼ = 𝜇ʼ.log_prob(uʼ)
-        log𝜋ʼ: Tensor = log𝜇ʼ - 2 * (math.log(2) - uʼ - F.softplus(-2 * uʼ))  # Employ change of variables formula (SAC 2018, app C, eq 21) to compute the likelihood of the bounded action
+        # Employ change of variables formula (SAC 2018, app C, eq 21) to compute the likelihood of the bounded action
+        log𝜋ʼ: Tensor = log𝜇ʼ - 2 * (math.log(2) - uʼ - F.softplus(-2 * uʼ))
         """
         The second term is mathematically equivalent to log(1 - tanh(x)^2) but more
         numerically-stable.
@@ -128,41 +198,58 @@ class SAC:
         """
         log𝜋ʼ = log𝜋ʼ.sum(dim=1, keepdim=True)  # TODO: Why?
 
-        𝑦 = 𝑟 + ~𝑑 * 𝛾 * (min(*[𝑄ʼ(𝑠ʼ, 𝘢ʼ) for 𝑄ʼ in 𝑄ʼ_]) - 𝛼 * logπʼ)  # computes learning target
-        action_values = [𝑄(𝑠, 𝘢) for 𝑄 in 𝑄_]
-        critic_loss_fn = comp(reduce(add), map(partial(F.mse_loss, target=𝑦)))
-        critic_loss: Tensor = critic_loss_fn(action_values)
-        [critic_optimiser.zero_grad() for critic_optimiser in self._critic_optimisers]  # type: ignore
-        critic_loss.backward()
-        [critic_optimiser.step() for critic_optimiser in self._critic_optimisers]
-
-        # Compute action and its log-likelihood
-        𝜇: Distribution = self._policy(𝑠)
-        u = 𝜇.rsample()
-        # 𝐄𝐧𝐟𝐨𝐫𝐜𝐢𝐧𝐠 𝐀𝐜𝐭𝐢𝐨𝐧 𝐁𝐨𝐮𝐧𝐝𝐬
-        ã = torch.tanh(u)  # denotes the action sampled fresh from the policy (whereas 𝘢 denotes the action comes from the experience replay)
-        log𝜇 = 𝜇.log_prob(u)
-        log𝜋: Tensor = log𝜇 - 2 * (math.log(2) - u - F.softplus(-2 * u))
-        log𝜋 = log𝜋.sum(dim=1, keepdim=True)
-        # fmt: on
-
-        policy_loss = (𝛼 * logπ - min(*[𝑄(𝑠, ã) for 𝑄 in 𝑄_])).mean()
-        self._policy_optimiser.zero_grad()
-        policy_loss.backward()
-        self._policy_optimiser.step()
-
-        temperature_loss = (-log𝛼 * (log𝜋.detach() + 𝓗)).mean()
-        self._temperature_optimiser.zero_grad()
-        temperature_loss.backward()
-        self._temperature_optimiser.step()
+        # computes learning target
+        target_action_values = [𝑄ʼ(𝑠ʼ, 𝘢ʼ) for 𝑄ʼ in self._target_critics]
+        return 𝑟 + ~𝑑 * 𝛾 * (min(*target_action_values) - 𝛼 * log𝜋ʼ)
 
-        # Update frozen target critics by Polyak averaging (exponential smoothing)
-        with torch.no_grad():
-            for 𝑄, 𝑄ʼ in zip(𝑄_, 𝑄ʼ_):
-                for 𝜃, 𝜃ʼ in zip(𝑄.parameters(), 𝑄ʼ.parameters()):
-                    𝜃ʼ.mul_(1.0 - 𝜏)
-                    𝜃ʼ.add_(𝜏 * 𝜃)
+    @torch.no_grad()
+    def _td_errors(self, batch: Batch) -> Tensor:
+        """TD errors of the first critic under the current networks, e.g. to refresh PER priorities"""
+        𝑠ʼ = batch.next_states
+        𝛼 = self._log_temperature.exp()
+        𝜇ʼ: Distribution = self._policy(𝑠ʼ)
+        uʼ = 𝜇ʼ.sample()
+        log𝜋ʼ = (𝜇ʼ.log_prob(uʼ) - 2 * (math.log(2) - uʼ - F.softplus(-2 * uʼ))).sum(
+            dim=1, keepdim=True
+        )
+        𝘢ʼ = torch.tanh(uʼ)
+        𝑦 = batch.rewards + ~batch.terminateds * self._discount_factor * (
+            min(*[𝑄ʼ(𝑠ʼ, 𝘢ʼ) for 𝑄ʼ in self._target_critics]) - 𝛼 * log𝜋ʼ
+        )
+        return 𝑦 - self._critics[0](batch.states, batch.actions)
 
     @torch.no_grad()
     def compute_action(self, state: Tensor) -> Tensor:
-        return torch.tanh(self._policy(state).rsample())
+        return torch.tanh(self._behaviour_policy(state).rsample())
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self._policy.state_dict(),
+            "critics": [critic.state_dict() for critic in self._critics],
+            "target_critics": [critic.state_dict() for critic in self._target_critics],
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimisers": [
+                optimiser.state_dict() for optimiser in self._critic_optimisers
+            ],
+            "log_temperature": self._log_temperature.detach(),
+            "temperature_optimiser": self._temperature_optimiser.state_dict(),
+            "num_target_updates": self._num_target_updates,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._policy.load_state_dict(state_dict["policy"])
+        for critic, critic_state in zip(self._critics, state_dict["critics"]):
+            critic.load_state_dict(critic_state)
+        for critic, critic_state in zip(
+            self._target_critics, state_dict["target_critics"]
+        ):
+            critic.load_state_dict(critic_state)
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        for optimiser, optimiser_state in zip(
+            self._critic_optimisers, state_dict["critic_optimisers"]
+        ):
+            optimiser.load_state_dict(optimiser_state)
+        with torch.no_grad():
+            self._log_temperature.copy_(state_dict["log_temperature"])
+        self._temperature_optimiser.load_state_dict(state_dict["temperature_optimiser"])
+        self._num_target_updates = state_dict["num_target_updates"]
@@ -1,11 +1,12 @@
 from copy import deepcopy
 from functools import partial
-from itertools import cycle
 
 # from collections.abc import Callable, Iterator
 from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
 from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
     Callable,
+    Dict,
     Iterator,
 )
 
@@ -17,9 +18,10 @@ from torch import Tensor, add, min
 from torch.nn.parameter import Parameter
 from torch.optim import Optimizer
 
-from .experience_replay import ExperienceReplay
+from ..profiling import phase
+from .experience_replay import Batch, ExperienceReplay
 from .neural_network import ActionCritic, DeterministicActor
-from .noise_injection.action_space import ActionNoise, Gaussian
+from .noise_injection.action_space import ActionNoise
 
 
 class TD3:
@@ -52,6 +54,8 @@ class TD3:
         ]
         self._target_policy = deepcopy(self._policy)
         self._target_critics = deepcopy(self._critics)
+        # Policy that interacts with the environment; AsyncLearner swaps in a snapshot of the policy
+        self._behaviour_policy = self._policy
         # Freeze target networks with respect to optimisers (only update via Polyak averaging)
         self._target_policy.requires_grad_(False)
         [net.requires_grad_(False) for net in self._target_critics]
@@ -69,7 +73,16 @@ class TD3:
         self._policy_noise = policy_noise
         self._smoothing_noise_clip = smoothing_noise_clip
         self._smoothing_noise_stddev = smoothing_noise_stddev
-        self._policy_delay = cycle(range(policy_delay))
+        self._policy_delay = policy_delay
+        self._num_critic_updates = 0
+        # Version of the target networks, see `TargetCache`
+        self._num_target_updates = 0
+        # A TargetCache, possibly wrapped, is looked up once rather than at every update
+        self._targets: Callable[[Batch], Tensor] = self._uncached_targets
+        if hasattr(experience_replay, "lookup_targets"):
+            from .experience_replay.target_cache import cached_targets
+
+            self._targets = partial(self._cached_targets, cached_targets)
 
     def step(
         self,
@@ -82,55 +95,55 @@ class TD3:
         self._experience_replay.push(state, action, reward, next_state, terminated)
         self._update_parameters()
 
-    def _update_parameters(self) -> None:
+    def _update_parameters(self) -> bool:
+        """Returns whether an update took place"""
 
         try:
-            batch = self._experience_replay.sample(self._batch_size)
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
         except ValueError:
-            return
+            return False
+        self._learn(batch)
+        return True
+
+    def _learn(self, batch: Batch) -> None:
+        """One update from a sampled batch, which `DataParallel` samples itself"""
 
         # Abbreviating to mathematical italic unicode char for readability
         𝑠 = batch.states
         𝘢 = batch.actions
-        𝑟 = batch.rewards
-        𝑠ʼ = batch.next_states
-        𝑑 = batch.terminateds
-        𝛾 = self._discount_factor
-        𝜎 = self._smoothing_noise_stddev
-        𝑐 = self._smoothing_noise_clip
         𝜇 = self._policy  # Deterministic policy is usually denoted by 𝜇
         𝜇ʼ = self._target_policy
         𝑄_ = self._critics
         𝑄ʼ_ = self._target_critics
         𝜏 = self._target_smoothing_factor
 
-        # Compute target action
-        𝘢ʼ: Tensor = 𝜇ʼ(𝑠ʼ)
+        with phase("target"):
+            𝑦 = self._targets(batch)
 
-        # Target policy smoothing: add clipped noise to the target action
-        ã = 𝘢ʼ + 𝘢ʼ.clone().normal_(0, 𝜎).clamp_(-𝑐, 𝑐)
-        ã.clamp_(-1, 1)  # clipped to lie in valid action range FIXME: hard-code range
-
-        # Clipped double-Q learning
-        𝑦 = 𝑟 + ~𝑑 * 𝛾 * min(*[𝑄ʼ(𝑠ʼ, ã) for 𝑄ʼ in 𝑄ʼ_])  # computes learning target
-        action_values = [𝑄(𝑠, 𝘢) for 𝑄 in 𝑄_]
-        critic_loss_fn = comp(reduce(add), map(partial(F.mse_loss, target=𝑦)))
-        critic_loss: Tensor = critic_loss_fn(action_values)
-        [critic_optimiser.zero_grad() for critic_optimiser in self._critic_optimisers]  # type: ignore
-        critic_loss.backward()
-        [critic_optimiser.step() for critic_optimiser in self._critic_optimisers]
+        with phase("critic_backward"):
+            action_values = [𝑄(𝑠, 𝘢) for 𝑄 in 𝑄_]
+            critic_loss_fn = comp(reduce(add), map(partial(F.mse_loss, target=𝑦)))
+            critic_loss: Tensor = critic_loss_fn(action_values)
+            [critic_optimiser.zero_grad() for critic_optimiser in self._critic_optimisers]  # type: ignore
+            critic_loss.backward()
+            [critic_optimiser.step() for critic_optimiser in self._critic_optimisers]
 
         # "Delayed" policy updates
-        if next(self._policy_delay) == 0:
+        is_policy_update = self._num_critic_updates % self._policy_delay == 0
+        self._num_critic_updates += 1
+        if is_policy_update:
 
             # Improve the deterministic policy just by maximizing the first Q function approximator by gradient ascent
-            policy_loss: Tensor = -𝑄_[0](𝑠, 𝜇(𝑠)).mean()
-            self._policy_optimiser.zero_grad()
-            policy_loss.backward()
-            self._policy_optimiser.step()
+            with phase("policy_backward"):
+                policy_loss: Tensor = -𝑄_[0](𝑠, 𝜇(𝑠)).mean()
+                self._policy_optimiser.zero_grad()
+                policy_loss.backward()
+                self._policy_optimiser.step()
 
             # Update frozen target networks by Polyak averaging (exponential smoothing)
-            with torch.no_grad():  # stops target param from requesting grad after calc because original param require grad are involved in the calc
+            # Stops target param from requesting grad after calc because original param require grad are involved in the calc
+            with phase("polyak"), torch.no_grad():
                 for 𝑄, 𝑄ʼ in zip(𝑄_, 𝑄ʼ_):
                     for 𝜃, 𝜃ʼ in zip(𝑄.parameters(), 𝑄ʼ.parameters()):
                         𝜃ʼ.mul_(1.0 - 𝜏)
@@ -138,15 +151,94 @@ class TD3:
                 for 𝜙, 𝜙ʼ in zip(𝜇.parameters(), 𝜇ʼ.parameters()):
                     𝜙ʼ.mul_(1.0 - 𝜏)
                     𝜙ʼ.add_(𝜏 * 𝜙)
+            self._num_target_updates += 1
+
+    def _uncached_targets(self, batch: Batch) -> Tensor:
+        return self._td_targets(batch.rewards, batch.next_states, batch.terminateds)
+
+    def _cached_targets(self, lookup: Callable[..., Tensor], batch: Batch) -> Tensor:
+        """Targets reused from a `TargetCache` by `lookup`, i.e. `cached_targets`"""
+        version = self._num_target_updates
+        return lookup(self._experience_replay, batch, version, self._td_targets)
+
+    def _td_targets(self, 𝑟: Tensor, 𝑠ʼ: Tensor, 𝑑: Tensor) -> Tensor:
+        𝛾 = self._discount_factor
+        𝜎 = self._smoothing_noise_stddev
+        𝑐 = self._smoothing_noise_clip
+        𝜇ʼ = self._target_policy
+
+        # Compute target action
+        𝘢ʼ: Tensor = 𝜇ʼ(𝑠ʼ)
+
+        # Target policy smoothing: add clipped noise to the target action
+        ã = 𝘢ʼ + 𝘢ʼ.clone().normal_(0, 𝜎).clamp_(-𝑐, 𝑐)
+        ã.clamp_(-1, 1)  # clipped to lie in valid action range FIXME: hard-code range
+
+        # Clipped double-Q learning
+        # Computes learning target
+        return 𝑟 + ~𝑑 * 𝛾 * min(*[𝑄ʼ(𝑠ʼ, ã) for 𝑄ʼ in self._target_critics])
+
+    @torch.no_grad()
+    def _td_errors(self, batch: Batch) -> Tensor:
+        """
+        TD errors of the first critic under the current networks, e.g. to refresh PER
+        priorities, against the target without smoothing noise
+        """
+        𝑠ʼ = batch.next_states
+        𝑦 = batch.rewards + ~batch.terminateds * self._discount_factor * min(
+            *[𝑄ʼ(𝑠ʼ, self._target_policy(𝑠ʼ)) for 𝑄ʼ in self._target_critics]
+        )
+        return 𝑦 - self._critics[0](batch.states, batch.actions)
 
     @torch.no_grad()
     def compute_action(self, state: Tensor) -> Tensor:
-        action: Tensor = self._policy(state)
+        action: Tensor = self._behaviour_policy(state)
         # TODO: Avaliable since version 3.10. See PEP 634
         # match self._policy_noise:
-        #     case Gaussian():
+        #     case ActionNoise():
         #     case _:
-        if isinstance(self._policy_noise, Gaussian):
+        if isinstance(self._policy_noise, ActionNoise):
             action += self._policy_noise(action.size(), action.device)
             action.clamp_(-1, 1)  # FIXME: hard-code action range
         return action
+
+    def reset_noise(self) -> None:
+        """Meant to be called at the end of every episode"""
+        if self._policy_noise is not None:
+            self._policy_noise.reset()
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self._policy.state_dict(),
+            "critics": [critic.state_dict() for critic in self._critics],
+            "target_policy": self._target_policy.state_dict(),
+            "target_critics": [critic.state_dict() for critic in self._target_critics],
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimisers": [
+                optimiser.state_dict() for optimiser in self._critic_optimisers
+            ],
+            "num_critic_updates": self._num_critic_updates,
+            "num_target_updates": self._num_target_updates,
+            "policy_noise": self._policy_noise.state_dict()
+            if self._policy_noise is not None
+            else None,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._policy.load_state_dict(state_dict["policy"])
+        for critic, critic_state in zip(self._critics, state_dict["critics"]):
+            critic.load_state_dict(critic_state)
+        self._target_policy.load_state_dict(state_dict["target_policy"])
+        for critic, critic_state in zip(
+            self._target_critics, state_dict["target_critics"]
+        ):
+            critic.load_state_dict(critic_state)
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        for optimiser, optimiser_state in zip(
+            self._critic_optimisers, state_dict["critic_optimisers"]
+        ):
+            optimiser.load_state_dict(optimiser_state)
+        self._num_critic_updates = state_dict["num_critic_updates"]
+        self._num_target_updates = state_dict["num_target_updates"]
+        if self._policy_noise is not None and state_dict["policy_noise"] is not None:
+            self._policy_noise.load_state_dict(state_dict["policy_noise"])
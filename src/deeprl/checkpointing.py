@@ -0,0 +1,133 @@
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+    List,
+    Protocol,
+)
+
+import torch
+from torch import Tensor
+
+
+class Checkpointable(Protocol):
+    def state_dict(self) -> Dict[str, Any]:
+        ...
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        ...
+
+
+def snapshot(obj: Any) -> Any:
+    """Copies every tensor of a (nested) state dict to host memory"""
+    if isinstance(obj, Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {key: snapshot(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(snapshot(value) for value in obj)
+    return obj
+
+
+class CheckpointManager:
+    """
+    Saves agents' state dicts in the background and keeps the latest `max_to_keep`
+
+    `save` only copies the tensors on the calling (training) thread; serialisation
+    and the disk write happen on a background thread. At most one write is in
+    flight: `save` waits for the previous one, so that snapshots cannot pile up in
+    memory faster than the disk absorbs them.
+    Files are written to a temporary name and renamed, so a crash never leaves a
+    truncated checkpoint behind.
+
+    The experience replay is not part of a checkpoint.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        max_to_keep: int = 5,
+        prefix: str = "checkpoint",
+    ) -> None:
+        if max_to_keep < 1:
+            raise ValueError("max_to_keep must be at least 1.")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_to_keep = max_to_keep
+        self._prefix = prefix
+        self._pattern = re.compile(rf"{re.escape(prefix)}-(\d+)\.pt")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint"
+        )
+        self._pending: Optional["Future[Path]"] = None
+
+    def save(self, agent: Checkpointable, step: int) -> "Future[Path]":
+        self.wait()
+        state_dict = snapshot(agent.state_dict())
+        self._pending = self._executor.submit(self._write, state_dict, step)
+        return self._pending
+
+    def wait(self) -> None:
+        """Blocks until the pending write, if any, is on disk; re-raises its error"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def checkpoints(self) -> List[Path]:
+        """Checkpoints on disk, oldest first"""
+        paths = [
+            path
+            for path in self._directory.iterdir()
+            if self._pattern.fullmatch(path.name)
+        ]
+        return sorted(paths, key=self._step_of)
+
+    def latest(self) -> Optional[Path]:
+        checkpoints = self.checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def restore(
+        self,
+        agent: Checkpointable,
+        path: Optional[Union[str, "os.PathLike[str]"]] = None,
+        map_location: Optional[torch.device] = None,
+    ) -> Optional[int]:
+        """Loads the given (by default the latest) checkpoint and returns its step"""
+        self.wait()
+        path = Path(path) if path is not None else self.latest()
+        if path is None:
+            return None
+        agent.load_state_dict(torch.load(path, map_location=map_location))
+        return self._step_of(path)
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "CheckpointManager":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write(self, state_dict: Dict[str, Any], step: int) -> Path:
+        path = self._directory / f"{self._prefix}-{step:012d}.pt"
+        temporary = path.with_name(path.name + ".tmp")
+        torch.save(state_dict, temporary)
+        os.replace(temporary, path)
+        for stale in self.checkpoints()[: -self._max_to_keep]:
+            stale.unlink()
+        return path
+
+    def _step_of(self, path: Path) -> int:
+        match = self._pattern.fullmatch(path.name)
+        assert match is not None
+        return int(match.group(1))
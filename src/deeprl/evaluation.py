@@ -0,0 +1,167 @@
+"""
+Deterministic evaluation in a process pool, concurrent with training
+
+`Evaluator.evaluate(agent)` snapshots the agent's policy on the calling thread and
+returns a future at once; the episodes run in worker processes, so that training,
+`_update_parameters` included, carries on meanwhile. Actions are deterministic:
+the output of a deterministic policy without exploration noise (DDPG, TD3), or
+tanh of the mean of a stochastic policy (SAC, PPO).
+
+Usage:
+    with Evaluator(partial(gym.make, "Pendulum-v1"), num_episodes=10, num_workers=4) as evaluator:
+        pending = evaluator.evaluate(agent, step)
+        ...  # train
+        result = pending.result()
+"""
+
+import math
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import deepcopy
+from threading import Lock
+
+# from collections.abc import Callable
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    List,
+    Tuple,
+)
+
+import numpy as np
+import torch
+import torch.nn as nn
+from attrs import define
+from torch.distributions import Distribution
+
+# Must be picklable, e.g. functools.partial(gym.make, env_id), since workers are spawned processes
+EnvFn = Callable[[], Any]
+
+
+@define
+class EvaluationResult:
+    step: Optional[int]  # Training step of the policy snapshot, as passed to `evaluate`
+    episodic_returns: List[float]
+    episode_lengths: List[int]
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(self.episodic_returns))
+
+    @property
+    def std(self) -> float:
+        return float(np.std(self.episodic_returns))
+
+
+def _deterministic_action(policy: nn.Module, state: torch.Tensor) -> torch.Tensor:
+    output = policy(state)
+    if isinstance(output, Distribution):
+        # Stochastic policies squash their samples by tanh, see SAC and PPO `compute_action`
+        return torch.tanh(output.mean)
+    return output
+
+
+def _init_worker() -> None:
+    torch.set_num_threads(1)  # Workers scale out by processes, not by intra-op threads
+
+
+@torch.no_grad()
+def _run_episodes(
+    env_fn: EnvFn, policy: nn.Module, seeds: List[int]
+) -> List[Tuple[float, int]]:
+    env = env_fn()
+    results = []
+    try:
+        for seed in seeds:
+            state, _ = env.reset(seed=seed)
+            episodic_return, length = 0.0, 0
+            while True:
+                action = _deterministic_action(
+                    policy, torch.as_tensor(state, dtype=torch.float32)
+                )
+                state, reward, terminated, truncated, _ = env.step(action.numpy())
+                episodic_return += float(reward)
+                length += 1
+                if terminated or truncated:
+                    break
+            results.append((episodic_return, length))
+    finally:
+        env.close()
+    return results
+
+
+class Evaluator:
+    """
+    Runs `num_episodes` deterministic episodes per evaluation, split across
+    `num_workers` processes
+
+    Episode i of every evaluation is seeded with `seed + i`, so that evaluations of
+    different snapshots face the same initial states.
+    """
+
+    def __init__(
+        self,
+        env_fn: EnvFn,
+        num_episodes: int,
+        num_workers: int = 1,
+        seed: int = 0,
+    ) -> None:
+        if num_episodes < 1:
+            raise ValueError("num_episodes must be at least 1.")
+        self._env_fn = env_fn
+        self._num_episodes = num_episodes
+        self._num_workers = num_workers
+        self._seed = seed
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def evaluate(
+        self, agent: Any, step: Optional[int] = None
+    ) -> "Future[EvaluationResult]":
+        """Snapshots `agent._policy` and evaluates the snapshot asynchronously"""
+        policy = deepcopy(agent._policy).to("cpu").requires_grad_(False).eval()
+        seeds = [self._seed + i for i in range(self._num_episodes)]
+        episodes_per_task = math.ceil(len(seeds) / self._num_workers)
+        parts = [
+            self._executor.submit(
+                _run_episodes, self._env_fn, policy, seeds[i : i + episodes_per_task]
+            )
+            for i in range(0, len(seeds), episodes_per_task)
+        ]
+
+        result: "Future[EvaluationResult]" = Future()
+        lock = Lock()
+        remaining = [len(parts)]
+
+        def on_done(_: "Future[List[Tuple[float, int]]]") -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            try:
+                episodes = [episode for part in parts for episode in part.result()]
+            except BaseException as error:  # e.g. an environment failing in a worker
+                result.set_exception(error)
+            else:
+                result.set_result(
+                    EvaluationResult(
+                        step, [r for r, _ in episodes], [n for _, n in episodes]
+                    )
+                )
+
+        for part in parts:
+            part.add_done_callback(on_done)
+        return result
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> "Evaluator":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
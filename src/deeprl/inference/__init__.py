@@ -0,0 +1,9 @@
+"""Lightweight policy serving; importing this package does not import torch"""
+
+from .client import PolicyClient
+from .runtime import NumpyPolicy
+
+__all__ = (
+    NumpyPolicy.__name__,
+    PolicyClient.__name__,
+)
@@ -0,0 +1,60 @@
+import json
+import socket
+import struct
+from os import PathLike
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Any, Dict  # TODO: Deprecated since version 3.9. See PEP 585.
+
+import numpy as np
+
+# A frame is a little-endian uint32 byte count followed by the payload
+HEADER = struct.Struct("<I")
+# A frame with an empty payload requests the server's statistics as JSON
+STATS_REQUEST = HEADER.pack(0)
+# Set in the byte count of a reply whose payload is an error message
+ERROR_FLAG = 1 << 31
+
+
+def _receive_exactly(sock: socket.socket, num_bytes: int) -> bytes:
+    buffer = bytearray(num_bytes)
+    view = memoryview(buffer)
+    while view:
+        num_received = sock.recv_into(view)
+        if num_received == 0:
+            raise ConnectionError("The policy server closed the connection.")
+        view = view[num_received:]
+    return bytes(buffer)
+
+
+class PolicyClient:
+    """Blocking client of `deeprl.inference.server.PolicyServer`; does not import torch"""
+
+    def __init__(self, path: Union[str, "PathLike[str]"]) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(str(path))
+
+    def __call__(self, observation: np.ndarray) -> np.ndarray:
+        payload = np.ascontiguousarray(observation, dtype=np.float32).tobytes()
+        self._socket.sendall(HEADER.pack(len(payload)) + payload)
+        return np.frombuffer(self._receive(), dtype=np.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        self._socket.sendall(STATS_REQUEST)
+        return json.loads(self._receive())
+
+    def _receive(self) -> bytes:
+        """Raises a RuntimeError if the server failed to answer the request"""
+        (num_bytes,) = HEADER.unpack(_receive_exactly(self._socket, HEADER.size))
+        if num_bytes & ERROR_FLAG:
+            message = _receive_exactly(self._socket, num_bytes & ~ERROR_FLAG).decode()
+            raise RuntimeError(f"The policy server failed: {message}")
+        return _receive_exactly(self._socket, num_bytes)
+
+    def close(self) -> None:
+        self._socket.close()
+
+    def __enter__(self) -> "PolicyClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
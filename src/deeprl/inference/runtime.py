@@ -0,0 +1,118 @@
+from os import PathLike
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
+
+import numpy as np
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0, out=x)
+
+
+def _tanh(x: np.ndarray) -> np.ndarray:
+    return np.tanh(x, out=x)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+def _identity(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+# NumPy has no int8 GEMM and its integer matmul bypasses BLAS, so quantised weights
+# are held as float32 integers: products of int8 values, at most 127^2 each, summed
+# over this many inputs stay below 2^24 and are therefore computed exactly
+MAX_QUANTISED_INPUTS = 2**24 // 127**2  # 1040
+
+ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "relu": _relu,
+    "tanh": _tanh,
+    "sigmoid": _sigmoid,
+    "identity": _identity,
+}
+
+
+class _Layer:
+    def __init__(
+        self, weight: np.ndarray, bias: np.ndarray, scale: Optional[np.ndarray]
+    ) -> None:
+        if scale is not None and weight.shape[1] > MAX_QUANTISED_INPUTS:
+            raise ValueError(
+                f"A quantised layer takes at most {MAX_QUANTISED_INPUTS} inputs, got {weight.shape[1]}."
+            )
+        # (out, in) -> (in, out) so that the forward pass is x @ W + b
+        self.weight = np.ascontiguousarray(weight.T, dtype=np.float32)
+        self.bias = bias.astype(np.float32)
+        self.scale = None if scale is None else scale.astype(np.float32)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        if self.scale is None:
+            y = x @ self.weight
+        else:
+            # Dynamic quantisation: symmetric, per-row int8 activations
+            activation_scale = np.abs(x).max(axis=-1, keepdims=True) / 127
+            activation_scale[activation_scale == 0] = 1
+            y = np.rint(x / activation_scale) @ self.weight
+            y *= activation_scale * self.scale
+        y += self.bias
+        return y
+
+
+class NumpyPolicy:
+    """
+    Pure-NumPy forward pass of a policy exported by
+    `deeprl.actor_critic_methods.neural_network.export.export_policy`
+
+    Takes an observation of size (state_dim,) or (batch_size, state_dim) and returns
+    the deterministic action (tanh of the mean for a Gaussian policy).
+
+    Quantised layers are exact for up to `MAX_QUANTISED_INPUTS` inputs and, being
+    computed by float32 BLAS, are no faster than float32 ones: int8 only makes the
+    exported file four times smaller.
+    """
+
+    def __init__(
+        self,
+        layers: List[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]],
+        activation: str,
+        output_activation: str,
+    ) -> None:
+        self._layers = [_Layer(weight, bias, scale) for weight, bias, scale in layers]
+        self._actv_fn = ACTIVATIONS[activation]
+        self._out_fn = ACTIVATIONS[output_activation]
+
+    @classmethod
+    def load(cls, path: Union[str, "PathLike[str]"]) -> "NumpyPolicy":
+        with np.load(path) as archive:
+            layers = [
+                (
+                    archive[f"weight_{i}"],
+                    archive[f"bias_{i}"],
+                    archive[f"scale_{i}"] if f"scale_{i}" in archive else None,
+                )
+                for i in range(int(archive["num_layers"]))
+            ]
+            return cls(
+                layers, str(archive["activation"]), str(archive["output_activation"])
+            )
+
+    def __call__(self, observation: np.ndarray) -> np.ndarray:
+        actv = np.asarray(observation, dtype=np.float32)
+        last = len(self._layers)
+        for current, lyr in enumerate(self._layers, start=1):
+            if current != last:
+                actv = self._actv_fn(lyr(actv))
+            else:
+                actv = self._out_fn(lyr(actv))
+        return actv
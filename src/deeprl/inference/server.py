@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import time
+from collections import Counter, deque
+from os import PathLike
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Deque,
+    Dict,
+    List,
+    Tuple,
+)
+
+import numpy as np
+import torch
+from torch import Tensor
+
+from ..actor_critic_methods.neural_network import DeterministicActor, StochasticActor
+from .client import ERROR_FLAG, HEADER
+
+_Request = Tuple[np.ndarray, "asyncio.Future[np.ndarray]", float]
+
+
+class ServerStats:
+    """Latency (from a request being read to its action being ready) and batch sizes"""
+
+    def __init__(self, window: int = 100_000) -> None:
+        self.latencies: Deque[float] = deque(maxlen=window)  # seconds
+        self.batch_sizes: Counter = Counter()
+        self.num_requests = 0
+
+    def record(self, batch_size: int, latencies: List[float]) -> None:
+        self.batch_sizes[batch_size] += 1
+        self.latencies.extend(latencies)
+        self.num_requests += batch_size
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = np.asarray(self.latencies)
+        p50, p99 = (
+            np.percentile(latencies, [50, 99]) if len(latencies) else (np.nan, np.nan)
+        )
+        return {
+            "num_requests": self.num_requests,
+            "latency_p50": float(p50),
+            "latency_p99": float(p99),
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+        }
+
+
+class PolicyServer:
+    """
+    Micro-batching inference server over a Unix socket
+
+    Requests of many clients (see `deeprl.inference.client.PolicyClient`) are gathered
+    until `max_batch_size` observations are queued or `max_latency` seconds have passed
+    since the first of them arrived, evaluated in one forward pass, and the actions
+    are scattered back. A stochastic actor answers with its deterministic action,
+    tanh(mean). A request which fails, e.g. an observation of the wrong size, is
+    answered with an error message; the other requests and the connection are kept.
+    """
+
+    def __init__(
+        self,
+        policy: Union[DeterministicActor, StochasticActor],
+        path: Union[str, "PathLike[str]"],
+        max_batch_size: int = 64,
+        max_latency: float = 1e-3,
+        device: torch.device = torch.device("cpu"),
+    ) -> None:
+        self._policy = policy.to(device).eval()
+        self._path = str(path)
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency
+        self._device = device
+        self.stats = ServerStats()
+
+        self._queue: Optional["asyncio.Queue[_Request]"] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def run(self) -> None:
+        """Serves until interrupted"""
+        asyncio.run(self.serve_forever())
+
+    async def serve_forever(self) -> None:
+        self._queue = asyncio.Queue()
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        self._server = await asyncio.start_unix_server(self._handle, self._path)
+        batcher = asyncio.ensure_future(self._batch_forever())
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:  # raised by `close`
+            pass
+        finally:
+            batcher.cancel()
+            if os.path.exists(self._path):
+                os.unlink(self._path)
+
+    def close(self) -> None:
+        """Stops `serve_forever`; must be called from the event loop's thread"""
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                (num_bytes,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+                request = await reader.readexactly(num_bytes)
+                try:
+                    payload = await self._reply(request)
+                    header = HEADER.pack(len(payload))
+                except Exception as exception:  # e.g. an observation of the wrong size
+                    # Answers with the error rather than dropping the connection
+                    payload = f"{type(exception).__name__}: {exception}".encode()
+                    header = HEADER.pack(len(payload) | ERROR_FLAG)
+                writer.write(header + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, request: bytes) -> bytes:
+        if not request:
+            return json.dumps(self.stats.as_dict()).encode()
+        assert self._queue is not None
+        observation = np.frombuffer(request, dtype=np.float32)
+        future: "asyncio.Future[np.ndarray]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._queue.put_nowait((observation, future, time.perf_counter()))
+        return (await future).tobytes()
+
+    async def _batch_forever(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = [await self._queue.get()]
+            deadline = loop.time() + self._max_latency
+            while len(requests) < self._max_batch_size:
+                if not self._queue.empty():
+                    requests.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    requests.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._serve(requests)
+
+    def _serve(self, requests: List[_Request]) -> None:
+        # Observations of a wrong size fail their own forward pass, not the whole batch
+        batches: Dict[int, List[_Request]] = {}
+        for request in requests:
+            batches.setdefault(request[0].size, []).append(request)
+        for batch in batches.values():
+            self._serve_batch(batch)
+
+    @torch.no_grad()
+    def _serve_batch(self, requests: List[_Request]) -> None:
+        observations = [observation for observation, _, _ in requests]
+        try:
+            actions = self._forward(
+                torch.from_numpy(np.stack(observations)).to(self._device)
+            )
+        except Exception as exception:  # e.g. observations of the wrong size
+            for _, future, _ in requests:
+                future.set_exception(exception)
+            return
+        actions_np = actions.cpu().numpy()
+        now = time.perf_counter()
+        for (_, future, arrival), action in zip(requests, actions_np):
+            future.set_result(action)
+        self.stats.record(len(requests), [now - arrival for _, _, arrival in requests])
+
+    def _forward(self, observations: Tensor) -> Tensor:
+        if isinstance(self._policy, StochasticActor):
+            return torch.tanh(self._policy(observations).mean)
+        return self._policy(observations)
@@ -0,0 +1,268 @@
+"""
+Runs many configurations × seeds as parallel local processes
+
+The CPUs are split into slots of `num_threads_per_run` CPUs; every run executes in
+a process of its own, pinned to a free slot and limited to as many intra-op
+threads, so that the machine is saturated without oversubscription.
+
+Every run owns the directory `directory/<config>/seed-<seed>`, where its result is
+written once it completes. Completed runs are skipped when launching again, so an
+interrupted sweep resumes where it stopped; a training function which saves
+checkpoints into its run directory (see `deeprl.checkpointing`) resumes incomplete
+runs from their latest checkpoint as well.
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+from pathlib import Path
+
+# from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+)
+
+import numpy as np
+import torch
+from attrs import define
+
+RESULT_FILE = "result.json"
+
+
+@define
+class RunContext:
+    config_name: str
+    config: Dict[str, Any]
+    seed: int
+    directory: Path
+    cpus: List[int]
+    num_threads: int
+
+
+# Must be picklable, e.g. a module-level function, since runs are spawned processes
+TrainFn = Callable[[RunContext], Mapping[str, Any]]
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _run(train_fn: TrainFn, context: RunContext) -> None:
+    """Entry point of a run's process"""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, context.cpus)
+    torch.set_num_threads(context.num_threads)
+    random.seed(context.seed)
+    np.random.seed(context.seed)
+    torch.manual_seed(context.seed)
+
+    start = time.perf_counter()
+    metrics = dict(train_fn(context))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "config_name": context.config_name,
+        "config": context.config,
+        "seed": context.seed,
+        "elapsed": elapsed,
+        "metrics": metrics,
+    }
+    if "num_steps" in metrics:
+        result["steps_per_second"] = metrics["num_steps"] / elapsed
+    temporary = context.directory / (RESULT_FILE + ".tmp")
+    temporary.write_text(json.dumps(result, indent=2))
+    os.replace(temporary, context.directory / RESULT_FILE)
+
+
+@contextmanager
+def _environment(**variables: str) -> Iterator[None]:
+    """Sets environment variables inherited by the processes started meanwhile"""
+    previous = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                del os.environ[name]
+            else:
+                os.environ[name] = value
+
+
+def launch(
+    train_fn: TrainFn,
+    configs: Mapping[str, Mapping[str, Any]],
+    seeds: Iterable[int],
+    directory: Union[str, "os.PathLike[str]"],
+    num_threads_per_run: int = 1,
+    max_concurrent_runs: Optional[int] = None,
+    cpus: Optional[Iterable[int]] = None,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Runs `train_fn` for every named config and seed, and returns a summary, also
+    written to `directory/summary.json`
+
+    `train_fn` returns the run's metrics; a "num_steps" metric (environment steps)
+    is used to report throughput. Numeric metrics are aggregated across seeds.
+    Failed runs are listed in the summary and retried at the next launch.
+    """
+    directory = Path(directory)
+    cpus = sorted(cpus) if cpus is not None else available_cpus()
+    num_slots = len(cpus) // num_threads_per_run
+    if max_concurrent_runs is not None:
+        num_slots = min(num_slots, max_concurrent_runs)
+    if num_slots < 1:
+        raise ValueError(
+            f"{len(cpus)} CPU(s) cannot fit a run of {num_threads_per_run} threads."
+        )
+    free_slots = [
+        cpus[i * num_threads_per_run : (i + 1) * num_threads_per_run]
+        for i in range(num_slots)
+    ]
+
+    pending: List[RunContext] = []
+    seeds = list(seeds)
+    for config_name, config in configs.items():
+        if os.sep in config_name:
+            raise ValueError(
+                f"Config name {config_name!r} must not contain {os.sep!r}."
+            )
+        for seed in seeds:
+            run_directory = directory / config_name / f"seed-{seed}"
+            if (run_directory / RESULT_FILE).exists():
+                continue
+            run_directory.mkdir(parents=True, exist_ok=True)
+            pending.append(
+                RunContext(
+                    config_name,
+                    dict(config),
+                    seed,
+                    run_directory,
+                    [],
+                    num_threads_per_run,
+                )
+            )
+    if verbose:
+        num_runs = len(configs) * len(seeds)
+        print(
+            f"{num_runs - len(pending)}/{num_runs} runs already complete; {num_slots} run(s) at a time",
+            flush=True,
+        )
+
+    context = multiprocessing.get_context("spawn")
+    running: Dict[int, Any] = {}  # sentinel -> (process, run context)
+    failed: List[str] = []
+    num_steps = 0  # of the runs completed by this launch
+    start = time.perf_counter()
+    thread_count = str(num_threads_per_run)
+    with _environment(OMP_NUM_THREADS=thread_count, MKL_NUM_THREADS=thread_count):
+        try:
+            while pending or running:
+                while pending and free_slots:
+                    run = pending.pop(0)
+                    run.cpus = free_slots.pop()
+                    process = context.Process(
+                        target=_run,
+                        args=(train_fn, run),
+                        name=f"{run.config_name}/seed-{run.seed}",
+                    )
+                    process.start()
+                    running[process.sentinel] = (process, run)
+                for sentinel in wait(list(running)):
+                    process, run = running.pop(sentinel)  # type: ignore[call-overload]
+                    process.join()
+                    free_slots.append(run.cpus)
+                    if process.exitcode != 0:
+                        failed.append(process.name)
+                    else:
+                        result = json.loads((run.directory / RESULT_FILE).read_text())
+                        num_steps += result["metrics"].get("num_steps", 0)
+                    if verbose:
+                        status = (
+                            "done"
+                            if process.exitcode == 0
+                            else f"failed (exit code {process.exitcode})"
+                        )
+                        print(f"{process.name}: {status}", flush=True)
+        finally:  # e.g. KeyboardInterrupt: does not leave orphaned runs behind
+            for process, _ in running.values():
+                process.terminate()
+                process.join()
+    elapsed = time.perf_counter() - start
+
+    summary = summarise(directory, configs.keys(), seeds)
+    summary["failed"] = failed
+    summary["wall_time"] = elapsed
+    # Aggregate throughput of the concurrent runs of this launch
+    summary["steps_per_second"] = num_steps / elapsed if elapsed > 0 else 0.0
+    (directory / "summary.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+def summarise(
+    directory: Union[str, "os.PathLike[str]"],
+    config_names: Iterable[str],
+    seeds: Iterable[int],
+) -> Dict[str, Any]:
+    """Aggregates the results on disk: mean, std, min and max of numeric metrics across seeds"""
+    directory = Path(directory)
+    seeds = list(seeds)
+    configs: Dict[str, Any] = {}
+    total_steps = 0
+    total_time = 0.0
+    for config_name in config_names:
+        results = []
+        for seed in seeds:
+            path = directory / config_name / f"seed-{seed}" / RESULT_FILE
+            if path.exists():
+                results.append(json.loads(path.read_text()))
+        metrics: Dict[str, Dict[str, float]] = {}
+        names = {
+            name
+            for result in results
+            for name, value in result["metrics"].items()
+            if isinstance(value, (int, float))
+        }
+        for name in sorted(names):
+            values = np.array(
+                [
+                    result["metrics"][name]
+                    for result in results
+                    if name in result["metrics"]
+                ],
+                dtype=np.float64,
+            )
+            metrics[name] = {
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "min": float(values.min()),
+                "max": float(values.max()),
+            }
+        configs[config_name] = {
+            "num_completed_seeds": len(results),
+            "metrics": metrics,
+        }
+        for result in results:
+            total_steps += result["metrics"].get("num_steps", 0)
+            total_time += result["elapsed"]
+    return {
+        "configs": configs,
+        "total_steps": total_steps,
+        # Steps per second of a single run, averaged over all runs' time
+        "steps_per_second_per_run": total_steps / total_time if total_time > 0 else 0.0,
+    }
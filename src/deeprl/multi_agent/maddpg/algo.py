@@ -1,9 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from functools import partial
 
 # from collections.abc import Callable, Iterator, Mapping
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
 from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
     Callable,
+    Dict,
     Iterator,
+    List,
     Mapping,
 )
 
@@ -16,7 +22,8 @@ from torch.optim import Optimizer
 # from pettingzoo.utils.env import AgentID
 AgentID = str
 
-from .er import ExperienceReplay  # noqa: E402
+from ...profiling import phase  # noqa: E402
+from .er import Batch, ExperienceReplay  # noqa: E402
 from .nn import Actor, Critic  # noqa: E402
 
 
@@ -47,18 +54,67 @@ class Agent:
         self.discount_factor = discount_factor
         self.polyak = polyak
 
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy.state_dict(),
+            "critic": self.critic.state_dict(),
+            "target_policy": self.target_policy.state_dict(),
+            "target_critic": self.target_critic.state_dict(),
+            "policy_optimiser": self.policy_optimiser.state_dict(),
+            "critic_optimiser": self.critic_optimiser.state_dict(),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self.policy.load_state_dict(state_dict["policy"])
+        self.critic.load_state_dict(state_dict["critic"])
+        self.target_policy.load_state_dict(state_dict["target_policy"])
+        self.target_critic.load_state_dict(state_dict["target_critic"])
+        self.policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        self.critic_optimiser.load_state_dict(state_dict["critic_optimiser"])
+
 
 class MADDPG:
+    """
+    By default every agent is updated on a batch of its own, for which all agents'
+    target actions are computed, i.e. O(agents²) target policy forward passes per
+    step. With `shared_batch`, one batch is sampled per step and its target actions
+    are computed once and reused by all agents, i.e. O(agents) forward passes.
+
+    Given their batches, agents' updates are independent of each other. With
+    `num_workers`, they run concurrently on a thread pool (torch releases the GIL
+    in its CPU kernels) whose every worker is limited to `num_threads_per_worker`
+    intra-op threads, by default an even share of `torch.get_num_threads()`, so
+    that the workers do not oversubscribe the cores. The thread count is set per
+    thread with the OpenMP backend of torch, which is the default. Batches are
+    sampled on the calling thread in the order of the agents, and errors are
+    raised in that order, hence runs are reproducible whatever the scheduling.
+    """
+
     def __init__(
         self,
         agents: Mapping[AgentID, Agent],
         experience_replay: ExperienceReplay,
         batch_size: int,
+        shared_batch: bool = False,
+        num_workers: Optional[int] = None,
+        num_threads_per_worker: Optional[int] = None,
     ) -> None:
 
         self._agents = agents
         self._experience_replay = experience_replay
         self._batch_size = batch_size
+        self._shared_batch = shared_batch
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if num_workers is not None:
+            if num_threads_per_worker is None:
+                num_threads_per_worker = max(1, torch.get_num_threads() // num_workers)
+            self._executor = ThreadPoolExecutor(
+                num_workers,
+                thread_name_prefix="maddpg",
+                initializer=torch.set_num_threads,
+                initargs=(num_threads_per_worker,),
+            )
 
     def step(
         self,
@@ -72,18 +128,65 @@ class MADDPG:
         self._experience_replay.push(
             observation, action, reward, next_observation, terminated
         )
-        for agent_id in self._agents.keys():
-            self._update_main_networks(agent_id)
+        self._update_all_main_networks()
         for agent_id in self._agents.keys():
             self._update_target_networks(agent_id)
 
-    def _update_main_networks(self, agent_id: AgentID) -> None:
+    def close(self) -> None:
+        """Shuts the thread pool down, if any"""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _update_all_main_networks(self) -> None:
 
         try:
-            batch = self._experience_replay.sample(self._batch_size)
+            with phase("sample"):
+                if self._shared_batch:
+                    batch = self._experience_replay.sample(self._batch_size)
+                    batches = dict.fromkeys(self._agents.keys(), batch)
+                else:
+                    batches = {
+                        id: self._experience_replay.sample(self._batch_size)
+                        for id in self._agents.keys()
+                    }
         except ValueError:
             return
 
+        next_action_of_all_agents = None
+        if self._shared_batch:
+            # Target policies only change in `_update_target_networks`, hence are shared by all agents' updates
+            with phase("target"):
+                next_action_of_all_agents = self._compute_target_actions(batch)
+
+        updates = [
+            partial(
+                self._update_main_networks, id, batches[id], next_action_of_all_agents
+            )
+            for id in self._agents.keys()
+        ]
+        if self._executor is None:
+            for update in updates:
+                update()
+        else:
+            futures = [self._executor.submit(update) for update in updates]
+            for future in futures:
+                future.result()
+
+    @torch.no_grad()
+    def _compute_target_actions(self, batch: Batch) -> List[Tensor]:
+        return [
+            self._agents[id].target_policy(batch.next_observations[id])
+            for id in self._agents.keys()
+        ]
+
+    def _update_main_networks(
+        self,
+        agent_id: AgentID,
+        batch: Batch,
+        next_action_of_all_agents: Optional[List[Tensor]] = None,
+    ) -> None:
+        """Computes the batch's target actions unless given them"""
+
         # Abbrivating for readability
         policy = self._agents[agent_id].policy
         critic = self._agents[agent_id].critic
@@ -98,29 +201,34 @@ class MADDPG:
         observation_of_all_agents = list(batch.observations.values())
         action_of_all_agents = list(batch.actions.values())
         next_observation_of_all_agents = list(batch.next_observations.values())
-        next_action_of_all_agents = [
-            self._agents[id].target_policy(batch.next_observations[id])
-            for id in self._agents.keys()
-        ]
+        with phase("target"):
+            if next_action_of_all_agents is None:
+                next_action_of_all_agents = self._compute_target_actions(batch)
 
-        TD_targets = reward + ~terminated * discount_factor * target_critic(
-            next_observation_of_all_agents, next_action_of_all_agents
-        )
+            TD_targets = reward + ~terminated * discount_factor * target_critic(
+                next_observation_of_all_agents, next_action_of_all_agents
+            )
 
-        critic_loss = F.mse_loss(
-            TD_targets, critic(observation_of_all_agents, action_of_all_agents)
-        )
-        critic_optimiser.zero_grad()
-        critic_loss.backward()
-        critic_optimiser.step()
-
-        batch.actions[agent_id] = policy(observation)
-        policy_loss: Tensor = -critic(
-            observation_of_all_agents, list(batch.actions.values())
-        ).mean()
-        policy_optimiser.zero_grad()
-        policy_loss.backward()
-        policy_optimiser.step()
+        with phase("critic_backward"):
+            critic_loss = F.mse_loss(
+                TD_targets, critic(observation_of_all_agents, action_of_all_agents)
+            )
+            critic_optimiser.zero_grad()
+            critic_loss.backward()
+            critic_optimiser.step()
+
+        with phase("policy_backward"):
+            # Replaces the agent's action in a copy, as the batch may be shared with other agents
+            action_of_all_agents = [
+                policy(observation) if id == agent_id else action
+                for id, action in batch.actions.items()
+            ]
+            policy_loss: Tensor = -critic(
+                observation_of_all_agents, action_of_all_agents
+            ).mean()
+            policy_optimiser.zero_grad()
+            policy_loss.backward()
+            policy_optimiser.step()
 
     @torch.no_grad()
     def _update_target_networks(self, agent_id: AgentID) -> None:
@@ -133,13 +241,23 @@ class MADDPG:
         polyak = self._agents[agent_id].polyak
 
         # Update frozen target networks by Polyak averaging
-        for ϕ, ϕ_targ in zip(critic.parameters(), target_critic.parameters()):
-            ϕ_targ.mul_(polyak)
-            ϕ_targ.add_((1.0 - polyak) * ϕ)
-        for θ, θ_targ in zip(policy.parameters(), target_policy.parameters()):
-            θ_targ.mul_(polyak)
-            θ_targ.add_((1.0 - polyak) * θ)
+        with phase("polyak"):
+            for ϕ, ϕ_targ in zip(critic.parameters(), target_critic.parameters()):
+                ϕ_targ.mul_(polyak)
+                ϕ_targ.add_((1.0 - polyak) * ϕ)
+            for θ, θ_targ in zip(policy.parameters(), target_policy.parameters()):
+                θ_targ.mul_(polyak)
+                θ_targ.add_((1.0 - polyak) * θ)
 
     @torch.no_grad()
     def compute_action(self, agent_id: AgentID, observation: Tensor) -> Tensor:
         return self._agents[agent_id].policy(observation)
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            agent_id: agent.state_dict() for agent_id, agent in self._agents.items()
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        for agent_id, agent in self._agents.items():
+            agent.load_state_dict(state_dict[agent_id])
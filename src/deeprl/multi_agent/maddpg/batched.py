@@ -0,0 +1,215 @@
+from copy import deepcopy
+
+# from collections.abc import Callable, Iterator, Mapping
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+)
+
+import torch
+import torch.nn.functional as F
+from torch import Tensor
+from torch.nn.parameter import Parameter
+from torch.optim import Optimizer
+
+# from pettingzoo.utils.env import AgentID
+AgentID = str
+
+from ...profiling import phase  # noqa: E402
+from .er import ExperienceReplay  # noqa: E402
+from .nn import Actor, Critic, StackedActor, StackedCritic  # noqa: E402
+
+
+class BatchedMADDPG:
+    """
+    MADDPG for homogeneous agents, i.e. agents which share observation and action
+    dimensions and network architectures
+
+    The agents' actors and critics are stacked agent-wise into one network each,
+    so that target actions, TD targets, losses and Polyak averaging of all agents
+    are computed in a handful of batched kernels instead of Python loops over
+    agents. The agents' losses are summed; as no parameter is shared between
+    agents, every agent receives the gradient of its own loss. With an elementwise
+    optimiser (SGD, Adam, RMSprop, ...) the state of every agent is thus a separate
+    slice of the stacked state, and training is equivalent to one optimiser per
+    agent.
+
+    Unlike `MADDPG`, which samples a batch per agent and updates agents one after
+    another, all agents are updated on a single batch per step.
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[AgentID, Actor],
+        critics: Mapping[AgentID, Critic],
+        # TODO: Adopt PEP677 (Iterator[Parameter]) -> Optimizer
+        policy_optimiser: Callable[[Iterator[Parameter]], Optimizer],
+        critic_optimiser: Callable[[Iterator[Parameter]], Optimizer],
+        experience_replay: ExperienceReplay,
+        batch_size: int,
+        discount_factor: float,
+        polyak: float,
+    ) -> None:
+
+        if policies.keys() != critics.keys():
+            raise ValueError("Every agent needs both a policy and a critic.")
+        self._agent_ids = list(policies.keys())
+        self._agent_indices = {
+            agent_id: i for i, agent_id in enumerate(self._agent_ids)
+        }
+
+        self._policy = StackedActor([policies[id] for id in self._agent_ids])
+        self._critic = StackedCritic([critics[id] for id in self._agent_ids])
+
+        self._target_policy = deepcopy(self._policy)
+        self._target_critic = deepcopy(self._critic)
+        # Freeze target networks with respect to optimisers (only update via Polyak averaging)
+        self._target_policy.requires_grad_(False)
+        self._target_critic.requires_grad_(False)
+
+        self._policy_optimiser = policy_optimiser(self._policy.parameters())
+        self._critic_optimiser = critic_optimiser(self._critic.parameters())
+
+        self._experience_replay = experience_replay
+        self._batch_size = batch_size
+        self._discount_factor = discount_factor
+        self._polyak = polyak
+
+    def step(
+        self,
+        observation: Mapping[AgentID, Tensor],
+        action: Mapping[AgentID, Tensor],
+        reward: Mapping[AgentID, Tensor],
+        next_observation: Mapping[AgentID, Tensor],
+        terminated: Mapping[AgentID, Tensor],
+    ) -> None:
+
+        self._experience_replay.push(
+            observation, action, reward, next_observation, terminated
+        )
+        if self._update_main_networks():
+            self._update_target_networks()
+
+    def _stack(self, tensors: Mapping[AgentID, Tensor]) -> Tensor:
+        """(N, batch, ...) in the order of the agents"""
+        return torch.stack([tensors[id] for id in self._agent_ids])
+
+    def _update_main_networks(self) -> bool:
+        """Returns whether an update took place"""
+
+        try:
+            with phase("sample"):
+                batch = self._experience_replay.sample(self._batch_size)
+        except ValueError:
+            return False
+
+        # Prepare operands of size (N, batch, ...)
+        observations = self._stack(batch.observations)
+        actions = self._stack(batch.actions)
+        rewards = self._stack(batch.rewards)
+        next_observations = self._stack(batch.next_observations)
+        terminateds = self._stack(batch.terminateds)
+        N, B = observations.shape[:2]
+        # Joint observations and actions of size (batch, N * dim), as seen by the centralised critics
+        joint_observation = observations.transpose(0, 1).reshape(B, -1)
+        joint_action = actions.transpose(0, 1).reshape(B, -1)
+        joint_next_observation = next_observations.transpose(0, 1).reshape(B, -1)
+
+        with phase("target"):
+            next_actions = self._target_policy(next_observations)
+            joint_next_action = next_actions.transpose(0, 1).reshape(B, -1)
+            TD_targets = (
+                rewards
+                + ~terminateds
+                * self._discount_factor
+                * self._target_critic(joint_next_observation, joint_next_action)
+            )
+
+        with phase("critic_backward"):
+            action_values = self._critic(joint_observation, joint_action)
+            # Sum of the agents' mean squared errors
+            critic_loss = (
+                F.mse_loss(action_values, TD_targets, reduction="none")
+                .mean(dim=(1, 2))
+                .sum()
+            )
+            self._critic_optimiser.zero_grad()
+            critic_loss.backward()
+            self._critic_optimiser.step()
+
+        with phase("policy_backward"):
+            # Agent i's critic is evaluated on the sampled joint action with agent i's action replaced by its policy's
+            policy_actions = self._policy(observations)
+            eye = torch.eye(N, dtype=torch.bool, device=observations.device)
+            is_own_action = eye[:, None, :, None]
+            joint_actions = torch.where(
+                is_own_action,
+                policy_actions.transpose(0, 1)[None],
+                actions.transpose(0, 1)[None],
+            ).reshape(N, B, -1)
+            policy_loss: Tensor = (
+                -self._critic(joint_observation, joint_actions).mean(dim=(1, 2)).sum()
+            )
+            self._policy_optimiser.zero_grad()
+            policy_loss.backward()
+            self._policy_optimiser.step()
+
+        return True
+
+    @torch.no_grad()
+    def _update_target_networks(self) -> None:
+
+        polyak = self._polyak
+
+        # Update frozen target networks by Polyak averaging
+        with phase("polyak"):
+            for ϕ, ϕ_targ in zip(
+                self._critic.parameters(), self._target_critic.parameters()
+            ):
+                ϕ_targ.mul_(polyak)
+                ϕ_targ.add_((1.0 - polyak) * ϕ)
+            for θ, θ_targ in zip(
+                self._policy.parameters(), self._target_policy.parameters()
+            ):
+                θ_targ.mul_(polyak)
+                θ_targ.add_((1.0 - polyak) * θ)
+
+    @torch.no_grad()
+    def compute_action(self, agent_id: AgentID, observation: Tensor) -> Tensor:
+        return self._policy(observation, self._agent_indices[agent_id])
+
+    @torch.no_grad()
+    def compute_actions(
+        self, observation: Mapping[AgentID, Tensor]
+    ) -> Dict[AgentID, Tensor]:
+        """Actions of all agents in one forward pass"""
+        observations = self._stack(observation)
+        N, state_dim = len(self._agent_ids), observations.size(-1)
+        actions = self._policy(observations.view(N, -1, state_dim))
+        return dict(
+            zip(self._agent_ids, actions.view(*observations.shape[:-1], -1).unbind())
+        )
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "agent_ids": self._agent_ids,
+            "policy": self._policy.state_dict(),
+            "critic": self._critic.state_dict(),
+            "target_policy": self._target_policy.state_dict(),
+            "target_critic": self._target_critic.state_dict(),
+            "policy_optimiser": self._policy_optimiser.state_dict(),
+            "critic_optimiser": self._critic_optimiser.state_dict(),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        if state_dict["agent_ids"] != self._agent_ids:
+            raise ValueError("The state dict belongs to other agents.")
+        self._policy.load_state_dict(state_dict["policy"])
+        self._critic.load_state_dict(state_dict["critic"])
+        self._target_policy.load_state_dict(state_dict["target_policy"])
+        self._target_critic.load_state_dict(state_dict["target_critic"])
+        self._policy_optimiser.load_state_dict(state_dict["policy_optimiser"])
+        self._critic_optimiser.load_state_dict(state_dict["critic_optimiser"])
@@ -19,6 +19,7 @@ from torch import Tensor
 AgentID = str
 
 from ..._data_structures.rotating_list import RotatingList  # noqa: E402
+from ...profiling import phase  # noqa: E402
 
 
 @dataclass
@@ -44,8 +45,9 @@ class Batch:
     terminateds: Mapping[AgentID, Tensor] = field(init=False)
 
     def __attrs_post_init__(self) -> None:
-        for field, unstacked in zip(fields(Experience), zip(*self.experiences)):
-            setattr(self, field.name + "s", merge_with(torch.stack, unstacked))
+        with phase("stack"):
+            for field, unstacked in zip(fields(Experience), zip(*self.experiences)):
+                setattr(self, field.name + "s", merge_with(torch.stack, unstacked))
 
 
 class ExperienceReplay(ABC):
@@ -3,6 +3,8 @@ from typing import TypeVar  # fmt: skip
 from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
     Iterable,
     List,
+    Optional,
+    Sequence,
     Tuple,
 )
 
@@ -83,6 +85,97 @@ class Critic(nn.Module):
         return action_value
 
 
+class _StackedLinear(nn.Module):
+    """
+    The same `nn.Linear` layer of N agents, with weights of size (N, in, out)
+
+    Inputs of size (N, batch, in) are multiplied agent-wise in one batched matmul;
+    inputs of size (batch, in), shared by all agents, are broadcast.
+    """
+
+    def __init__(self, layers: Sequence[nn.Linear]) -> None:
+        super(_StackedLinear, self).__init__()
+        if len({layer.weight.shape for layer in layers}) != 1:
+            raise ValueError("Stacked networks must share the same architecture.")
+        self.weight = nn.Parameter(
+            torch.stack([layer.weight.detach().T for layer in layers])
+        )
+        self.bias = nn.Parameter(
+            torch.stack([layer.bias.detach()[None] for layer in layers])
+        )
+
+    def forward(self, input: Tensor, agent: Optional[int] = None) -> Tensor:
+        if agent is not None:
+            return torch.addmm(
+                self.bias[agent], input.view(-1, input.size(-1)), self.weight[agent]
+            ).view(*input.shape[:-1], -1)
+        if input.dim() == 3:
+            return torch.baddbmm(self.bias, input, self.weight)
+        return torch.matmul(input, self.weight) + self.bias
+
+
+class StackedActor(nn.Module):
+    """
+    Actors of homogeneous agents stacked into one network
+
+    Maps observations of size (N, batch, state_dim) to actions of size
+    (N, batch, action_dim). Weights are copied from `actors`, which must share
+    architecture, activation and output functions.
+    """
+
+    def __init__(self, actors: Sequence[Actor]) -> None:
+        super(StackedActor, self).__init__()
+        self._activation_fn = actors[0]._activation_fn
+        self._output_fn = actors[0]._output_fn
+        self._layers = nn.ModuleList(
+            [
+                _StackedLinear(layers)
+                for layers in zip(*[actor._layers for actor in actors])
+            ]
+        )
+
+    def forward(self, state: Tensor, agent: Optional[int] = None) -> Tensor:
+        """Evaluates only the given agent's actor on its (batch, state_dim) observations if `agent` is set"""
+        activation = state
+        for hidden_layer in self._layers[:-1]:
+            activation = self._activation_fn(hidden_layer(activation, agent))
+        action = self._output_fn(self._layers[-1](activation, agent))
+        return action
+
+
+class StackedCritic(nn.Module):
+    """
+    Centralised critics of homogeneous agents stacked into one network
+
+    Takes the joint observation and the joint action, flattened agent-major to
+    size (batch, N * dim), or one per agent of size (N, batch, N * dim); returns
+    action values of size (N, batch, 1).
+    """
+
+    def __init__(self, critics: Sequence[Critic]) -> None:
+        super(StackedCritic, self).__init__()
+        self._activation_fn = critics[0]._activation_fn
+        self._layers = nn.ModuleList(
+            [
+                _StackedLinear(layers)
+                for layers in zip(*[critic._layers for critic in critics])
+            ]
+        )
+
+    def forward(self, states: Tensor, actions: Tensor) -> Tensor:
+        if states.dim() < actions.dim():
+            states = states.expand(*actions.shape[:-1], states.size(-1))
+        elif actions.dim() < states.dim():
+            actions = actions.expand(*states.shape[:-1], actions.size(-1))
+
+        activation = torch.cat([states, actions], dim=-1)
+        for hidden_layer in self._layers[:-1]:
+            activation = self._activation_fn(hidden_layer(activation))
+        action_value = self._layers[-1](activation)
+
+        return action_value
+
+
 @torch.no_grad()
 def _init_weights(layer: nn.Module) -> None:
     if type(layer) == nn.Linear:
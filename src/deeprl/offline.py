@@ -0,0 +1,220 @@
+"""
+Offline training from logged datasets
+
+Datasets are shards of columns, one array per `Experience` field with a leading
+transition dimension, in `.npz` files or HDF5 files (`.h5`/`.hdf5`, requires
+h5py); shards recorded by `deeprl.recording` are `.npz` files whose columns are
+split into chunks. Shards are streamed into a `ColumnarUER` in chunks of
+`chunk_size` transitions, so that memory is bounded by a chunk (HDF5, recorded
+shards) or by one array of a shard (plain `.npz`, whose arrays cannot be read
+partially), plus the replay itself; a replay given a directory keeps its columns
+in memory-mapped files on disk.
+
+Usage:
+    replay = ColumnarUER(capacity, state_dim, action_dim, directory="replay")
+    load(replay, sorted(Path("dataset").glob("*.hdf5")))
+    agent = TD3(..., replay, ...)
+    train_offline(agent, num_updates=1_000_000)
+"""
+
+import os
+from contextlib import contextmanager
+from dataclasses import fields
+from pathlib import Path
+
+# from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+)
+
+import numpy as np
+
+from .actor_critic_methods.experience_replay import ColumnarUER, Experience
+from .profiling import count
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Experience field -> key of its column in the dataset, e.g. "state" -> "states"
+DEFAULT_KEYS: Dict[str, str] = {
+    field.name: field.name + "s" for field in fields(Experience)
+}
+
+
+@contextmanager
+def _open_shard(path: Path) -> Iterator[Mapping[str, Any]]:
+    """Arrays (npz) or datasets (HDF5) by key, read on access"""
+    if path.suffix in (".h5", ".hdf5"):
+        import h5py  # Optional: only needed for HDF5 shards
+
+        with h5py.File(path, "r") as file:
+            yield file
+    else:
+        with np.load(path) as file:
+            yield file
+
+
+def _npy_shape(shard: np.lib.npyio.NpzFile, name: str) -> Tuple[int, ...]:
+    """Shape of an npz member, read from its header rather than from its data"""
+    with shard.zip.open(name + ".npy") as file:
+        version = np.lib.format.read_magic(file)
+        read_header = (
+            np.lib.format.read_array_header_1_0
+            if version == (1, 0)
+            else np.lib.format.read_array_header_2_0
+        )
+        return tuple(read_header(file)[0])
+
+
+class _NpzColumn:
+    """
+    A column of an npz shard: one array, or separately compressed chunks
+    `<key>/000000.npy`, `<key>/000001.npy`, ... (see `deeprl.recording`)
+
+    Only the chunks which a slice spans are decompressed; a single array is a
+    single chunk, hence decompressed whole.
+    """
+
+    def __init__(self, shard: np.lib.npyio.NpzFile, names: List[str]) -> None:
+        self._shard = shard
+        self._names = names
+        shapes = [_npy_shape(shard, name) for name in names]
+        self._offsets = np.cumsum([0] + [shape[0] for shape in shapes])
+        self.shape = (int(self._offsets[-1]), *shapes[0][1:])
+        self._cached: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def _chunk(self, k: int) -> np.ndarray:
+        if self._cached[0] != k:
+            self._cached = (k, self._shard[self._names[k]])
+        chunk = self._cached[1]
+        assert chunk is not None
+        return chunk
+
+    def __getitem__(self, index: slice) -> np.ndarray:
+        start, stop, _ = index.indices(self.shape[0])
+        first = int(np.searchsorted(self._offsets, start, side="right")) - 1
+        parts = []
+        for k in range(max(first, 0), len(self._names)):
+            offset = int(self._offsets[k])
+            if offset >= stop:
+                break
+            parts.append(self._chunk(k)[max(start - offset, 0) : stop - offset])
+        return np.concatenate(parts) if len(parts) != 1 else parts[0]
+
+
+def _columns(shard: Mapping[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    """Columns present in a shard, by key, read on slicing"""
+    if not isinstance(shard, np.lib.npyio.NpzFile):  # HDF5 datasets
+        return {key: shard[key] for key in keys if key in shard}
+    columns = {}
+    for key in keys:
+        if key in shard.files:
+            columns[key] = _NpzColumn(shard, [key])
+        else:
+            chunks = sorted(name for name in shard.files if name.startswith(key + "/"))
+            if chunks:
+                columns[key] = _NpzColumn(shard, chunks)
+    return columns
+
+
+def _validate(
+    path: Path, columns: Mapping[str, Any], keys: Mapping[str, str], replay: ColumnarUER
+) -> int:
+    """Returns the number of transitions of a shard whose columns fit the replay"""
+    lengths = set()
+    for field in fields(Experience):
+        key = keys[field.name]
+        if key not in columns:
+            raise ValueError(
+                f"{path}: missing column {key!r} of Experience.{field.name}."
+            )
+        expected = replay.shapes[field.name + "s"]
+        shape = tuple(columns[key].shape)
+        if shape[1:] != expected and not (expected == (1,) and shape[1:] == ()):
+            raise ValueError(
+                f"{path}: column {key!r} of Experience.{field.name} has transitions of size {shape[1:]}, expected {expected}."
+            )
+        lengths.add(shape[0])
+    if len(lengths) != 1:
+        raise ValueError(
+            f"{path}: columns hold different numbers of transitions {sorted(lengths)}."
+        )
+    return lengths.pop()
+
+
+def stream(
+    paths: Iterable[PathLike],
+    replay: ColumnarUER,
+    chunk_size: int = 65_536,
+    keys: Mapping[str, str] = DEFAULT_KEYS,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yields chunks of up to `chunk_size` transitions, by Experience field name,
+    validated against the replay
+    """
+    for path in map(Path, paths):
+        with _open_shard(path) as shard:
+            columns = _columns(shard, keys.values())
+            num_transitions = _validate(path, columns, keys, replay)
+            for start in range(0, num_transitions, chunk_size):
+                yield {
+                    field.name: np.asarray(
+                        columns[keys[field.name]][start : start + chunk_size]
+                    )
+                    for field in fields(Experience)
+                }
+
+
+def load(
+    replay: ColumnarUER,
+    paths: Iterable[PathLike],
+    chunk_size: int = 65_536,
+    keys: Mapping[str, str] = DEFAULT_KEYS,
+) -> int:
+    """
+    Streams shards into `replay` and returns the number of transitions loaded
+
+    All shards are validated before loading the first one, so that a bad shard
+    does not leave the replay half-filled. A memory-mapped replay is flushed.
+    """
+    paths = [Path(path) for path in paths]
+    for path in paths:
+        with _open_shard(path) as shard:
+            _validate(path, _columns(shard, keys.values()), keys, replay)
+
+    num_transitions = 0
+    for chunk in stream(paths, replay, chunk_size, keys):
+        replay.extend(*(chunk[field.name] for field in fields(Experience)))
+        num_transitions += len(chunk["state"])
+    replay.flush()
+    return num_transitions
+
+
+def train_offline(
+    agent: Any,
+    num_updates: int,
+    callback: Optional[Callable[[int], None]] = None,
+    callback_interval: int = 1000,
+) -> int:
+    """
+    Updates `agent` (e.g. TD3 or SAC whose experience replay holds a dataset)
+    `num_updates` times without interacting with an environment, calling
+    `callback(num_updates_so_far)` every `callback_interval` updates, e.g. to
+    evaluate or checkpoint. Returns the number of updates which took place.
+    """
+    num_updates_done = 0
+    for i in range(1, num_updates + 1):
+        if agent._update_parameters():
+            num_updates_done += 1
+            count("offline_updates")
+        if callback is not None and i % callback_interval == 0:
+            callback(i)
+    return num_updates_done
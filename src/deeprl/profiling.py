@@ -0,0 +1,188 @@
+"""
+Opt-in instrumentation of the hot path
+
+The algorithms and experience replays mark their phases with `phase(name)` and
+`count(name)`. Both are no-ops unless a `Profiler` is active, so they cost a global
+lookup when profiling is off.
+
+Usage:
+    with Profiler() as profiler:
+        ...  # train
+    profiler.log(writer, step)  # a SummaryWriter or a wandb run
+    profiler.as_dict()
+"""
+
+import time
+from collections import Counter
+from threading import Lock
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    ContextManager,
+    Dict,
+    Set,
+)
+
+import torch
+from attrs import define
+from torch import Tensor
+
+_active: Optional["Profiler"] = None
+
+
+class _NullTimer:
+    def __enter__(self) -> None:
+        ...
+
+    def __exit__(self, *exc_info: object) -> None:
+        ...
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Times the enclosed block under `name` if a profiler is active"""
+    profiler = _active
+    if profiler is None:
+        return _NULL_TIMER
+    return _Timer(profiler, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    profiler = _active
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+@define
+class PhaseStats:
+    num_calls: int = 0
+    total_time: float = 0.0  # seconds
+
+
+class _Timer:
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        if self._profiler.synchronise_cuda:
+            torch.cuda.synchronize()
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._profiler.synchronise_cuda:
+            torch.cuda.synchronize()
+        self._profiler.record(self._name, time.perf_counter() - self._start)
+
+
+class Profiler:
+    """
+    Aggregates wall time and call counts per phase, and plain counters
+
+    CUDA kernels run asynchronously; with `synchronise_cuda` every phase waits for
+    them, so that time is attributed to the phase which launched the kernels.
+    Phases may nest (e.g. "stack" inside "sample"), hence their times do not add up.
+    """
+
+    def __init__(self, synchronise_cuda: bool = False) -> None:
+        self.synchronise_cuda = synchronise_cuda
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Counter = Counter()
+        self._lock = Lock()  # e.g. AsyncLearner updates on a thread of its own
+        self._previous: Optional[Profiler] = None
+
+    def __enter__(self) -> "Profiler":
+        global _active
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _active
+        _active, self._previous = self._previous, None
+
+    def record(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            stats = self.phases.setdefault(name, PhaseStats())
+            stats.num_calls += 1
+            stats.total_time += elapsed
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases.clear()
+            self.counters.clear()
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            metrics: Dict[str, float] = {}
+            for name, stats in self.phases.items():
+                metrics[f"time/{name}"] = stats.total_time
+                metrics[f"calls/{name}"] = stats.num_calls
+            for name, value in self.counters.items():
+                metrics[f"count/{name}"] = value
+            return metrics
+
+    def log(self, writer: Any, step: int, prefix: str = "profile") -> None:
+        """Writes to a `torch.utils.tensorboard.SummaryWriter` or a wandb run"""
+        metrics = {f"{prefix}/{name}": value for name, value in self.as_dict().items()}
+        if hasattr(writer, "add_scalar"):
+            for name, value in metrics.items():
+                writer.add_scalar(name, value, step)
+        else:
+            writer.log(metrics, step=step)
+
+
+def replay_memory_footprint(experience_replay: Any) -> Dict[str, int]:
+    """
+    Bytes held per `Experience` field and number of live objects
+
+    Walks every stored transition, so it is meant to be called now and then rather
+    than on the hot path. A tensor stored in several fields (e.g. the next state
+    of one transition being the state of the following one) is counted once in
+    "total_bytes" but in every field it appears in. A replay which does not store
+    `Experience`s measures itself with a `memory_footprint` method instead.
+    """
+    # Unwraps e.g. RateLimiter and Synchronised
+    while "_experience_replay" in vars(experience_replay):
+        experience_replay = vars(experience_replay)["_experience_replay"]
+
+    if hasattr(experience_replay, "memory_footprint"):
+        return experience_replay.memory_footprint()
+    if not hasattr(experience_replay, "_buffer"):
+        raise TypeError(
+            f"Cannot measure the footprint of {type(experience_replay).__name__}."
+        )
+
+    footprint: Counter = Counter()
+    buffer = experience_replay._buffer
+    sum_tree_bytes = 0
+    if hasattr(buffer, "_leaves"):  # PER
+        sum_tree_bytes = buffer._weights.nbytes
+        buffer = buffer._leaves
+
+    storages: Set[int] = set()
+    num_experiences = 0
+    for i in range(len(buffer)):
+        experience = buffer[i]
+        num_experiences += 1
+        for name, value in vars(experience).items():
+            tensors = value.values() if isinstance(value, dict) else [value]  # MADDPG
+            for tensor in tensors:
+                if not isinstance(tensor, Tensor):
+                    continue
+                num_bytes = tensor.element_size() * tensor.nelement()
+                footprint[f"{name}_bytes"] += num_bytes
+                footprint["num_tensors"] += 1
+                if tensor.data_ptr() not in storages:
+                    storages.add(tensor.data_ptr())
+                    footprint["total_bytes"] += num_bytes
+    footprint["num_experiences"] = num_experiences
+    footprint["sum_tree_bytes"] = sum_tree_bytes
+    footprint["total_bytes"] += sum_tree_bytes
+    return dict(footprint)
@@ -0,0 +1,223 @@
+"""
+Recording of transitions to disk, for offline training (see `deeprl.offline`) or analysis
+
+Transitions are copied into fixed-size in-memory chunks of columns; full chunks
+are compressed and written on a background thread. A shard is a zip file holding
+every column as a sequence of separately compressed chunks, `states/000000.npy`,
+`states/000001.npy`, ..., so that reading a slice of a shard decompresses the
+chunks it spans rather than whole columns. Shards are rotated once they exceed
+`max_shard_bytes`, and only appear under their final name once complete.
+
+Usage:
+    with TrajectoryWriter("recordings", state_dim, action_dim) as writer:
+        replay = Recorded(UER(capacity), writer)
+        ...  # train with `replay`
+"""
+
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import fields
+from pathlib import Path
+from queue import Queue
+
+# from collections.abc import Sequence
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import Union  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import torch
+from torch import Tensor
+
+from .actor_critic_methods.experience_replay import Experience
+from .profiling import count
+
+# Columns as the offline loader expects them by default, e.g. "state" -> "states"
+_COLUMNS = [field.name + "s" for field in fields(Experience)]
+
+
+class _Chunk:
+    def __init__(
+        self,
+        length: int,
+        shapes: Dict[str, Tuple[int, ...]],
+        dtypes: Dict[str, np.dtype],
+    ) -> None:
+        self.columns = {
+            name: np.empty((length, *shape), dtype=dtypes[name])
+            for name, shape in shapes.items()
+        }
+        self.size = 0
+
+
+class TrajectoryWriter:
+    """
+    Appends transitions to column files under `directory` on a background thread
+
+    `append` only copies a transition into the current chunk. At most
+    `max_pending_chunks` full chunks wait for the background thread; beyond that,
+    `append` blocks until one is written, so that memory stays bounded when the
+    disk falls behind.
+
+    States are stored as `state_dtype`, e.g. torch.uint8 for pixel observations, as
+    in `ColumnarUER`; actions and rewards as float32 and terminations as bool.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        state_shape: Union[int, Sequence[int]],
+        action_shape: Union[int, Sequence[int]],
+        chunk_length: int = 4096,
+        max_shard_bytes: int = 256 * 2**20,
+        max_pending_chunks: int = 2,
+        compresslevel: int = 1,  # zlib: fast rather than small
+        prefix: str = "trajectories",
+        state_dtype: torch.dtype = torch.float32,
+    ) -> None:
+        state_shape = (
+            (state_shape,) if isinstance(state_shape, int) else tuple(state_shape)
+        )
+        action_shape = (
+            (action_shape,) if isinstance(action_shape, int) else tuple(action_shape)
+        )
+        shapes = dict(
+            zip(_COLUMNS, (state_shape, action_shape, (1,), state_shape, (1,)))
+        )
+        state_np_dtype = torch.empty((), dtype=state_dtype).numpy().dtype
+        float32, bool_ = np.dtype(np.float32), np.dtype(np.bool_)
+        dtypes = dict(
+            zip(_COLUMNS, (state_np_dtype, float32, float32, state_np_dtype, bool_))
+        )
+
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_shard_bytes = max_shard_bytes
+        self._compresslevel = compresslevel
+        self._prefix = prefix
+        self._pattern = re.compile(rf"{re.escape(prefix)}-(\d+)\.npz")
+
+        # Chunks circulate between the training thread and the writing thread
+        self._free_chunks: "Queue[_Chunk]" = Queue()
+        for _ in range(max_pending_chunks + 1):
+            self._free_chunks.put(_Chunk(chunk_length, shapes, dtypes))
+        self._chunk = self._free_chunks.get()
+        self._chunk_length = chunk_length
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="trajectory-writer"
+        )
+        self._pending: List["Future[None]"] = []
+        # Owned by the writing thread
+        self._shard: Optional[zipfile.ZipFile] = None
+        self._shard_path: Optional[Path] = None
+        self._num_chunks_in_shard = 0
+        matches = [
+            self._pattern.fullmatch(path.name) for path in self._directory.iterdir()
+        ]
+        # Carries on after the shards of previous recordings
+        self._next_shard_index = (
+            max((int(match.group(1)) for match in matches if match), default=-1) + 1
+        )
+        self.shards: List[Path] = []  # Completed by this writer
+
+    def append(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        count("recorded")
+        chunk = self._chunk
+        i = chunk.size
+        for name, value in zip(
+            _COLUMNS, (state, action, reward, next_state, terminated)
+        ):
+            chunk.columns[name][i] = value.detach().cpu().numpy()
+        chunk.size += 1
+        if chunk.size == self._chunk_length:
+            self._submit()
+
+    def _submit(self) -> None:
+        self._raise_failure()
+        self._pending.append(self._executor.submit(self._write, self._chunk))
+        self._chunk = self._free_chunks.get()  # Blocks while every chunk is pending
+
+    def _raise_failure(self) -> None:
+        """Re-raises the error of a completed write, if any"""
+        done = [future for future in self._pending if future.done()]
+        self._pending = [future for future in self._pending if not future.done()]
+        for future in done:
+            future.result()
+
+    def _write(self, chunk: _Chunk) -> None:
+        try:
+            if self._shard is None:
+                self._shard_path = (
+                    self._directory / f"{self._prefix}-{self._next_shard_index:06d}.npz"
+                )
+                self._next_shard_index += 1
+                self._shard = zipfile.ZipFile(
+                    self._shard_path.with_name(self._shard_path.name + ".tmp"),
+                    "w",
+                    compression=zipfile.ZIP_DEFLATED,
+                    compresslevel=self._compresslevel,
+                )
+                self._num_chunks_in_shard = 0
+            for name, column in chunk.columns.items():
+                buffer = io.BytesIO()
+                np.lib.format.write_array(
+                    buffer, column[: chunk.size], allow_pickle=False
+                )
+                self._shard.writestr(
+                    f"{name}/{self._num_chunks_in_shard:06d}.npy", buffer.getvalue()
+                )
+            self._num_chunks_in_shard += 1
+            assert self._shard.fp is not None
+            if self._shard.fp.tell() >= self._max_shard_bytes:
+                self._close_shard()
+        finally:
+            chunk.size = 0
+            self._free_chunks.put(chunk)
+
+    def _close_shard(self) -> None:
+        if self._shard is None:
+            return
+        assert self._shard_path is not None
+        self._shard.close()
+        os.replace(
+            self._shard_path.with_name(self._shard_path.name + ".tmp"), self._shard_path
+        )
+        self.shards.append(self._shard_path)
+        self._shard = None
+
+    def flush(self) -> None:
+        """Writes the partial chunk and completes the current shard, so that it can be read"""
+        if self._chunk.size > 0:
+            self._submit()
+        self._executor.submit(self._close_shard).result()
+        for future in self._pending:
+            future.result()
+        self._pending.clear()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,205 @@
+"""
+Environment loop with bulk host/device transfers and host-side episode statistics
+
+A hand-written loop converts every observation, reward and termination flag with a
+`torch.tensor` call of its own and accumulates the episodic return on the device.
+`RolloutRunner` instead writes them into preallocated staging arrays: on the CPU,
+the staging arrays are NumPy views of the tensors handed to the agent, so nothing
+is converted at all; on a GPU, they live in pinned memory and are copied to the
+device asynchronously. Episode statistics are Python numbers, so that checking
+whether an episode ended never waits for the device.
+
+Usage:
+    runner = RolloutRunner(env, agent, device)
+    for episode in runner.run(num_steps=100_000):
+        print(episode.episodic_return, episode.length)
+"""
+
+import inspect
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    List,
+    Tuple,
+)
+
+import torch
+from attrs import define
+from torch import Tensor
+
+from .profiling import count
+
+
+@define
+class EpisodeStats:
+    episodic_return: float
+    length: int
+
+
+class _Chunk:
+    """
+    Staging rows of `length` transitions: the host arrays and the device tensors
+    which the agent receives
+
+    Transitions handed to `agent.step` are views of a chunk's tensors and may be
+    stored as such by an experience replay, hence rows are never reused: once a
+    chunk is full, a new one is allocated and the old one is freed with the last
+    transition referencing it.
+    """
+
+    def __init__(
+        self, length: int, state_shape: Tuple[int, ...], device: torch.device
+    ) -> None:
+        self.length = length
+        self.states = torch.empty((length, *state_shape), device=device)
+        self.rewards = torch.empty((length, 1), device=device)
+        self.terminateds = torch.empty((length, 1), dtype=torch.bool, device=device)
+        self.truncateds = torch.empty((length, 1), dtype=torch.bool, device=device)
+        if device.type == "cpu":
+            self._host = None
+            self.host_states = self.states.numpy()
+            self.host_rewards = self.rewards.numpy()
+            self.host_terminateds = self.terminateds.numpy()
+            self.host_truncateds = self.truncateds.numpy()
+        else:
+            pin_memory = device.type == "cuda"
+            tensors = (self.states, self.rewards, self.terminateds, self.truncateds)
+            self._host = tuple(
+                torch.empty_like(tensor, device="cpu") for tensor in tensors
+            )
+            if pin_memory:
+                self._host = tuple(tensor.pin_memory() for tensor in self._host)
+            (
+                self.host_states,
+                self.host_rewards,
+                self.host_terminateds,
+                self.host_truncateds,
+            ) = (tensor.numpy() for tensor in self._host)
+        # Views of every row, created at once rather than by indexing on every step
+        self.state_rows = self.states.unbind(0)
+        self.reward_rows = self.rewards.unbind(0)
+        self.terminated_rows = self.terminateds.unbind(0)
+        self.truncated_rows = self.truncateds.unbind(0)
+
+    def upload_state(self, row: int) -> None:
+        if self._host is not None:
+            self.state_rows[row].copy_(self._host[0][row], non_blocking=True)
+
+    def upload_transition(self, row: int, next_row: int) -> None:
+        if self._host is not None:
+            self.state_rows[next_row].copy_(self._host[0][next_row], non_blocking=True)
+            for rows, host in zip(
+                (self.reward_rows, self.terminated_rows, self.truncated_rows),
+                self._host[1:],
+            ):
+                rows[row].copy_(host[row], non_blocking=True)
+
+
+class RolloutRunner:
+    """
+    Drives `agent` in `env` through the agent's `compute_action` and `step`
+
+    `agent` is any of the single-agent algorithms; `truncated` is passed to `step`
+    if the agent accepts it (e.g. PPO), and the agent's `reset_noise`, if any (e.g.
+    DDPG and TD3), is called at the end of every episode. `env` follows the gymnasium
+    `Env` API.
+    Successive calls to `run` carry on with the episode in progress.
+    """
+
+    def __init__(
+        self,
+        env: Any,
+        agent: Any,
+        device: torch.device,
+        chunk_length: int = 1024,
+        seed: Optional[int] = None,
+    ) -> None:
+        if chunk_length < 2:
+            raise ValueError(
+                f"A chunk must hold at least 2 states, got {chunk_length}."
+            )
+        self._env = env
+        self._agent = agent
+        self._device = device
+        self._chunk_length = chunk_length
+        self._state_shape: Tuple[int, ...] = tuple(env.observation_space.shape)
+        self._passes_truncated = "truncated" in inspect.signature(agent.step).parameters
+        self._reset_noise = getattr(agent, "reset_noise", None)
+        self._seed = seed
+
+        self._chunk: Optional[_Chunk] = None
+        self._row = 0  # of the current state in the current chunk
+        self._episodic_return = 0.0
+        self._episode_length = 0
+        self.num_steps = 0
+
+    def _new_chunk(self) -> _Chunk:
+        return _Chunk(self._chunk_length, self._state_shape, self._device)
+
+    def _reset(self) -> None:
+        state, _ = self._env.reset(seed=self._seed)
+        self._seed = None  # Seeds the first episode only, as gymnasium expects
+        if self._chunk is None or self._row + 1 >= self._chunk.length:
+            self._chunk, self._row = self._new_chunk(), 0
+        else:
+            # The previous row holds the final state of the previous episode
+            self._row += 1
+        self._chunk.host_states[self._row] = state
+        self._chunk.upload_state(self._row)
+        self._episodic_return = 0.0
+        self._episode_length = 0
+
+    def run(self, num_steps: int) -> List[EpisodeStats]:
+        """Steps `num_steps` times and returns the statistics of the episodes completed meanwhile"""
+        episodes: List[EpisodeStats] = []
+        if self._chunk is None:
+            self._reset()
+        for _ in range(num_steps):
+            chunk, row = self._chunk, self._row
+            assert chunk is not None
+            if row + 1 >= chunk.length:
+                # Carries the current state over to a new chunk
+                new_chunk = self._new_chunk()
+                new_chunk.host_states[0] = chunk.host_states[row]
+                new_chunk.state_rows[0].copy_(chunk.state_rows[row])
+                chunk, row = self._chunk, self._row = new_chunk, 0
+
+            state = chunk.state_rows[row]
+            action: Tensor = self._agent.compute_action(state)
+            next_state, reward, terminated, truncated, _ = self._env.step(
+                action.detach().cpu().numpy()
+            )
+
+            next_row = row + 1
+            chunk.host_states[next_row] = next_state
+            chunk.host_rewards[row] = reward
+            chunk.host_terminateds[row] = terminated
+            chunk.host_truncateds[row] = truncated
+            chunk.upload_transition(row, next_row)
+
+            transition = (
+                state,
+                action,
+                chunk.reward_rows[row],
+                chunk.state_rows[next_row],
+                chunk.terminated_rows[row],
+            )
+            if self._passes_truncated:
+                self._agent.step(*transition, truncated=chunk.truncated_rows[row])
+            else:
+                self._agent.step(*transition)
+            count("env_steps")
+            self.num_steps += 1
+
+            # Host-side statistics: no device synchronisation
+            self._episodic_return += float(reward)
+            self._episode_length += 1
+            self._row = next_row
+            if terminated or truncated:
+                episodes.append(
+                    EpisodeStats(self._episodic_return, self._episode_length)
+                )
+                if self._reset_noise is not None:
+                    self._reset_noise()
+                self._reset()
+        return episodes
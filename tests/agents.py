@@ -0,0 +1,147 @@
+"""Small agents, transitions and environments shared by the tests"""
+
+from functools import partial
+from typing import Optional  # TODO: Unnecessary since version 3.10. See PEP 604.
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+    Tuple,
+)
+
+import numpy as np
+import torch
+import torch.optim as optim
+
+from deeprl.actor_critic_methods import DDPG, SAC, TD3
+from deeprl.actor_critic_methods.experience_replay import UER, ExperienceReplay
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import Gaussian
+
+OBSERVATION_DIM, ACTION_DIM = 3, 2
+HIDDEN_DIMS = [16, 16]
+
+
+def make_td3(
+    experience_replay: Optional[ExperienceReplay] = None,
+    batch_size: int = 8,
+    **kwargs: Any,
+) -> TD3:
+    return TD3(
+        torch.device("cpu"),
+        OBSERVATION_DIM,
+        ACTION_DIM,
+        partial(mlp.Policy, hidden_dims=HIDDEN_DIMS),
+        partial(mlp.ActionValue, hidden_dims=HIDDEN_DIMS),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        experience_replay if experience_replay is not None else UER(1000),
+        batch_size,
+        0.99,
+        0.005,
+        Gaussian(0.1),
+        0.2,
+        0.5,
+        **kwargs,
+    )
+
+
+def make_sac(
+    experience_replay: Optional[ExperienceReplay] = None, batch_size: int = 8
+) -> SAC:
+    return SAC(
+        torch.device("cpu"),
+        OBSERVATION_DIM,
+        ACTION_DIM,
+        partial(mlp.GaussianPolicy, hidden_dims=HIDDEN_DIMS),
+        partial(mlp.ActionValue, hidden_dims=HIDDEN_DIMS),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        experience_replay if experience_replay is not None else UER(1000),
+        batch_size,
+        0.99,
+        0.005,
+    )
+
+
+def make_ddpg(
+    experience_replay: Optional[ExperienceReplay] = None,
+    batch_size: int = 8,
+    policy_noise: Any = None,
+) -> DDPG:
+    return DDPG(
+        mlp.Policy(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS),
+        mlp.ActionValue(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        experience_replay if experience_replay is not None else UER(1000),
+        batch_size,
+        0.99,
+        0.995,
+        policy_noise if policy_noise is not None else Gaussian(0.1),
+    )
+
+
+def random_transition(terminated: bool = False) -> Tuple[torch.Tensor, ...]:
+    return (
+        torch.randn(OBSERVATION_DIM),
+        torch.rand(ACTION_DIM) * 2 - 1,
+        torch.randn(1),
+        torch.randn(OBSERVATION_DIM),
+        torch.tensor([terminated]),
+    )
+
+
+def fill(experience_replay: Any, n: int) -> None:
+    for _ in range(n):
+        experience_replay.push(*random_transition())
+
+
+class Box:
+    """The attributes of `gymnasium.spaces.Box` which the library reads"""
+
+    def __init__(self, low: float, high: float, shape: Tuple[int, ...]) -> None:
+        self.low = np.full(shape, low, dtype=np.float32)
+        self.high = np.full(shape, high, dtype=np.float32)
+        self.shape = shape
+        self.dtype = np.dtype(np.float32)
+
+
+class CountingEnv:
+    """
+    Follows the gymnasium `Env` API: the observation holds the step within the
+    episode, the reward is the sum of the action, and episodes are truncated after
+    `episode_length` steps. `reset(seed)` draws the first observation from the seed.
+    """
+
+    metadata: Dict[str, Any] = {"render_modes": []}
+
+    def __init__(self, episode_length: int = 5) -> None:
+        self.observation_space = Box(-np.inf, np.inf, (OBSERVATION_DIM,))
+        self.action_space = Box(-1.0, 1.0, (ACTION_DIM,))
+        self._episode_length = episode_length
+        self._rng = np.random.default_rng()
+        self._t = 0
+
+    def _observation(self) -> np.ndarray:
+        observation = self._rng.standard_normal(OBSERVATION_DIM).astype(np.float32)
+        observation[0] = self._t
+        return observation
+
+    def reset(
+        self, seed: Optional[int] = None, options: Any = None
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._t = 0
+        return self._observation(), {}
+
+    def step(
+        self, action: np.ndarray
+    ) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        self._t += 1
+        truncated = self._t >= self._episode_length
+        return self._observation(), float(np.sum(action)), False, truncated, {}
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,59 @@
+import torch
+from torch import Size
+
+from deeprl.actor_critic_methods.noise_injection.action_space import (
+    Colored,
+    OrnsteinUhlenbeck,
+)
+
+from .agents import make_td3
+
+CPU = torch.device("cpu")
+
+
+def test_ornstein_uhlenbeck_reset_restarts_masked_environments_only() -> None:
+    noise = OrnsteinUhlenbeck(1.0, mean=0.5)
+    for _ in range(10):
+        noise(Size((3, 2)), CPU)
+    before = noise._state.clone()
+    noise.reset(torch.tensor([True, False, True]))
+    assert torch.equal(noise._state[[0, 2]], torch.full((2, 2), 0.5))
+    assert torch.equal(noise._state[1], before[1])
+    noise.reset()
+    assert torch.equal(noise._state, torch.full((3, 2), 0.5))
+
+
+def test_colored_reset_redraws_masked_sequences_only() -> None:
+    noise = Colored(1.0, 1.0, block_size=64)
+    noise(Size((3, 2)), CPU)
+    before = noise._block.clone()
+    noise.reset(torch.tensor([False, True, False]))
+    after = noise._block
+    assert torch.equal(after[:, [0, 2]], before[:, [0, 2]])
+    assert torch.equal(after[:1, 1], before[:1, 1])  # The noise already drawn
+    assert not torch.equal(after[1:, 1], before[1:, 1])
+
+
+def test_td3_resets_its_policy_noise() -> None:
+    agent = make_td3()
+    agent._policy_noise = OrnsteinUhlenbeck(1.0)
+    for _ in range(5):
+        agent.compute_action(torch.randn(3))
+    agent.reset_noise()
+    assert torch.equal(agent._policy_noise._state, torch.zeros(2))
+    agent._policy_noise = None
+    agent.reset_noise()  # Without noise, a no-op
+
+
+def test_ornstein_uhlenbeck_state_dict_shares_no_memory() -> None:
+    noise = OrnsteinUhlenbeck(1.0)
+    noise(Size((2,)), CPU)
+    state_dict = noise.state_dict()
+    saved = state_dict["state"].clone()
+    noise(Size((2,)), CPU)
+    assert torch.equal(state_dict["state"], saved)
+
+    restored = OrnsteinUhlenbeck(1.0)
+    restored.load_state_dict(state_dict)
+    restored(Size((2,)), CPU)
+    assert torch.equal(state_dict["state"], saved)
@@ -0,0 +1,71 @@
+import time
+from threading import Thread
+
+import pytest
+import torch
+
+from deeprl.actor_critic_methods import AsyncLearner
+from deeprl.actor_critic_methods.experience_replay import UER, RateLimiter
+
+from .agents import fill, make_td3, random_transition
+
+
+def test_learner_updates_and_refreshes_the_acting_policy() -> None:
+    agent = make_td3()
+    fill(agent._experience_replay, 50)
+    with AsyncLearner(agent, refresh_interval=1) as learner:
+        deadline = time.monotonic() + 30
+        while learner.num_updates < 20 and time.monotonic() < deadline:
+            learner.step(*random_transition())
+            time.sleep(1e-3)
+    assert learner.num_updates >= 20
+    for θ_acting, θ in zip(
+        agent._behaviour_policy.parameters(), agent._policy.parameters()
+    ):
+        assert torch.equal(θ_acting, θ)
+
+
+def test_stop_wakes_a_learner_blocked_by_the_rate_limiter() -> None:
+    # With timeout=None the learner blocks in `sample` until enough transitions are inserted
+    replay = RateLimiter(
+        UER(100), samples_per_insert=1, min_size_to_sample=50, error_buffer=8
+    )
+    agent = make_td3(replay)
+    fill(replay, 10)
+    learner = AsyncLearner(agent, refresh_interval=1, stop_timeout=10.0)
+    learner.start()
+    time.sleep(0.1)  # lets the learner block
+    # A regression must not hang the test session
+    stopper = Thread(target=learner.stop, daemon=True)
+    stopper.start()
+    stopper.join(timeout=15.0)
+    assert not stopper.is_alive()
+    assert learner.num_updates == 0
+
+
+def test_restart_after_stop() -> None:
+    replay = RateLimiter(
+        UER(100), samples_per_insert=8, min_size_to_sample=20, error_buffer=16
+    )
+    agent = make_td3(replay)
+    learner = AsyncLearner(agent, refresh_interval=1)
+    learner.start()
+    learner.stop()
+    learner.start()  # resumes the cancelled rate limiter
+    deadline = time.monotonic() + 30
+    while learner.num_updates < 5 and time.monotonic() < deadline:
+        learner.step(*random_transition())
+    learner.stop()
+    assert learner.num_updates >= 5
+
+
+def test_cancelled_rate_limiter_fails_blocking_calls() -> None:
+    replay = RateLimiter(
+        UER(100), samples_per_insert=1, min_size_to_sample=5, error_buffer=2
+    )
+    replay.cancel()
+    with pytest.raises(ValueError):
+        replay.sample(1)
+    fill(replay, 5)  # inserts below min_size_to_sample never block
+    with pytest.raises(RuntimeError):
+        fill(replay, 5)
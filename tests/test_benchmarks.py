@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_throughput_benchmark_smoke(tmp_path: Path) -> None:
+    output = tmp_path / "throughput.json"
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [str(ROOT / "src"), os.environ.get("PYTHONPATH", "")]
+        ),
+    }
+    subprocess.run(
+        [
+            sys.executable,
+            str(ROOT / "benchmarks" / "throughput.py"),
+            *("--algorithms", "td3", "batched_maddpg"),
+            *("--batch-sizes", "8", "--hidden-sizes", "16", "--memory-capacity", "100"),
+            *("--steps", "20", "--warmup-steps", "10", "--output", str(output)),
+        ],
+        check=True,
+        env=env,
+        timeout=300,
+    )
+    results = json.loads(output.read_text())["results"]
+    assert [result["algorithm"] for result in results] == ["td3", "batched_maddpg"]
+    for result in results:
+        assert "error" not in result
+        assert result["updates_per_second"] > 0
@@ -0,0 +1,73 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+
+from deeprl.actor_critic_methods.noise_injection.action_space import OrnsteinUhlenbeck
+from deeprl.checkpointing import CheckpointManager
+
+from .agents import OBSERVATION_DIM, fill, make_sac, make_td3
+
+
+def assert_equal(a: Any, b: Any) -> None:
+    """Recursive equality of (nested) state dicts"""
+    if isinstance(a, torch.Tensor):
+        assert torch.equal(a, b)
+    elif isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for key in a:
+            assert_equal(a[key], b[key])
+    elif isinstance(a, (list, tuple)):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_equal(x, y)
+    else:
+        assert a == b
+
+
+def test_td3_round_trip_resumes_identically(tmp_path: Path) -> None:
+    agent = make_td3()
+    agent._policy_noise = OrnsteinUhlenbeck(0.1)
+    fill(agent._experience_replay, 50)
+    for _ in range(3):
+        agent._update_parameters()
+        agent.compute_action(torch.randn(OBSERVATION_DIM))
+
+    with CheckpointManager(tmp_path) as manager:
+        manager.save(agent, step=3)
+        restored = make_td3(agent._experience_replay)
+        restored._policy_noise = OrnsteinUhlenbeck(0.1)
+        assert manager.restore(restored) == 3
+    assert_equal(restored.state_dict(), agent.state_dict())
+
+    # The next update, from the same batch and smoothing noise, matches
+    for resumed in (agent, restored):
+        torch.manual_seed(0)
+        resumed._experience_replay._rng = np.random.default_rng(0)
+        resumed._update_parameters()
+    assert_equal(restored.state_dict(), agent.state_dict())
+
+
+def test_sac_round_trip(tmp_path: Path) -> None:
+    agent = make_sac()
+    fill(agent._experience_replay, 50)
+    agent._update_parameters()
+    with CheckpointManager(tmp_path) as manager:
+        manager.save(agent, step=1)
+        restored = make_sac()
+        manager.restore(restored)
+    assert_equal(restored.state_dict(), agent.state_dict())
+
+
+def test_only_the_latest_checkpoints_are_kept(tmp_path: Path) -> None:
+    agent = make_td3()
+    with CheckpointManager(tmp_path, max_to_keep=2) as manager:
+        for step in range(5):
+            manager.save(agent, step)
+        manager.wait()
+        assert [path.name for path in manager.checkpoints()] == [
+            "checkpoint-000000000003.pt",
+            "checkpoint-000000000004.pt",
+        ]
+        assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,84 @@
+import socket
+from functools import partial
+from pathlib import Path
+
+import torch
+
+from deeprl.actor_critic_methods import DataParallel
+from deeprl.actor_critic_methods.data_parallel import launch_localhost
+from deeprl.actor_critic_methods.experience_replay import PER, Batch
+
+from .agents import make_td3, random_transition
+
+NUM_STEPS = 30
+BATCH_SIZE = 8
+FAILURE_INTERVAL = 3
+
+
+class FlakyPER(PER):
+    """Whose every `FAILURE_INTERVAL`-th sample fails, as when a `RateLimiter` times out"""
+
+    num_samples = 0
+
+    def sample(self, batch_size: int) -> Batch:
+        self.num_samples += 1
+        if self.num_samples % FAILURE_INTERVAL == 0:
+            raise ValueError("Timed out waiting for the actor to catch up.")
+        return super().sample(batch_size)
+
+
+def train(rank: int, world_size: int, directory: Path, flaky_rank: int = -1) -> None:
+    """Module-level, so that spawned processes can unpickle it"""
+    torch.set_num_threads(1)
+    torch.manual_seed(rank)  # Replicas and their experience start apart
+    experience_replay = FlakyPER(100, α=0.6) if rank == flaky_rank else PER(100, α=0.6)
+    td3 = make_td3(experience_replay, batch_size=BATCH_SIZE)
+    agent = DataParallel(td3, sync_interval=1000)
+    for _ in range(NUM_STEPS):
+        agent.step(*random_transition())
+    modules = [
+        agent._policy,
+        agent._target_policy,
+        *agent._critics,
+        *agent._target_critics,
+    ]
+    flat = torch.cat(
+        [
+            param.detach().reshape(-1)
+            for module in modules
+            for param in module.parameters()
+        ]
+    )
+    torch.save(
+        {"parameters": flat, "num_updates": agent.num_updates},
+        directory / f"rank-{rank}.pt",
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_replicas_trained_on_different_experience_stay_identical(
+    tmp_path: Path,
+) -> None:
+    launch_localhost(partial(train, directory=tmp_path), world_size=2, port=free_port())
+    results = [torch.load(tmp_path / f"rank-{rank}.pt") for rank in range(2)]
+    assert (
+        results[0]["num_updates"]
+        == results[1]["num_updates"]
+        == NUM_STEPS - BATCH_SIZE + 1
+    )
+    assert torch.equal(results[0]["parameters"], results[1]["parameters"])
+
+
+def test_replicas_skip_an_update_when_one_fails_to_sample(tmp_path: Path) -> None:
+    fn = partial(train, directory=tmp_path, flaky_rank=1)
+    launch_localhost(fn, world_size=2, port=free_port())
+    results = [torch.load(tmp_path / f"rank-{rank}.pt") for rank in range(2)]
+    steps = range(BATCH_SIZE, NUM_STEPS + 1)  # those with enough transitions
+    num_updates = sum(step % FAILURE_INTERVAL != 0 for step in steps)
+    assert results[0]["num_updates"] == results[1]["num_updates"] == num_updates
+    assert torch.equal(results[0]["parameters"], results[1]["parameters"])
@@ -0,0 +1,39 @@
+from copy import deepcopy
+from functools import partial
+
+import pytest
+import torch
+
+from deeprl.evaluation import Evaluator, _run_episodes
+
+from .agents import CountingEnv, make_sac, make_td3
+
+ENV_FN = partial(CountingEnv, episode_length=4)
+
+
+def test_evaluations_are_deterministic_and_use_a_snapshot() -> None:
+    td3, sac = make_td3(), make_sac()
+    original = deepcopy(td3._policy)
+    with Evaluator(ENV_FN, num_episodes=3, num_workers=2, seed=10) as evaluator:
+        pending = evaluator.evaluate(td3, step=7)
+        with torch.no_grad():  # Training carries on meanwhile
+            for param in td3._policy.parameters():
+                param.add_(1.0)
+        result = pending.result(timeout=120)
+        again = evaluator.evaluate(td3).result(timeout=120)
+        stochastic = [evaluator.evaluate(sac).result(timeout=120) for _ in range(2)]
+
+    assert result.step == 7 and again.step is None
+    assert result.episode_lengths == [4, 4, 4]
+    # The snapshot, not the later weights, was evaluated: episode i is seeded with seed + i
+    expected = _run_episodes(ENV_FN, original, [10, 11, 12])
+    assert result.episodic_returns == pytest.approx([r for r, _ in expected])
+    assert again.episodic_returns != pytest.approx(result.episodic_returns)
+    # A stochastic policy is evaluated by its deterministic action
+    assert stochastic[0].episodic_returns == stochastic[1].episodic_returns
+    assert result.mean == pytest.approx(sum(result.episodic_returns) / 3)
+
+
+def test_at_least_one_episode() -> None:
+    with pytest.raises(ValueError):
+        Evaluator(ENV_FN, num_episodes=0)
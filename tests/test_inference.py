@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.neural_network.export import export_policy
+from deeprl.inference import NumpyPolicy
+from deeprl.inference.runtime import MAX_QUANTISED_INPUTS
+
+from .agents import ACTION_DIM, HIDDEN_DIMS, OBSERVATION_DIM
+
+
+@pytest.mark.parametrize("quantise, atol", [(False, 1e-6), (True, 5e-2)])
+def test_numpy_policy_matches_the_exported_policy(
+    tmp_path: Path, quantise: bool, atol: float
+) -> None:
+    policy = mlp.Policy(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS)
+    export_policy(policy, tmp_path / "policy.npz", quantise=quantise)
+    observations = torch.randn(8, OBSERVATION_DIM)
+    with torch.no_grad():
+        expected = policy(observations).numpy()
+    actions = NumpyPolicy.load(tmp_path / "policy.npz")(observations.numpy())
+    np.testing.assert_allclose(actions, expected, atol=atol)
+
+
+def test_quantisation_refuses_layers_too_wide_to_be_exact(tmp_path: Path) -> None:
+    policy = mlp.Policy(MAX_QUANTISED_INPUTS + 1, ACTION_DIM, HIDDEN_DIMS)
+    with pytest.raises(ValueError):
+        export_policy(policy, tmp_path / "policy.npz", quantise=True)
+    weight = np.zeros((ACTION_DIM, MAX_QUANTISED_INPUTS + 1), dtype=np.int8)
+    with pytest.raises(ValueError):
+        NumpyPolicy(
+            [(weight, np.zeros(ACTION_DIM), np.ones(ACTION_DIM))], "relu", "tanh"
+        )
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from pathlib import Path
+from threading import Thread
+
+# from collections.abc import Iterator
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Iterator,
+)
+
+import numpy as np
+import pytest
+
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.inference import PolicyClient
+from deeprl.inference.server import PolicyServer
+
+from .agents import ACTION_DIM, HIDDEN_DIMS, OBSERVATION_DIM
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "policy.sock"
+    # Batches requests arriving within 0.2 s of each other
+    server = PolicyServer(
+        mlp.Policy(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS), path, max_latency=0.2
+    )
+    loop = asyncio.new_event_loop()
+    thread = Thread(
+        target=loop.run_until_complete, args=(server.serve_forever(),), daemon=True
+    )
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(1e-2)
+    yield path
+    loop.call_soon_threadsafe(server.close)
+    thread.join(timeout=10)
+    loop.close()
+
+
+def test_wrong_size_observation_fails_its_own_request_only(socket_path: Path) -> None:
+    actions = {}
+
+    def act(name: str, observation_dim: int) -> None:
+        with PolicyClient(socket_path) as client:
+            try:
+                actions[name] = client(np.zeros(observation_dim, dtype=np.float32))
+            except RuntimeError as error:
+                actions[name] = error
+
+    clients = [
+        Thread(target=act, args=("good", OBSERVATION_DIM)),
+        Thread(target=act, args=("bad", OBSERVATION_DIM + 1)),
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join(timeout=10)
+    assert isinstance(actions["good"], np.ndarray) and actions["good"].shape == (
+        ACTION_DIM,
+    )
+    assert isinstance(actions["bad"], RuntimeError)
+
+
+def test_connection_survives_a_failed_request(socket_path: Path) -> None:
+    with PolicyClient(socket_path) as client:
+        with pytest.raises(RuntimeError):
+            client(np.zeros(OBSERVATION_DIM + 1, dtype=np.float32))
+        with pytest.raises(RuntimeError):
+            # Not a whole number of float32
+            client._socket.sendall(b"\x03\x00\x00\x00abc")
+            client._receive()
+        assert client(np.zeros(OBSERVATION_DIM, dtype=np.float32)).shape == (
+            ACTION_DIM,
+        )
+        assert client.stats()["num_requests"] == 1
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Any,
+    Dict,
+)
+
+import torch
+
+from deeprl.launcher import RESULT_FILE, RunContext, launch
+
+
+def train(context: RunContext) -> Dict[str, Any]:
+    """Module-level, so that spawned runs can unpickle it"""
+    if context.config.get("fail"):
+        raise RuntimeError("A failing run")
+    # A completed run is never started again
+    (context.directory / "started").touch(exist_ok=False)
+    return {
+        "score": context.config["scale"] * context.seed,
+        "num_steps": 10,
+        "num_threads": torch.get_num_threads(),
+        "draw": torch.rand(1).item(),  # Seeded by the launcher
+    }
+
+
+def test_launch_runs_every_config_and_seed_and_resumes(tmp_path: Path) -> None:
+    configs = {"ok": {"scale": 2}, "bad": {"fail": True}}
+    summary = launch(train, configs, [1, 2], tmp_path, verbose=False)
+
+    assert sorted(summary["failed"]) == ["bad/seed-1", "bad/seed-2"]
+    ok = summary["configs"]["ok"]
+    assert ok["num_completed_seeds"] == 2
+    assert ok["metrics"]["score"] == {"mean": 3.0, "std": 1.0, "min": 2.0, "max": 4.0}
+    assert ok["metrics"]["num_threads"]["max"] == 1
+    assert summary["configs"]["bad"]["num_completed_seeds"] == 0
+    assert summary["total_steps"] == 20
+    assert (
+        json.loads((tmp_path / "summary.json").read_text())["failed"]
+        == summary["failed"]
+    )
+
+    result = json.loads((tmp_path / "ok" / "seed-1" / RESULT_FILE).read_text())
+    torch.manual_seed(1)
+    assert result["metrics"]["draw"] == torch.rand(1).item()
+
+    # Completed runs are skipped and failed ones retried
+    summary = launch(train, configs, [1, 2], tmp_path, verbose=False)
+    assert sorted(summary["failed"]) == ["bad/seed-1", "bad/seed-2"]
+    assert summary["configs"]["ok"]["num_completed_seeds"] == 2
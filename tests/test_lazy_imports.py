@@ -0,0 +1,62 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+PACKAGES = [
+    "deeprl.actor_critic_methods",
+    "deeprl.actor_critic_methods.experience_replay",
+]
+
+
+def imported_modules_after(code: str) -> set:
+    """Modules of deeprl imported by `code` in a fresh interpreter"""
+    script = f"import sys\n{code}\nprint(' '.join(name for name in sys.modules if name.startswith('deeprl')))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return set(output.split())
+
+
+def test_importing_the_packages_imports_no_algorithm_or_replay() -> None:
+    modules = imported_modules_after(
+        "\n".join(f"import {package}" for package in PACKAGES)
+    )
+    for module in [
+        "td3",
+        "sac",
+        "ddpg",
+        "ppo",
+        "population",
+        "data_parallel",
+        "experience_replay.uer",
+        "experience_replay.per",
+    ]:
+        assert f"deeprl.actor_critic_methods.{module}" not in modules
+
+
+def test_an_export_imports_its_own_module_only() -> None:
+    modules = imported_modules_after("from deeprl.actor_critic_methods import PPO")
+    assert "deeprl.actor_critic_methods.ppo" in modules
+    assert "deeprl.actor_critic_methods.ddpg" not in modules
+
+
+@pytest.mark.parametrize("algorithm", ["TD3", "SAC"])
+def test_the_target_cache_is_imported_only_when_used(algorithm: str) -> None:
+    modules = imported_modules_after(
+        f"from deeprl.actor_critic_methods import {algorithm}"
+    )
+    assert "deeprl.actor_critic_methods.experience_replay.target_cache" not in modules
+    assert "deeprl.actor_critic_methods.experience_replay.columnar" not in modules
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_every_export_resolves(package: str) -> None:
+    module = importlib.import_module(package)
+    assert sorted(module.__all__) == sorted(set(module.__all__))
+    for name in module.__all__:
+        assert getattr(module, name).__name__ == name
+    assert set(module.__all__) <= set(dir(module))
+    with pytest.raises(AttributeError):
+        getattr(module, "Missing")
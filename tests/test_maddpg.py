@@ -0,0 +1,171 @@
+from copy import deepcopy
+from functools import partial
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Dict,
+    List,
+)
+
+import numpy as np
+import torch
+import torch.optim as optim
+from torch import Tensor
+
+from deeprl.multi_agent.maddpg.algo import MADDPG, Agent
+from deeprl.multi_agent.maddpg.batched import BatchedMADDPG
+from deeprl.multi_agent.maddpg.er import UER
+from deeprl.multi_agent.maddpg.nn import Actor, Critic
+
+AGENT_IDS = ["agent_0", "agent_1", "agent_2"]
+OBSERVATION_DIM, ACTION_DIM = 4, 2
+HIDDEN_DIMS = [16, 16]
+
+
+def make_agents() -> Dict[str, Agent]:
+    N = len(AGENT_IDS)
+    return {
+        agent_id: Agent(
+            Actor(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS, "relu", "tanh"),
+            Critic(N * OBSERVATION_DIM, N * ACTION_DIM, HIDDEN_DIMS, "relu"),
+            partial(optim.Adam, lr=1e-2),
+            partial(optim.Adam, lr=1e-2),
+            0.95,
+            0.9,
+        )
+        for agent_id in AGENT_IDS
+    }
+
+
+def make_replay() -> UER:
+    replay = UER(100)
+    replay._rng = np.random.default_rng(0)
+    return replay
+
+
+def random_transitions(num_transitions: int) -> List[List[Dict[str, Tensor]]]:
+    def per_agent(*size: int, dtype: torch.dtype = torch.float32) -> Dict[str, Tensor]:
+        return {agent_id: torch.randn(size).to(dtype) for agent_id in AGENT_IDS}
+
+    return [
+        [
+            per_agent(OBSERVATION_DIM),
+            per_agent(ACTION_DIM),
+            per_agent(1),
+            per_agent(OBSERVATION_DIM),
+            per_agent(1, dtype=torch.bool),
+        ]
+        for _ in range(num_transitions)
+    ]
+
+
+def assert_close(a: List[Tensor], b: List[Tensor]) -> None:
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        torch.testing.assert_close(x, y, rtol=1e-4, atol=1e-5)
+
+
+def test_batched_maddpg_matches_per_agent_maddpg_on_a_shared_batch() -> None:
+    torch.manual_seed(0)
+    agents = make_agents()
+    batched = BatchedMADDPG(
+        {agent_id: deepcopy(agent.policy) for agent_id, agent in agents.items()},
+        {agent_id: deepcopy(agent.critic) for agent_id, agent in agents.items()},
+        partial(optim.Adam, lr=1e-2),
+        partial(optim.Adam, lr=1e-2),
+        make_replay(),
+        8,
+        0.95,
+        0.9,
+    )
+    maddpg = MADDPG(agents, make_replay(), 8, shared_batch=True)
+    for transition in random_transitions(20):
+        maddpg.step(*transition)
+        batched.step(*transition)
+
+    for i, agent_id in enumerate(AGENT_IDS):
+        agent = agents[agent_id]
+        for network, stacked in [
+            (agent.policy, batched._policy),
+            (agent.critic, batched._critic),
+            (agent.target_policy, batched._target_policy),
+            (agent.target_critic, batched._target_critic),
+        ]:
+            # A stacked layer holds the transposed weight of size (N, in, out) and the bias of size (N, 1, out)
+            expected = [
+                param
+                for layer in network._layers
+                for param in (layer.weight.T, layer.bias[None])
+            ]
+            actual = [
+                param[i]
+                for layer in stacked._layers
+                for param in (layer.weight, layer.bias)
+            ]
+            assert_close(actual, expected)
+
+    observation = {agent_id: torch.randn(5, OBSERVATION_DIM) for agent_id in AGENT_IDS}
+    actions = batched.compute_actions(observation)
+    for agent_id in AGENT_IDS:
+        assert_close(
+            [actions[agent_id]],
+            [maddpg.compute_action(agent_id, observation[agent_id])],
+        )
+        assert_close(
+            [batched.compute_action(agent_id, observation[agent_id])],
+            [actions[agent_id]],
+        )
+
+
+def count_target_policy_calls(agents: Dict[str, Agent]) -> List[int]:
+    calls = [0]
+
+    def hook(*_: object) -> None:
+        calls[0] += 1
+
+    for agent in agents.values():
+        agent.target_policy.register_forward_hook(hook)
+    return calls
+
+
+def test_shared_batch_computes_target_actions_once_per_step() -> None:
+    N = len(AGENT_IDS)
+    transitions = random_transitions(10)
+    for shared_batch, target_calls_per_step in [(False, N * N), (True, N)]:
+        agents = make_agents()
+        maddpg = MADDPG(agents, make_replay(), 8, shared_batch=shared_batch)
+        for transition in transitions[:8]:
+            maddpg.step(*transition)  # The first update takes place at the 8th step
+        calls = count_target_policy_calls(agents)
+        maddpg.step(*transitions[8])
+        assert calls[0] == target_calls_per_step
+
+
+def test_shared_batch_leaves_the_batch_actions_untouched() -> None:
+    agents = make_agents()
+    replay = make_replay()
+    maddpg = MADDPG(agents, replay, 8, shared_batch=True)
+    transitions = random_transitions(8)
+    for transition in transitions:
+        maddpg.step(*transition)
+    # Every agent's policy update replaces its own action in a copy of the joint action
+    for experience, (_, action, *_) in zip(replay._buffer, transitions):
+        for agent_id in AGENT_IDS:
+            assert torch.equal(experience.action[agent_id], action[agent_id])
+
+
+def test_thread_pool_updates_match_sequential_updates() -> None:
+    torch.manual_seed(0)
+    agents = make_agents()
+    pooled_agents = deepcopy(agents)
+    sequential = MADDPG(agents, make_replay(), 8)
+    pooled = MADDPG(pooled_agents, make_replay(), 8, num_workers=2)
+    try:
+        for transition in random_transitions(20):
+            sequential.step(*transition)
+            pooled.step(*transition)
+    finally:
+        pooled.close()
+    for agent_id in AGENT_IDS:
+        for network in ["policy", "critic", "target_policy", "target_critic"]:
+            expected = list(getattr(agents[agent_id], network).parameters())
+            actual = list(getattr(pooled_agents[agent_id], network).parameters())
+            assert_close(actual, expected)
@@ -0,0 +1,89 @@
+from pathlib import Path
+from typing import (  # TODO: Deprecated since version 3.9. See Generic Alias Type and PEP 585.
+    Dict,
+    List,
+)
+
+import numpy as np
+import pytest
+import torch
+
+from deeprl.actor_critic_methods.experience_replay import ColumnarUER
+from deeprl.offline import load, train_offline
+from deeprl.profiling import replay_memory_footprint
+
+from .agents import ACTION_DIM, OBSERVATION_DIM, fill, make_td3
+
+
+def random_dataset(num_transitions: int, seed: int) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {
+        "states": rng.standard_normal(
+            (num_transitions, OBSERVATION_DIM), dtype=np.float32
+        ),
+        "actions": rng.uniform(-1, 1, (num_transitions, ACTION_DIM)).astype(np.float32),
+        # Without the trailing dimension
+        "rewards": rng.standard_normal(num_transitions, dtype=np.float32),
+        "next_states": rng.standard_normal(
+            (num_transitions, OBSERVATION_DIM), dtype=np.float32
+        ),
+        "terminateds": rng.random((num_transitions, 1)) < 0.1,
+    }
+
+
+def test_load_streams_every_shard_into_the_replay(tmp_path: Path) -> None:
+    datasets = [random_dataset(30, seed=0), random_dataset(20, seed=1)]
+    paths = [tmp_path / "shard-0.npz", tmp_path / "shard-1.npz"]
+    for path, dataset in zip(paths, datasets):
+        np.savez(path, **dataset)
+
+    replay = ColumnarUER(
+        100, OBSERVATION_DIM, ACTION_DIM, directory=tmp_path / "replay"
+    )
+    assert load(replay, paths, chunk_size=7) == 50
+    assert len(replay) == 50
+    for name in ["states", "actions", "next_states", "terminateds"]:
+        expected = np.concatenate([dataset[name] for dataset in datasets])
+        np.testing.assert_array_equal(replay.columns[name][:50].numpy(), expected)
+    np.testing.assert_array_equal(
+        replay.columns["rewards"][:50, 0].numpy(),
+        np.concatenate([dataset["rewards"] for dataset in datasets]),
+    )
+
+    # The memory-mapped replay reopens with the same transitions
+    reopened = ColumnarUER.open(tmp_path / "replay")
+    assert len(reopened) == 50
+    assert torch.equal(reopened.columns["states"][:50], replay.columns["states"][:50])
+
+
+def test_a_bad_shard_leaves_the_replay_empty(tmp_path: Path) -> None:
+    np.savez(tmp_path / "good.npz", **random_dataset(10, seed=0))
+    bad = random_dataset(10, seed=1)
+    bad["actions"] = bad["actions"][:, :1]
+    np.savez(tmp_path / "bad.npz", **bad)
+    replay = ColumnarUER(100, OBSERVATION_DIM, ACTION_DIM)
+    with pytest.raises(ValueError, match="actions"):
+        load(replay, [tmp_path / "good.npz", tmp_path / "bad.npz"])
+    assert len(replay) == 0
+
+
+def test_train_offline_updates_from_a_loaded_dataset(tmp_path: Path) -> None:
+    np.savez(tmp_path / "shard.npz", **random_dataset(50, seed=0))
+    replay = ColumnarUER(100, OBSERVATION_DIM, ACTION_DIM)
+    load(replay, [tmp_path / "shard.npz"])
+    callbacks: List[int] = []
+    assert (
+        train_offline(make_td3(replay), 10, callbacks.append, callback_interval=5) == 10
+    )
+    assert callbacks == [5, 10]
+
+
+def test_footprint_of_a_columnar_uer() -> None:
+    replay = ColumnarUER(100, OBSERVATION_DIM, ACTION_DIM)
+    fill(replay, 10)
+    footprint = replay_memory_footprint(replay)
+    assert footprint["num_experiences"] == 10
+    assert footprint["state_bytes"] == 100 * OBSERVATION_DIM * 4
+    assert footprint["terminated_bytes"] == 100
+    float_bytes = 100 * (2 * OBSERVATION_DIM + ACTION_DIM + 1) * 4
+    assert footprint["total_bytes"] == float_bytes + 100  # with one byte per flag
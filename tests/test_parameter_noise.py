@@ -0,0 +1,43 @@
+import torch
+
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.parameter_space import (
+    AdaptiveParameterNoise,
+)
+
+from .agents import ACTION_DIM, HIDDEN_DIMS, OBSERVATION_DIM, fill, make_ddpg
+
+
+def test_perturbation_is_refreshed_once_per_episode() -> None:
+    # Without noise the perturbed policy is an exact copy of the policy it was refreshed from
+    agent = make_ddpg(policy_noise=AdaptiveParameterNoise(0.0, 0.1, 0.99))
+    fill(agent._experience_replay, 50)
+    state = torch.randn(OBSERVATION_DIM)
+    for _ in range(3):
+        initial_action = agent.compute_action(state)
+        for _ in range(3):
+            assert agent._update_parameters()
+            assert torch.equal(agent.compute_action(state), initial_action)
+        agent.reset_noise()
+        action = agent.compute_action(state)
+        assert torch.equal(action, agent._policy(state))
+        assert not torch.equal(action, initial_action)
+
+
+def test_perturbation_interval_refreshes_within_an_episode() -> None:
+    policy = mlp.Policy(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS)
+    noise = AdaptiveParameterNoise(0.1, 0.1, 0.99, perturbation_interval=2)
+    state = torch.randn(OBSERVATION_DIM)
+    actions = [noise.perturb(policy)(state) for _ in range(4)]
+    assert torch.equal(actions[0], actions[1])
+    assert not torch.equal(actions[1], actions[2])
+    assert torch.equal(actions[2], actions[3])
+
+
+def test_adaptation_measures_noise_at_the_current_scale() -> None:
+    policy = mlp.Policy(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS)
+    noise = AdaptiveParameterNoise(100.0, 0.1, 0.99, adaptation_interval=1)
+    noise.perturb(policy)  # The acting copy carries large noise
+    noise.stddev = 1e-6
+    noise.adapt(policy, torch.randn(32, OBSERVATION_DIM))
+    assert noise.stddev > 1e-6  # Grows, since the stale acting copy is not measured
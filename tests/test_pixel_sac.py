@@ -0,0 +1,74 @@
+from functools import partial
+
+import torch
+import torch.nn.functional as F
+import torch.optim as optim
+
+from deeprl.actor_critic_methods import PixelSAC
+from deeprl.actor_critic_methods.experience_replay import ColumnarUER
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.neural_network.cnn import Encoder, random_shift
+
+from .agents import ACTION_DIM, HIDDEN_DIMS
+
+OBSERVATION_SHAPE = (3, 24, 24)
+
+
+def test_random_shift_crops_the_replicate_padded_observations() -> None:
+    padding = 2
+    observations = torch.randn(64, *OBSERVATION_SHAPE)
+    shifted = random_shift(observations, padding)
+    padded = F.pad(observations, (padding,) * 4, mode="replicate")
+    _, h, w = OBSERVATION_SHAPE
+    offsets = set()
+    for observation, padded_observation in zip(shifted, padded):
+        crops = {
+            (dy, dx)
+            for dy in range(2 * padding + 1)
+            for dx in range(2 * padding + 1)
+            if torch.equal(observation, padded_observation[:, dy : dy + h, dx : dx + w])
+        }
+        assert crops
+        offsets |= crops
+    assert len(offsets) > 1  # Every observation is shifted by an offset of its own
+
+
+def test_random_shift_without_padding_is_the_identity() -> None:
+    observations = torch.randint(0, 256, (4, *OBSERVATION_SHAPE), dtype=torch.uint8)
+    assert torch.equal(random_shift(observations, 0), observations.float())
+
+
+def test_pixel_sac_learns_from_uint8_observations() -> None:
+    replay = ColumnarUER(100, OBSERVATION_SHAPE, ACTION_DIM, state_dtype=torch.uint8)
+    agent = PixelSAC(
+        torch.device("cpu"),
+        OBSERVATION_SHAPE,
+        ACTION_DIM,
+        partial(Encoder, feature_dim=16, num_filters=8, num_layers=2),
+        partial(mlp.GaussianPolicy, hidden_dims=HIDDEN_DIMS),
+        partial(mlp.ActionValue, hidden_dims=HIDDEN_DIMS),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        replay,
+        8,
+        0.99,
+        0.01,
+        encoder_smoothing_factor=0.05,
+    )
+    encoder = [param.clone() for param in agent._encoder.parameters()]
+    target_encoder = [param.clone() for param in agent._target_encoder.parameters()]
+    for _ in range(10):
+        state = torch.randint(0, 256, OBSERVATION_SHAPE, dtype=torch.uint8)
+        action = agent.compute_action(state)
+        assert action.shape == (ACTION_DIM,) and action.abs().max() <= 1
+        next_state = torch.randint(0, 256, OBSERVATION_SHAPE, dtype=torch.uint8)
+        agent.step(state, action, torch.randn(1), next_state, torch.tensor([False]))
+
+    assert replay.columns["states"].dtype == torch.uint8
+    # The critics train the encoder, and the target encoder follows it
+    for before, after in zip(encoder, agent._encoder.parameters()):
+        assert not torch.equal(before, after)
+    for before, after in zip(target_encoder, agent._target_encoder.parameters()):
+        assert not torch.equal(before, after)
+        assert not after.requires_grad
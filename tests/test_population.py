@@ -0,0 +1,114 @@
+from functools import partial
+
+import torch
+
+from deeprl.actor_critic_methods import PopulationTD3
+from deeprl.actor_critic_methods.experience_replay import PopulationUER
+from deeprl.actor_critic_methods.neural_network import mlp
+from deeprl.actor_critic_methods.noise_injection.action_space import OrnsteinUhlenbeck
+from deeprl.actor_critic_methods.population import Ensemble, PerMember, StackedAdam
+
+from .agents import ACTION_DIM, HIDDEN_DIMS, OBSERVATION_DIM
+
+N = 3
+
+
+def make_population(
+    policy_lr: PerMember = 1e-3, critic_lr: PerMember = 1e-3
+) -> PopulationTD3:
+    return PopulationTD3(
+        torch.device("cpu"),
+        N,
+        OBSERVATION_DIM,
+        ACTION_DIM,
+        partial(mlp.Policy, hidden_dims=HIDDEN_DIMS),
+        partial(mlp.ActionValue, hidden_dims=HIDDEN_DIMS),
+        policy_lr,
+        critic_lr,
+        PopulationUER(N, 100, OBSERVATION_DIM, ACTION_DIM),
+        8,
+        0.99,
+        0.005,
+        OrnsteinUhlenbeck(0.1),
+        0.2,
+        0.5,
+        policy_delay=1,
+    )
+
+
+def step(population: PopulationTD3, terminated: bool = False) -> None:
+    state = torch.randn(N, OBSERVATION_DIM)
+    action = population.compute_action(state)
+    population.step(
+        state,
+        action,
+        torch.randn(N, 1),
+        torch.randn(N, OBSERVATION_DIM),
+        torch.full((N, 1), terminated),
+    )
+
+
+def test_stacked_adam_matches_torch_adam_per_member() -> None:
+    lrs = [1e-1, 1e-2, 1e-3]
+    stacked = torch.randn(N, 4, 5, requires_grad=True)
+    members = [stacked[i].detach().clone().requires_grad_() for i in range(N)]
+    stacked_adam = StackedAdam([stacked], torch.tensor(lrs))
+    adams = [torch.optim.Adam([member], lr=lr) for member, lr in zip(members, lrs)]
+    for _ in range(5):
+        grad = torch.randn(N, 4, 5)
+        stacked.grad = grad.clone()
+        stacked_adam.step()
+        for i, (member, adam) in enumerate(zip(members, adams)):
+            member.grad = grad[i].clone()
+            adam.step()
+    for i, member in enumerate(members):
+        torch.testing.assert_close(stacked[i], member)
+
+
+def test_ensemble_matches_its_members() -> None:
+    members = [mlp.Policy(OBSERVATION_DIM, ACTION_DIM, HIDDEN_DIMS) for _ in range(N)]
+    states = torch.randn(N, 5, OBSERVATION_DIM)
+    actions = Ensemble(members)(states)
+    with torch.no_grad():
+        for i, member in enumerate(members):
+            torch.testing.assert_close(actions[i], member(states[i]))
+
+
+def test_member_with_zero_learning_rates_is_left_unchanged() -> None:
+    population = make_population(
+        policy_lr=[1e-3, 0.0, 1e-3], critic_lr=[1e-3, 0.0, 1e-3]
+    )
+    initial = {name: param.clone() for name, param in population._policy.params.items()}
+    initial_critic = {
+        name: param.clone() for name, param in population._critics[0].params.items()
+    }
+    for _ in range(12):
+        step(population)
+    for name, param in population._policy.params.items():
+        assert torch.equal(param[1], initial[name][1])
+        assert not torch.equal(param[0], initial[name][0])
+    for name, param in population._critics[0].params.items():
+        assert torch.equal(param[1], initial_critic[name][1])
+
+
+def test_policy_noise_is_reset_for_members_whose_episode_ended() -> None:
+    population = make_population()
+    step(population)
+    noise = population._policy_noise
+    assert not torch.equal(noise._state, torch.zeros(N, ACTION_DIM))
+    state = torch.randn(N, OBSERVATION_DIM)
+    action = population.compute_action(state)
+    before = noise._state.clone()
+    truncated = torch.tensor([[False], [True], [False]])
+    population.step(
+        state,
+        action,
+        torch.randn(N, 1),
+        torch.randn(N, OBSERVATION_DIM),
+        torch.zeros(N, 1, dtype=torch.bool),
+        truncated,
+    )
+    assert torch.equal(noise._state[1], torch.zeros(ACTION_DIM))
+    assert torch.equal(noise._state[[0, 2]], before[[0, 2]])
+    population.reset_noise()
+    assert torch.equal(noise._state, torch.zeros(N, ACTION_DIM))
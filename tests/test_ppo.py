@@ -0,0 +1,78 @@
+from functools import partial
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from torch import Tensor
+
+from deeprl.actor_critic_methods import PPO
+from deeprl.actor_critic_methods.neural_network import mlp
+
+from .agents import ACTION_DIM, HIDDEN_DIMS, OBSERVATION_DIM
+
+
+class FirstCoordinate(nn.Module):
+    """A state critic whose value is the first coordinate of the state"""
+
+    def forward(self, state: Tensor) -> Tensor:
+        return state[..., :1]
+
+
+def make_ppo(num_envs: int, rollout_length: int, minibatch_size: int) -> PPO:
+    return PPO(
+        torch.device("cpu"),
+        OBSERVATION_DIM,
+        ACTION_DIM,
+        num_envs,
+        partial(mlp.GaussianPolicy, hidden_dims=HIDDEN_DIMS),
+        partial(mlp.StateValue, hidden_dims=HIDDEN_DIMS),
+        partial(optim.Adam, lr=1e-3),
+        partial(optim.Adam, lr=1e-3),
+        rollout_length,
+        1,
+        minibatch_size,
+        0.5,
+        0.5,
+        0.2,
+    )
+
+
+def test_gae_matches_a_hand_computed_rollout() -> None:
+    ppo = make_ppo(num_envs=2, rollout_length=3, minibatch_size=6)
+    ppo._critic = FirstCoordinate()
+    buffer = ppo._rollout_buffer
+    next_states = torch.zeros(3, 2, OBSERVATION_DIM)
+    # Environment 0 terminates at t = 2; environment 1 is truncated at t = 1
+    next_states[:, 0, 0] = torch.tensor([2.0, 3.0, 4.0])
+    next_states[:, 1, 0] = 1.0
+    buffer.next_states.copy_(next_states)
+    buffer.values.copy_(torch.tensor([[1.0, 0.0], [2.0, 0.0], [3.0, 0.0]]))
+    buffer.rewards.copy_(torch.tensor([[1.0, 0.0], [1.0, 0.0], [1.0, 0.0]]))
+    buffer.terminateds.copy_(
+        torch.tensor([[False, False], [False, False], [True, False]])
+    )
+    buffer.truncateds.copy_(
+        torch.tensor([[False, False], [False, True], [False, False]])
+    )
+
+    # 𝛿 = 𝑟 + 𝛾(1 - 𝑑)V(𝑠ʼ) - V(𝑠) and Â_t = 𝛿_t + 𝛾𝜆 Â_t+1 within an episode, 𝛾 = 𝜆 = 0.5
+    # Environment 0: 𝛿 = (1, 0.5, -2), Â = (1 + 0.25 * 0, 0.5 + 0.25 * -2, -2)
+    # Environment 1: 𝛿 = (0.5, 0.5, 0.5), Â = (0.5 + 0.25 * 0.5, 0.5, 0.5)
+    expected = torch.tensor([[1.0, 0.625], [0.0, 0.5], [-2.0, 0.5]])
+    assert torch.allclose(ppo._estimate_advantages(), expected)
+
+
+def test_minibatch_of_one_keeps_the_parameters_finite() -> None:
+    ppo = make_ppo(num_envs=1, rollout_length=4, minibatch_size=1)
+    for _ in range(4):
+        state = torch.randn(1, OBSERVATION_DIM)
+        action = ppo.compute_action(state)
+        ppo.step(
+            state,
+            action,
+            torch.randn(1, 1),
+            torch.randn(1, OBSERVATION_DIM),
+            torch.tensor([[False]]),
+        )
+    for param in [*ppo._policy.parameters(), *ppo._critic.parameters()]:
+        assert torch.isfinite(param).all()
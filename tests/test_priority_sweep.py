@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import torch
+
+from deeprl._data_structures import SumTree
+from deeprl.actor_critic_methods import PrioritySweep
+from deeprl.actor_critic_methods.experience_replay import PER, UER
+
+from .agents import fill, make_td3
+
+
+def test_batched_update_matches_sequential_updates() -> None:
+    rng = np.random.default_rng(0)
+    capacity = 13  # Not a power of two: leaves span two levels of the tree
+    batched, sequential = SumTree[int](capacity), SumTree[int](capacity)
+    for i in range(capacity + 5):  # Wraps around
+        priority = rng.random()
+        batched.store(i, priority)
+        sequential.store(i, priority)
+    for _ in range(10):
+        leaves = rng.integers(capacity, size=6) + batched._bias
+        # The last priority given for a leaf wins, as with sequential updates
+        leaves[-1] = leaves[0]
+        priorities = rng.random(6)
+        batched.update_priorities(leaves, priorities)
+        for leaf, priority in zip(leaves.tolist(), priorities.tolist()):
+            sequential.update_priority(leaf, priority)
+        np.testing.assert_allclose(batched._weights, sequential._weights)
+    # Every node is the sum of its children
+    nodes = np.arange(capacity - 1)
+    np.testing.assert_allclose(
+        batched._weights[nodes],
+        batched._weights[2 * nodes + 1] + batched._weights[2 * nodes + 2],
+    )
+
+
+def test_sweep_batches_cover_the_buffer_in_slot_order() -> None:
+    replay = PER(100, α=0.6)
+    fill(replay, 10)
+    slots = [replay.sweep_batch(4).indices - replay._buffer._bias for _ in range(3)]
+    assert [s.tolist() for s in slots] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 0, 1]]
+
+
+def test_sweep_refreshes_priorities_with_the_current_networks() -> None:
+    α, ϵ = 0.6, 0.01
+    agent = PrioritySweep(make_td3(PER(100, α, ϵ)), chunk_size=30, time_fraction=0.0)
+    fill(agent._experience_replay, 30)
+    for _ in range(5):
+        assert agent._update_parameters()
+    agent._sweep()
+
+    replay = agent._experience_replay
+    batch = replay.sweep_batch(30)
+    expected = (torch.abs(agent._td_errors(batch)).numpy().ravel() + ϵ) ** α
+    np.testing.assert_allclose(
+        replay._buffer._weights[batch.indices], expected, rtol=1e-5
+    )
+
+
+def test_sweeping_requires_a_prioritised_replay() -> None:
+    with pytest.raises(ValueError):
+        PrioritySweep(make_td3(UER(100)))
@@ -0,0 +1,33 @@
+import pytest
+
+from deeprl.actor_critic_methods.experience_replay import UER, RateLimiter
+from deeprl.profiling import Profiler, replay_memory_footprint
+
+from .agents import OBSERVATION_DIM, fill, make_td3
+
+
+def test_profiler_records_the_phases_of_an_update() -> None:
+    agent = make_td3()
+    fill(agent._experience_replay, 20)
+    with Profiler() as profiler:
+        agent._update_parameters()
+    metrics = profiler.as_dict()
+    assert metrics["calls/sample"] == 1
+    assert metrics["calls/critic_backward"] == 1
+    agent._update_parameters()  # Not profiled
+    assert profiler.as_dict()["calls/sample"] == 1
+
+
+def test_footprint_of_a_uer_behind_a_rate_limiter() -> None:
+    replay = RateLimiter(
+        UER(100), samples_per_insert=1, min_size_to_sample=1, error_buffer=100
+    )
+    fill(replay, 10)
+    footprint = replay_memory_footprint(replay)
+    assert footprint["num_experiences"] == 10
+    assert footprint["state_bytes"] == 10 * OBSERVATION_DIM * 4
+
+
+def test_footprint_of_an_unsupported_replay_raises() -> None:
+    with pytest.raises(TypeError):
+        replay_memory_footprint(object())
@@ -0,0 +1,74 @@
+from threading import Thread
+
+import pytest
+import torch
+
+from deeprl.actor_critic_methods.experience_replay import UER, RateLimiter
+
+
+def push(replay: RateLimiter) -> None:
+    replay.push(
+        torch.zeros(3),
+        torch.zeros(2),
+        torch.zeros(1),
+        torch.zeros(3),
+        torch.zeros(1, dtype=torch.bool),
+    )
+
+
+def test_error_buffer_must_cover_samples_per_insert() -> None:
+    with pytest.raises(ValueError):
+        RateLimiter(
+            UER(100), samples_per_insert=4, min_size_to_sample=1, error_buffer=2
+        )
+
+
+def test_batch_too_large_for_error_buffer_raises_instead_of_deadlocking() -> None:
+    replay = RateLimiter(
+        UER(1000),
+        samples_per_insert=64,
+        min_size_to_sample=10,
+        error_buffer=64,
+        timeout=0.1,
+    )
+    for _ in range(10):
+        push(replay)
+    with pytest.raises(RuntimeError, match="error_buffer"):
+        replay.sample(256)
+
+
+def test_largest_valid_batch_makes_progress() -> None:
+    # batch_size + samples_per_insert == 2 * error_buffer
+    replay = RateLimiter(
+        UER(1000),
+        samples_per_insert=64,
+        min_size_to_sample=256,
+        error_buffer=160,
+        timeout=5.0,
+    )
+    num_samples = 50
+
+    def learn() -> None:
+        for _ in range(num_samples):
+            replay.sample(256)
+
+    learner = Thread(target=learn)
+    learner.start()
+    for _ in range(256 + num_samples * 256 // 64):
+        push(replay)
+    learner.join(timeout=10.0)
+    assert not learner.is_alive()
+    assert replay.sample_stats.num_calls == num_samples
+
+
+def test_sample_times_out_with_value_error() -> None:
+    replay = RateLimiter(
+        UER(100),
+        samples_per_insert=1,
+        min_size_to_sample=5,
+        error_buffer=4,
+        timeout=0.01,
+    )
+    push(replay)
+    with pytest.raises(ValueError):
+        replay.sample(2)
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from deeprl.actor_critic_methods.experience_replay import UER, ColumnarUER, Recorded
+from deeprl.offline import load
+from deeprl.recording import TrajectoryWriter
+
+from .agents import ACTION_DIM, OBSERVATION_DIM, random_transition
+
+
+def test_recorded_transitions_load_back_for_offline_training(tmp_path: Path) -> None:
+    transitions = [random_transition(terminated=i % 7 == 6) for i in range(25)]
+    # Chunks of 4 transitions and shards of about one chunk: several shards, a partial last chunk
+    with TrajectoryWriter(
+        tmp_path, OBSERVATION_DIM, ACTION_DIM, chunk_length=4, max_shard_bytes=1
+    ) as writer:
+        replay = Recorded(UER(100), writer)
+        for transition in transitions:
+            replay.push(*transition)
+    assert len(writer.shards) > 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+    loaded = ColumnarUER(100, OBSERVATION_DIM, ACTION_DIM)
+    assert load(loaded, sorted(tmp_path.glob("*.npz")), chunk_size=3) == 25
+    for name, column in zip(
+        ["states", "actions", "rewards", "next_states", "terminateds"],
+        zip(*transitions),
+    ):
+        assert torch.equal(loaded.columns[name][:25], torch.stack(column))
+
+
+def test_states_are_recorded_with_their_dtype(tmp_path: Path) -> None:
+    state_shape = (3, 8, 8)
+    states = [torch.randint(0, 256, state_shape, dtype=torch.uint8) for _ in range(6)]
+    with TrajectoryWriter(
+        tmp_path, state_shape, ACTION_DIM, state_dtype=torch.uint8
+    ) as writer:
+        for state, next_state in zip(states, states[1:]):
+            writer.append(
+                state,
+                torch.zeros(ACTION_DIM),
+                torch.zeros(1),
+                next_state,
+                torch.tensor([False]),
+            )
+    (shard,) = writer.shards
+    with np.load(shard) as file:
+        assert file["states/000000"].dtype == np.uint8
+        assert file["actions/000000"].dtype == np.float32
+
+    loaded = ColumnarUER(10, state_shape, ACTION_DIM, state_dtype=torch.uint8)
+    assert load(loaded, [shard]) == 5
+    assert torch.equal(loaded.columns["next_states"][:5], torch.stack(states[1:]))
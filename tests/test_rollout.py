@@ -0,0 +1,102 @@
+import pytest
+import torch
+from torch import Tensor
+
+from deeprl.actor_critic_methods.noise_injection.action_space import OrnsteinUhlenbeck
+from deeprl.rollout import RolloutRunner
+
+from .agents import ACTION_DIM, OBSERVATION_DIM, CountingEnv, make_td3
+
+CPU = torch.device("cpu")
+
+
+class RecordingAgent:
+    """Acts with ones and keeps every transition it is given"""
+
+    def __init__(self) -> None:
+        self.transitions: list = []
+
+    def compute_action(self, state: Tensor) -> Tensor:
+        return torch.ones(ACTION_DIM)
+
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+    ) -> None:
+        self.transitions.append((state, action, reward, next_state, terminated))
+
+
+class TruncationAwareAgent(RecordingAgent):
+    def step(
+        self,
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        terminated: Tensor,
+        truncated: Tensor,
+    ) -> None:
+        self.transitions.append(
+            (state, action, reward, next_state, terminated, truncated)
+        )
+
+
+def test_transitions_and_episode_statistics() -> None:
+    agent = RecordingAgent()
+    # Chunks of 4 rows make states carry over to new chunks, mid-episode and at resets
+    runner = RolloutRunner(CountingEnv(episode_length=5), agent, CPU, chunk_length=4)
+    episodes = runner.run(12)
+    assert [(episode.episodic_return, episode.length) for episode in episodes] == [
+        (10.0, 5),
+        (10.0, 5),
+    ]
+    assert runner.num_steps == 12
+    episodes = runner.run(3)  # Carries on with the episode in progress
+    assert [episode.length for episode in episodes] == [5]
+
+    for t, (state, action, reward, next_state, terminated) in enumerate(
+        agent.transitions
+    ):
+        step_in_episode = t % 5
+        assert state.shape == (OBSERVATION_DIM,) and state[0] == step_in_episode
+        assert next_state[0] == step_in_episode + 1
+        assert reward.item() == ACTION_DIM and not terminated.item()
+    # Transitions are views of chunks that are never overwritten
+    assert [state[0].item() for state, *_ in agent.transitions] == [
+        t % 5 for t in range(15)
+    ]
+
+
+def test_truncation_is_passed_to_agents_which_accept_it() -> None:
+    agent = TruncationAwareAgent()
+    RolloutRunner(CountingEnv(episode_length=3), agent, CPU).run(6)
+    assert [transition[-1].item() for transition in agent.transitions] == [
+        False,
+        False,
+        True,
+    ] * 2
+
+
+def test_runner_trains_an_agent() -> None:
+    agent = make_td3()
+    RolloutRunner(CountingEnv(), agent, CPU, seed=0).run(20)
+    assert len(agent._experience_replay) == 20
+
+
+def test_chunks_must_hold_two_states() -> None:
+    with pytest.raises(ValueError):
+        RolloutRunner(CountingEnv(), RecordingAgent(), CPU, chunk_length=1)
+
+
+def test_the_policy_noise_is_reset_at_the_end_of_every_episode() -> None:
+    agent = make_td3()
+    agent._policy_noise = OrnsteinUhlenbeck(1.0)
+    runner = RolloutRunner(CountingEnv(episode_length=5), agent, CPU)
+    runner.run(4)
+    assert not torch.equal(agent._policy_noise._state, torch.zeros(ACTION_DIM))
+    runner.run(1)
+    assert torch.equal(agent._policy_noise._state, torch.zeros(ACTION_DIM))
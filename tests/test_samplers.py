@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from deeprl.actor_critic_methods.experience_replay import (
+    ERE,
+    UER,
+    WithoutReplacement,
+    WithReplacement,
+)
+
+from .agents import fill
+
+
+def test_with_replacement_draws_stored_slots() -> None:
+    indices = WithReplacement()(np.random.default_rng(0), 10, 10, 100, 1000)
+    assert indices.shape == (1000,)
+    assert set(indices.tolist()) == set(range(10))
+
+
+def test_without_replacement_draws_distinct_slots() -> None:
+    indices = WithoutReplacement()(np.random.default_rng(0), 50, 50, 100, 50)
+    assert sorted(indices.tolist()) == list(range(50))
+
+
+def test_ere_narrows_to_the_newest_transitions_and_wraps_around_the_ring() -> None:
+    rng = np.random.default_rng(0)
+    # A full ring of 100 slots whose newest transition is in slot 29
+    size, next_idx, capacity = 100, 30, 100
+    ere = ERE(η=0.5, c_min=10, updates_per_cycle=4)
+    first = ere(rng, size, next_idx, capacity, 1000)
+    assert set(first.tolist()) == set(range(100))  # k = 0: the whole buffer
+    ere(rng, size, next_idx, capacity, 1)
+    third = ere(rng, size, next_idx, capacity, 1000)
+    # k = 2: c_k = max(100 * 0.5^500, 10), the slots of the 10 newest transitions
+    assert set(third.tolist()) == set(range(20, 30))
+    ere(rng, size, next_idx, capacity, 1)
+    # A new cycle
+    assert set(ere(rng, size, next_idx, capacity, 1000).tolist()) == set(range(100))
+
+
+def test_uer_samples_with_its_sampler() -> None:
+    replay = UER(100, sampler=ERE(η=0.5, c_min=3, updates_per_cycle=2))
+    fill(replay, 20)
+    replay.sample(8)
+    assert set(replay.sample(8).indices.tolist()) <= {17, 18, 19}
+
+
+def test_uer_refuses_batches_larger_than_the_buffer() -> None:
+    replay = UER(100)
+    fill(replay, 5)
+    with pytest.raises(ValueError):
+        replay.sample(6)
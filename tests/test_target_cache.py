@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+import torch
+from torch import Tensor
+
+from deeprl.actor_critic_methods.experience_replay import (
+    PER,
+    UER,
+    RateLimiter,
+    Synchronised,
+    TargetCache,
+)
+from deeprl.actor_critic_methods.experience_replay.target_cache import cached_targets
+
+from .agents import fill, make_sac, make_td3
+
+
+class CountingTargets:
+    """Targets which tell the call that computed them apart"""
+
+    def __init__(self) -> None:
+        self.num_calls = 0
+        self.num_targets = 0
+
+    def __call__(
+        self, rewards: Tensor, next_states: Tensor, terminateds: Tensor
+    ) -> Tensor:
+        self.num_calls += 1
+        self.num_targets += len(rewards)
+        return rewards + self.num_calls
+
+
+def test_targets_are_reused_within_the_staleness_bound() -> None:
+    replay = TargetCache(UER(10), max_staleness=2)
+    fill(replay, 10)
+    compute = CountingTargets()
+    for version in [0, 0, 1, 2]:
+        batch = replay.sample(10)  # The whole buffer, hence every slot
+        torch.testing.assert_close(
+            cached_targets(replay, batch, version, compute), batch.rewards + 1
+        )
+    assert compute.num_calls == 1
+
+    cached_targets(replay, replay.sample(10), 3, compute)
+    assert compute.num_calls == 2
+
+
+def test_overwritten_slots_are_recomputed() -> None:
+    replay = TargetCache(UER(10), max_staleness=100)
+    fill(replay, 10)
+    compute = CountingTargets()
+    cached_targets(replay, replay.sample(10), 0, compute)
+    fill(replay, 3)  # Overwrites the three oldest slots
+    batch = replay.sample(10)
+    𝑦 = cached_targets(replay, batch, 0, compute)
+    assert compute.num_targets == 10 + 3
+    overwritten = np.isin(batch.indices, [0, 1, 2])
+    torch.testing.assert_close(𝑦[overwritten], batch.rewards[overwritten] + 2)
+    torch.testing.assert_close(𝑦[~overwritten], batch.rewards[~overwritten] + 1)
+
+
+def test_cached_targets_hold_no_graph() -> None:
+    agent = make_td3(TargetCache(UER(100), max_staleness=4))
+    fill(agent._experience_replay, 20)
+    for _ in range(5):
+        assert agent._update_parameters()
+    assert not agent._experience_replay._targets.requires_grad
+
+
+@pytest.mark.parametrize("make_agent", [make_td3, make_sac])
+def test_the_cache_version_survives_a_round_trip(make_agent) -> None:  # type: ignore
+    agent = make_agent(TargetCache(UER(100), max_staleness=1))
+    fill(agent._experience_replay, 20)
+    for _ in range(4):
+        assert agent._update_parameters()
+    assert agent._num_target_updates > 0
+
+    restored = make_agent(TargetCache(UER(100), max_staleness=1))
+    restored.load_state_dict(agent.state_dict())
+    assert restored._num_target_updates == agent._num_target_updates
+
+
+def test_only_ring_buffers_are_supported() -> None:
+    with pytest.raises(ValueError):
+        TargetCache(PER(10, 0.6), max_staleness=1)  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "wrap",
+    [
+        Synchronised,
+        lambda replay: RateLimiter(replay, 1, 1, 4),
+        lambda replay: Synchronised(TargetCache(replay, 1)),
+    ],
+)
+def test_wrappers_report_the_size_of_the_wrapped_replay(wrap) -> None:  # type: ignore
+    replay = wrap(UER(10))
+    fill(replay, 3)
+    assert len(replay) == 3
+    per = PER(10, 0.6)
+    fill(per, 3)
+    assert len(per) == 3